@@ -0,0 +1,191 @@
+/**
+ * Benchmark cases
+ *
+ * Each case prepares its inputs in setup() (not timed), runs one operation
+ * in run() (timed) and frees everything in teardown(). `requires` lists
+ * cv exports the case needs; cases whose bindings are missing from a build
+ * are reported as skipped.
+ */
+
+const { convNet } = require('./models');
+
+const DNN_INPUT = 224;
+
+/**
+ * Deterministic BGR test image: noise, filled shapes and (when available) ArUco markers
+ * @param {Object} cv - OpenCV.js module
+ * @param {number} width - Image width
+ * @param {number} height - Image height
+ * @param {number} shift - Horizontal offset of the shapes, for optical flow
+ * @returns {cv.Mat} CV_8UC3 image (caller deletes it)
+ */
+function testImage(cv, width, height, shift = 0) {
+    const image = new cv.Mat(height, width, cv.CV_8UC3);
+    const data = image.data;
+    let state = 12345;
+    for (let i = 0; i < data.length; i++) {
+        state = (state * 1103515245 + 12345) & 0x7fffffff;
+        data[i] = 96 + (state >> 24);
+    }
+
+    const scale = Math.min(width, height) / 240;
+    for (let i = 0; i < 12; i++) {
+        const x = Math.round(((i % 4) + 0.5) * width / 4) + shift;
+        const y = Math.round((Math.floor(i / 4) + 0.5) * height / 3);
+        const color = new cv.Scalar((i * 40) % 256, (i * 90) % 256, (i * 150) % 256);
+        if (i % 2) {
+            cv.circle(image, new cv.Point(x, y), Math.round(18 * scale), color, -1);
+        } else {
+            const half = Math.round(16 * scale);
+            cv.rectangle(image, new cv.Point(x - half, y - half), new cv.Point(x + half, y + half), color, -1);
+        }
+    }
+
+    if (typeof cv.generateImageMarker === 'function' && typeof cv.getPredefinedDictionary === 'function') {
+        const dictionary = cv.getPredefinedDictionary(cv.DICT_4X4_50);
+        const size = Math.round(40 * scale);
+        const marker = new cv.Mat();
+        const markerBgr = new cv.Mat();
+        for (let id = 0; id < 4; id++) {
+            cv.generateImageMarker(dictionary, id, size, marker, 1);
+            cv.cvtColor(marker, markerBgr, cv.COLOR_GRAY2BGR);
+            const x = Math.round((id + 0.5) * width / 4 - size / 2) + shift;
+            const y = height - size - Math.round(10 * scale);
+            if (x < 0 || x + size > width || y < 0) continue;
+            // White quiet zone around each marker
+            cv.rectangle(image, new cv.Point(x - 8, y - 8), new cv.Point(x + size + 8, y + size + 8),
+                new cv.Scalar(255, 255, 255), -1);
+            const roi = image.roi(new cv.Rect(x, y, size, size));
+            markerBgr.copyTo(roi);
+            roi.delete();
+        }
+        marker.delete();
+        markerBgr.delete();
+        if (typeof dictionary.delete === 'function') dictionary.delete();
+    }
+    return image;
+}
+
+function grayImage(cv, width, height, shift = 0) {
+    const image = testImage(cv, width, height, shift);
+    const gray = new cv.Mat();
+    cv.cvtColor(image, gray, cv.COLOR_BGR2GRAY);
+    image.delete();
+    return gray;
+}
+
+function deleteAll(state) {
+    for (const value of Object.values(state)) {
+        if (value && typeof value.delete === 'function' && !value.isDeleted()) value.delete();
+    }
+}
+
+const cases = [
+    {
+        name: 'cvtColor',
+        requires: ['cvtColor'],
+        setup: (cv, w, h) => ({ src: testImage(cv, w, h), dst: new cv.Mat() }),
+        run: (cv, s) => cv.cvtColor(s.src, s.dst, cv.COLOR_BGR2GRAY),
+        teardown: deleteAll,
+    },
+    {
+        name: 'GaussianBlur',
+        requires: ['GaussianBlur'],
+        setup: (cv, w, h) => ({ src: testImage(cv, w, h), dst: new cv.Mat() }),
+        run: (cv, s) => cv.GaussianBlur(s.src, s.dst, new cv.Size(5, 5), 0),
+        teardown: deleteAll,
+    },
+    {
+        name: 'Canny',
+        requires: ['Canny'],
+        setup: (cv, w, h) => ({ src: grayImage(cv, w, h), dst: new cv.Mat() }),
+        run: (cv, s) => cv.Canny(s.src, s.dst, 50, 150),
+        teardown: deleteAll,
+    },
+    {
+        name: 'findContours',
+        requires: ['findContours'],
+        setup: (cv, w, h) => {
+            const gray = grayImage(cv, w, h);
+            const binary = new cv.Mat();
+            cv.threshold(gray, binary, 128, 255, cv.THRESH_BINARY);
+            gray.delete();
+            return { binary, contours: new cv.MatVector(), hierarchy: new cv.Mat() };
+        },
+        run: (cv, s) => cv.findContours(s.binary, s.contours, s.hierarchy, cv.RETR_LIST, cv.CHAIN_APPROX_SIMPLE),
+        teardown: deleteAll,
+    },
+    {
+        name: 'ORB.detectAndCompute',
+        requires: ['ORB', 'KeyPointVector'],
+        setup: (cv, w, h) => ({
+            src: grayImage(cv, w, h),
+            orb: new cv.ORB(500),
+            mask: new cv.Mat(),
+            keypoints: new cv.KeyPointVector(),
+            descriptors: new cv.Mat(),
+        }),
+        run: (cv, s) => s.orb.detectAndCompute(s.src, s.mask, s.keypoints, s.descriptors),
+        teardown: deleteAll,
+    },
+    {
+        name: 'ArucoDetector.detectMarkers',
+        requires: ['aruco_ArucoDetector', 'getPredefinedDictionary'],
+        setup: (cv, w, h) => {
+            const dictionary = cv.getPredefinedDictionary(cv.DICT_4X4_50);
+            const params = new cv.aruco_DetectorParameters();
+            const refine = new cv.aruco_RefineParameters(10.0, 3.0, true);
+            return {
+                src: grayImage(cv, w, h),
+                dictionary,
+                params,
+                refine,
+                detector: new cv.aruco_ArucoDetector(dictionary, params, refine),
+                corners: new cv.MatVector(),
+                ids: new cv.Mat(),
+                rejected: new cv.MatVector(),
+            };
+        },
+        run: (cv, s) => s.detector.detectMarkers(s.src, s.corners, s.ids, s.rejected),
+        teardown: deleteAll,
+    },
+    {
+        name: 'dnn_Net.forward',
+        requires: ['readNetFromONNX', 'blobFromImage', 'FS_createDataFile'],
+        setup: (cv, w, h) => {
+            const file = `bench_convnet_${DNN_INPUT}.onnx`;
+            try {
+                cv.FS_unlink(`/${file}`);
+            } catch (err) {
+                // Not written yet
+            }
+            cv.FS_createDataFile('/', file, convNet(DNN_INPUT), true, false, false);
+            const src = testImage(cv, w, h);
+            return { src, net: cv.readNetFromONNX(file) };
+        },
+        run: (cv, s) => {
+            const blob = cv.blobFromImage(s.src, 1 / 255, new cv.Size(DNN_INPUT, DNN_INPUT),
+                new cv.Scalar(0, 0, 0), true, false);
+            s.net.setInput(blob);
+            const out = s.net.forward();
+            blob.delete();
+            out.delete();
+        },
+        teardown: deleteAll,
+    },
+    {
+        name: 'calcOpticalFlowPyrLK',
+        requires: ['calcOpticalFlowPyrLK', 'goodFeaturesToTrack'],
+        setup: (cv, w, h) => {
+            const prev = grayImage(cv, w, h);
+            const next = grayImage(cv, w, h, Math.max(2, Math.round(w / 160)));
+            const prevPts = new cv.Mat();
+            cv.goodFeaturesToTrack(prev, prevPts, 200, 0.01, 10);
+            return { prev, next, prevPts, nextPts: new cv.Mat(), status: new cv.Mat(), err: new cv.Mat() };
+        },
+        run: (cv, s) => cv.calcOpticalFlowPyrLK(s.prev, s.next, s.prevPts, s.nextPts, s.status, s.err),
+        teardown: deleteAll,
+    },
+];
+
+module.exports = { cases, testImage };
@@ -0,0 +1,97 @@
+/**
+ * Compare two benchmark reports from bench/run.js
+ *
+ * Prints the p50 latency change of every case, size and build present in
+ * both reports, plus startup and peak heap changes, and exits with status 1
+ * when any p50 regressed by more than the threshold.
+ *
+ * Run:
+ *   node bench/compare.js baseline.json current.json
+ *   node bench/compare.js baseline.json current.json --threshold 5
+ */
+
+const fs = require('fs');
+
+function parseArgs(argv) {
+    const args = { files: [], threshold: 10 };
+    for (let i = 0; i < argv.length; i++) {
+        if (argv[i] === '--threshold') {
+            args.threshold = Number(argv[++i]);
+        } else {
+            args.files.push(argv[i]);
+        }
+    }
+    if (args.files.length !== 2) {
+        console.error('Usage: node bench/compare.js <baseline.json> <current.json> [--threshold percent]');
+        process.exit(2);
+    }
+    return args;
+}
+
+function readReport(file) {
+    const report = JSON.parse(fs.readFileSync(file, 'utf8'));
+    if (report.version !== 1) {
+        throw new Error(`${file}: unsupported report version ${report.version}`);
+    }
+    return report;
+}
+
+function change(before, after) {
+    return before > 0 ? ((after - before) / before) * 100 : 0;
+}
+
+function formatChange(percent) {
+    const sign = percent > 0 ? '+' : '';
+    return `${sign}${percent.toFixed(1)}%`;
+}
+
+function main() {
+    const args = parseArgs(process.argv.slice(2));
+    const [baseline, current] = args.files.map(readReport);
+    console.log(`baseline: ${args.files[0]} (${baseline.package}, ${baseline.date})`);
+    console.log(`current:  ${args.files[1]} (${current.package}, ${current.date})`);
+    if (baseline.cpu !== current.cpu) {
+        console.log(`warning: different CPUs (${baseline.cpu} vs ${current.cpu})`);
+    }
+
+    const regressions = [];
+    for (const after of current.builds) {
+        const before = baseline.builds.find(b => b.build === after.build);
+        if (!before || before.error || after.error) continue;
+
+        console.log(`\n=== ${after.build} ===`);
+        console.log(
+            `startup total: ${before.startup.totalMs.toFixed(1)}ms -> ${after.startup.totalMs.toFixed(1)}ms ` +
+            `(${formatChange(change(before.startup.totalMs, after.startup.totalMs))})`
+        );
+        console.log(
+            `peak heap: ${(before.peakHeapBytes / 1048576).toFixed(1)}MB -> ${(after.peakHeapBytes / 1048576).toFixed(1)}MB`
+        );
+
+        for (const result of after.results) {
+            if (result.p50Ms === undefined) continue;
+            const previous = before.results.find(r => r.name === result.name && r.size === result.size);
+            if (!previous || previous.p50Ms === undefined) continue;
+
+            const percent = change(previous.p50Ms, result.p50Ms);
+            const regressed = percent > args.threshold;
+            const label = `  ${result.name} @ ${result.size}`.padEnd(40);
+            console.log(
+                `${label} p50 ${previous.p50Ms.toFixed(2).padStart(9)}ms -> ${result.p50Ms.toFixed(2).padStart(9)}ms ` +
+                `${formatChange(percent).padStart(8)}${regressed ? '  REGRESSION' : ''}`
+            );
+            if (regressed) {
+                regressions.push(`${after.build}: ${result.name} @ ${result.size} ${formatChange(percent)}`);
+            }
+        }
+    }
+
+    if (regressions.length) {
+        console.log(`\n${regressions.length} regression(s) over ${args.threshold}%:`);
+        regressions.forEach(line => console.log(`  ${line}`));
+        process.exit(1);
+    }
+    console.log(`\nNo p50 regressions over ${args.threshold}%`);
+}
+
+main();
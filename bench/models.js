@@ -0,0 +1,115 @@
+/**
+ * Synthetic ONNX models for the dnn benchmark
+ *
+ * Encodes a small convolutional network directly as ONNX protobuf so the
+ * suite needs no downloaded model files. Weights are deterministic.
+ */
+
+// Protobuf wire types
+const VARINT = 0;
+const LENGTH_DELIMITED = 2;
+
+// ONNX enums
+const FLOAT = 1;
+const ATTR_INTS = 7;
+
+function varint(value) {
+    const bytes = [];
+    let v = BigInt(value);
+    do {
+        let byte = Number(v & 0x7fn);
+        v >>= 7n;
+        if (v !== 0n) byte |= 0x80;
+        bytes.push(byte);
+    } while (v !== 0n);
+    return bytes;
+}
+
+function key(field, wireType) {
+    return varint((field << 3) | wireType);
+}
+
+function intField(field, value) {
+    return [...key(field, VARINT), ...varint(value)];
+}
+
+function bytesField(field, bytes) {
+    return [...key(field, LENGTH_DELIMITED), ...varint(bytes.length), ...bytes];
+}
+
+function stringField(field, text) {
+    return bytesField(field, [...Buffer.from(text, 'utf8')]);
+}
+
+function tensor(name, dims, values) {
+    const raw = new Uint8Array(new Float32Array(values).buffer);
+    return [
+        ...dims.flatMap(d => intField(1, d)),
+        ...intField(2, FLOAT),
+        ...stringField(8, name),
+        ...bytesField(9, [...raw]),
+    ];
+}
+
+function valueInfo(name, dims) {
+    const shape = dims.flatMap(d => bytesField(1, intField(1, d)));
+    const tensorType = [...intField(1, FLOAT), ...bytesField(2, shape)];
+    return [...stringField(1, name), ...bytesField(2, bytesField(1, tensorType))];
+}
+
+function intsAttribute(name, values) {
+    return [...stringField(1, name), ...values.flatMap(v => intField(8, v)), ...intField(20, ATTR_INTS)];
+}
+
+function node(opType, inputs, outputs, attributes = []) {
+    return [
+        ...inputs.flatMap(name => stringField(1, name)),
+        ...outputs.flatMap(name => stringField(2, name)),
+        ...stringField(3, `${opType}_${outputs[0]}`),
+        ...stringField(4, opType),
+        ...attributes.flatMap(attr => bytesField(5, attr)),
+    ];
+}
+
+function weights(count, seed) {
+    const values = new Array(count);
+    let state = seed;
+    for (let i = 0; i < count; i++) {
+        state = (state * 1103515245 + 12345) % 2147483648;
+        values[i] = (state / 2147483648 - 0.5) * 0.2;
+    }
+    return values;
+}
+
+/**
+ * Two 3x3 conv + ReLU layers and a 2x2 max pool: [1,3,size,size] -> [1,channels,size/2,size/2]
+ * @param {number} size - Input width and height
+ * @param {number} channels - Output channels of each conv
+ * @returns {Uint8Array} ONNX model bytes
+ */
+function convNet(size = 224, channels = 16) {
+    const conv = [intsAttribute('kernel_shape', [3, 3]), intsAttribute('pads', [1, 1, 1, 1])];
+    const pool = [intsAttribute('kernel_shape', [2, 2]), intsAttribute('strides', [2, 2])];
+    const graph = [
+        ...bytesField(1, node('Conv', ['input', 'w1', 'b1'], ['c1'], conv)),
+        ...bytesField(1, node('Relu', ['c1'], ['r1'])),
+        ...bytesField(1, node('Conv', ['r1', 'w2', 'b2'], ['c2'], conv)),
+        ...bytesField(1, node('Relu', ['c2'], ['r2'])),
+        ...bytesField(1, node('MaxPool', ['r2'], ['output'], pool)),
+        ...stringField(2, 'bench_convnet'),
+        ...bytesField(5, tensor('w1', [channels, 3, 3, 3], weights(channels * 27, 1))),
+        ...bytesField(5, tensor('b1', [channels], weights(channels, 2))),
+        ...bytesField(5, tensor('w2', [channels, channels, 3, 3], weights(channels * channels * 9, 3))),
+        ...bytesField(5, tensor('b2', [channels], weights(channels, 4))),
+        ...bytesField(11, valueInfo('input', [1, 3, size, size])),
+        ...bytesField(12, valueInfo('output', [1, channels, size / 2, size / 2])),
+    ];
+    return new Uint8Array([
+        ...intField(1, 7),
+        ...stringField(2, 'opencv-contrib-wasm-bench'),
+        ...bytesField(7, graph),
+        ...bytesField(8, intField(2, 11)),
+    ]);
+}
+
+module.exports = { convNet };
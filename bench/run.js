@@ -0,0 +1,276 @@
+/**
+ * OpenCV.js Benchmark Suite
+ *
+ * Times a representative set of bindings across image sizes for each build
+ * and writes a JSON report that bench/compare.js can diff between releases.
+ * Every build runs in its own Node process, so load/compile times are cold
+ * and builds cannot affect each other.
+ *
+ * Per case and size: iterations, mean / p50 / p99 latency, ops/s and
+ * megapixels/s. Per build: the startup report (read, compile, instantiate,
+ * runtime init), peak wasm heap and peak RSS.
+ *
+ * Run:
+ *   node bench/run.js                                 # every built variant of essential and full
+ *   node bench/run.js --builds full --sizes vga,4k --output bench-full.json
+ *   node bench/run.js --cases Canny,ORB --time 500
+ *
+ * Options:
+ *   --builds a,b      Build names under dist/ (default: every built one of essential,
+ *                     essential-threads, full and their relaxed SIMD variants the host runs)
+ *   --sizes a,b       qvga, vga, hd, fhd, 4k or WIDTHxHEIGHT (default: qvga,vga,fhd)
+ *   --cases a,b       Case name prefixes (default: all)
+ *   --time ms         Time budget per case and size (default: 1000)
+ *   --min-iterations  Minimum timed iterations (default: 5)
+ *   --output file     Write the JSON report here (default: print a table only)
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { spawnSync } = require('child_process');
+const { performance } = require('perf_hooks');
+const { hostCapabilities } = require('../src/select');
+
+const REPORT_VERSION = 1;
+const DIST_DIR = path.join(__dirname, '..', 'dist');
+const DEFAULT_BUILDS = [
+    'essential', 'essential-threads', 'full',
+    'essential-relaxed-simd', 'essential-threads-relaxed-simd', 'full-relaxed-simd',
+];
+
+const SIZES = {
+    qvga: [320, 240],
+    vga: [640, 480],
+    hd: [1280, 720],
+    fhd: [1920, 1080],
+    '4k': [3840, 2160],
+};
+
+function parseArgs(argv) {
+    const args = {
+        builds: null,
+        sizes: 'qvga,vga,fhd',
+        cases: null,
+        time: 1000,
+        minIterations: 5,
+        warmup: 2,
+        output: null,
+        child: null,
+    };
+    for (let i = 0; i < argv.length; i++) {
+        const arg = argv[i];
+        const value = () => {
+            if (i + 1 >= argv.length) throw new Error(`${arg} expects a value`);
+            return argv[++i];
+        };
+        switch (arg) {
+            case '--builds': args.builds = value().split(','); break;
+            case '--sizes': args.sizes = value(); break;
+            case '--cases': args.cases = value().split(','); break;
+            case '--time': args.time = Number(value()); break;
+            case '--min-iterations': args.minIterations = Number(value()); break;
+            case '--warmup': args.warmup = Number(value()); break;
+            case '--output': args.output = value(); break;
+            case '--child': args.child = value(); break;
+            case '--help':
+                console.log(fs.readFileSync(__filename, 'utf8').split('*/')[0]);
+                process.exit(0);
+                break;
+            default:
+                throw new Error(`Unknown option: ${arg}`);
+        }
+    }
+    return args;
+}
+
+function parseSizes(spec) {
+    return spec.split(',').map((name) => {
+        if (SIZES[name]) return { name, width: SIZES[name][0], height: SIZES[name][1] };
+        const match = /^(\d+)x(\d+)$/.exec(name);
+        if (!match) throw new Error(`Unknown size '${name}'`);
+        return { name, width: Number(match[1]), height: Number(match[2]) };
+    });
+}
+
+function percentile(sorted, p) {
+    const index = Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1);
+    return sorted[Math.max(0, index)];
+}
+
+function round(value) {
+    return Math.round(value * 1000) / 1000;
+}
+
+/**
+ * Benchmark one build in this process and return its report
+ */
+async function runBuild(build, args) {
+    const { load } = require('../src/runtime');
+    const { cases } = require('./cases');
+
+    const opencvPath = path.join(DIST_DIR, build, 'opencv.js');
+    const cv = await load(opencvPath);
+
+    // Any Mat's data view exposes the current wasm memory
+    const probe = new cv.Mat(1, 1, cv.CV_8UC1);
+    let peakHeap = 0;
+    let peakRss = 0;
+    const sample = () => {
+        peakHeap = Math.max(peakHeap, probe.data.buffer.byteLength);
+        peakRss = Math.max(peakRss, process.memoryUsage().rss);
+    };
+    sample();
+
+    const selected = cases.filter(c => !args.cases || args.cases.some(prefix => c.name.startsWith(prefix)));
+    const results = [];
+
+    for (const benchCase of selected) {
+        const missing = benchCase.requires.filter(name => typeof cv[name] !== 'function');
+        if (missing.length) {
+            results.push({ name: benchCase.name, skipped: `not in build: ${missing.join(', ')}` });
+            continue;
+        }
+        for (const size of parseSizes(args.sizes)) {
+            let state;
+            try {
+                state = benchCase.setup(cv, size.width, size.height);
+                for (let i = 0; i < args.warmup; i++) benchCase.run(cv, state);
+
+                const times = [];
+                const started = performance.now();
+                while (times.length < args.minIterations || performance.now() - started < args.time) {
+                    const t0 = performance.now();
+                    benchCase.run(cv, state);
+                    times.push(performance.now() - t0);
+                }
+                sample();
+
+                const sorted = [...times].sort((a, b) => a - b);
+                const mean = times.reduce((a, b) => a + b, 0) / times.length;
+                results.push({
+                    name: benchCase.name,
+                    size: size.name,
+                    width: size.width,
+                    height: size.height,
+                    iterations: times.length,
+                    meanMs: round(mean),
+                    p50Ms: round(percentile(sorted, 50)),
+                    p99Ms: round(percentile(sorted, 99)),
+                    minMs: round(sorted[0]),
+                    opsPerSec: round(1000 / mean),
+                    mpixPerSec: round((size.width * size.height / 1e6) * (1000 / mean)),
+                });
+            } catch (err) {
+                const message = typeof err === 'number' && cv.exceptionFromPtr
+                    ? cv.exceptionFromPtr(err).msg
+                    : String(err && err.message || err);
+                results.push({ name: benchCase.name, size: size.name, error: message });
+            } finally {
+                if (state) benchCase.teardown(state);
+            }
+        }
+    }
+
+    const buildInfo = typeof cv.getBuildInformation === 'function' ? cv.getBuildInformation() : '';
+    const parallel = /Parallel framework:\s*(.+)/.exec(buildInfo);
+    probe.delete();
+
+    return {
+        build,
+        parallelFramework: parallel ? parallel[1].trim() : 'none',
+        startup: cv.startupReport,
+        peakHeapBytes: peakHeap,
+        peakRssBytes: peakRss,
+        results,
+    };
+}
+
+function printTable(report) {
+    for (const build of report.builds) {
+        if (build.error) {
+            console.log(`\n=== ${build.build} ===\n  failed: ${build.error}`);
+            continue;
+        }
+        const s = build.startup;
+        console.log(`\n=== ${build.build} (threads: ${build.parallelFramework}) ===`);
+        console.log(
+            `startup: compile ${s.compileMs.toFixed(1)}ms, instantiate ${s.instantiateMs.toFixed(1)}ms, ` +
+            `runtime init ${s.runtimeInitMs.toFixed(1)}ms, total ${s.totalMs.toFixed(1)}ms`
+        );
+        console.log(`peak heap: ${(build.peakHeapBytes / 1048576).toFixed(1)}MB, peak RSS: ${(build.peakRssBytes / 1048576).toFixed(1)}MB`);
+        for (const r of build.results) {
+            const label = `  ${r.name}${r.size ? ` @ ${r.size}` : ''}`.padEnd(40);
+            if (r.skipped) {
+                console.log(`${label} skipped (${r.skipped})`);
+            } else if (r.error) {
+                console.log(`${label} error: ${r.error}`);
+            } else {
+                console.log(
+                    `${label} p50 ${r.p50Ms.toFixed(2).padStart(9)}ms  p99 ${r.p99Ms.toFixed(2).padStart(9)}ms  ` +
+                    `${r.opsPerSec.toFixed(1).padStart(8)} ops/s  ${r.mpixPerSec.toFixed(1).padStart(8)} MP/s`
+                );
+            }
+        }
+    }
+}
+
+async function main() {
+    const args = parseArgs(process.argv.slice(2));
+
+    if (args.child) {
+        // Results go to a file: opencv.js may print to stdout
+        const result = await runBuild(args.child, args);
+        fs.writeFileSync(args.output, JSON.stringify(result));
+        process.exit(0);
+    }
+
+    const builds = args.builds ||
+        DEFAULT_BUILDS.filter(build => fs.existsSync(path.join(DIST_DIR, build, 'opencv.js')) &&
+            (!build.endsWith('-relaxed-simd') || hostCapabilities().relaxedSimd));
+    if (!builds.length) {
+        console.error('No builds found in dist/. Run "npm run build" first.');
+        process.exit(1);
+    }
+
+    const report = {
+        version: REPORT_VERSION,
+        date: new Date().toISOString(),
+        package: require('../package.json').version,
+        node: process.version,
+        platform: `${os.platform()}-${os.arch()}`,
+        cpu: os.cpus()[0] ? os.cpus()[0].model : 'unknown',
+        cpus: os.cpus().length,
+        options: { sizes: args.sizes, time: args.time, minIterations: args.minIterations },
+        builds: [],
+    };
+
+    const childArgs = process.argv.slice(2).filter((arg, i, all) =>
+        arg !== '--builds' && all[i - 1] !== '--builds' && arg !== '--output' && all[i - 1] !== '--output');
+
+    for (const build of builds) {
+        console.error(`Benchmarking ${build}...`);
+        const resultFile = path.join(os.tmpdir(), `opencv-bench-${process.pid}-${build}.json`);
+        const child = spawnSync(process.execPath, [__filename, '--child', build, '--output', resultFile, ...childArgs], {
+            stdio: ['ignore', 'ignore', 'inherit'],
+        });
+        if (child.status !== 0 || !fs.existsSync(resultFile)) {
+            report.builds.push({ build, error: `exited with status ${child.status}` });
+            continue;
+        }
+        report.builds.push(JSON.parse(fs.readFileSync(resultFile, 'utf8')));
+        fs.unlinkSync(resultFile);
+    }
+
+    printTable(report);
+
+    if (args.output) {
+        fs.writeFileSync(args.output, JSON.stringify(report, null, 2) + '\n');
+        console.log(`\nReport written to ${args.output}`);
+    }
+}
+
+main().catch((err) => {
+    console.error(err.message || err);
+    process.exit(1);
+});
@@ -1,4 +1,220 @@
-async function loadOpenCV(paths, onloadCallback) {
+/**
+ * Fetch a URL, reporting bytes as the body streams in.
+ *
+ * The counted body is wrapped in a new Response with the original headers,
+ * so WebAssembly.instantiateStreaming still compiles while downloading.
+ * `total` is the expected size: Content-Length when the response is not
+ * content-encoded (the stream yields decoded bytes), else the caller's hint.
+ */
+async function fetchWithProgress(url, onBytes, expectedSize) {
+    let response = await fetch(url);
+    if (!response.ok) {
+        throw new Error("Failed to fetch " + url + ": " + response.status);
+    }
+    if (!onBytes || !response.body || typeof ReadableStream === 'undefined') {
+        if (onBytes) {
+            let size = Number(response.headers.get('Content-Length')) || expectedSize || 0;
+            onBytes(size, size, true);
+        }
+        return response;
+    }
+
+    let total = response.headers.get('Content-Encoding') ? 0 : Number(response.headers.get('Content-Length')) || 0;
+    total = total || expectedSize || 0;
+    let loaded = 0;
+    let reader = response.body.getReader();
+    let body = new ReadableStream({
+        async pull(controller) {
+            let chunk = await reader.read();
+            if (chunk.done) {
+                onBytes(loaded, loaded, true);
+                controller.close();
+                return;
+            }
+            loaded += chunk.value.byteLength;
+            onBytes(loaded, Math.max(total, loaded));
+            controller.enqueue(chunk.value);
+        },
+        cancel(reason) {
+            return reader.cancel(reason);
+        }
+    });
+    onBytes(0, total);
+    return new Response(body, {
+        status: response.status,
+        statusText: response.statusText,
+        headers: response.headers
+    });
+}
+
+/**
+ * Start fetching opencv_js.wasm, from Cache Storage when enabled.
+ *
+ * With caching enabled the wasm response is kept in Cache Storage, so later
+ * page loads skip the network and compile from the cached response with
+ * instantiateStreaming, which lets the browser reuse its wasm code cache.
+ * (Browsers no longer allow WebAssembly.Module in IndexedDB.)
+ */
+async function fetchOpenCVWasm(wasmUrl, cacheName, report, onBytes, expectedSize) {
+    let start = performance.now();
+    let response = null;
+
+    if (cacheName && typeof caches !== 'undefined') {
+        let cache = await caches.open(cacheName);
+        response = await cache.match(wasmUrl);
+        report.cache = response ? "hit" : "miss";
+        if (!response) {
+            response = await fetch(wasmUrl);
+            if (response.ok) {
+                await cache.put(wasmUrl, response.clone());
+            }
+        }
+        if (!response.ok) {
+            throw new Error("Failed to fetch " + wasmUrl + ": " + response.status);
+        }
+        if (onBytes) {
+            // Count the cached body the same way as a network one
+            let bytes = await response.arrayBuffer();
+            onBytes(bytes.byteLength, bytes.byteLength, true);
+            response = new Response(bytes, { headers: response.headers });
+        }
+    } else {
+        response = await fetchWithProgress(wasmUrl, onBytes, expectedSize);
+    }
+    report.fetchStartMs = start;
+    return response;
+}
+
+/**
+ * Compile and instantiate opencv_js.wasm from a Response (or its promise)
+ * for the Emscripten instantiateWasm hook.
+ */
+async function instantiateOpenCVWasm(responsePromise, imports, report, onCompile) {
+    let response = await responsePromise;
+    let start = performance.now();
+    let result;
+    if (typeof WebAssembly.instantiateStreaming === 'function' &&
+        response.headers.get('Content-Type') === 'application/wasm') {
+        // Compiles while the body streams in; compile and instantiate are not separable here
+        result = await WebAssembly.instantiateStreaming(response, imports);
+        report.fetchMs = performance.now() - report.fetchStartMs;
+        report.compileMs = performance.now() - start;
+    } else {
+        let bytes = await response.arrayBuffer();
+        report.fetchMs = performance.now() - report.fetchStartMs;
+        start = performance.now();
+        if (onCompile) {
+            onCompile();
+        }
+        let module = await WebAssembly.compile(bytes);
+        report.compileMs = performance.now() - start;
+        start = performance.now();
+        result = { module: module, instance: await WebAssembly.instantiate(module, imports) };
+        report.instantiateMs = performance.now() - start;
+    }
+    return result;
+}
+
+/**
+ * Start OpenCV's worker threads now instead of on the first parallel call.
+ * OpenCV creates its thread pool lazily; one small parallel resize makes it
+ * take its threads from the pthread pool during loading.
+ */
+function prewarmOpenCVThreads(cv) {
+    if (typeof cv.getNumThreads !== 'function' || cv.getNumThreads() <= 1) {
+        return;
+    }
+    let src = new cv.Mat(512, 512, cv.CV_8UC1);
+    let dst = new cv.Mat();
+    cv.resize(src, dst, new cv.Size(256, 256), 0, 0, cv.INTER_AREA);
+    src.delete();
+    dst.delete();
+}
+
+/**
+ * Map build file names to their content-hashed URLs from manifest.json
+ * (written by scripts/compress-dist.js). Hashed URLs never change content,
+ * so servers can cache them as immutable. Falls back to the plain names.
+ */
+async function loadHashedUrls(scriptUrl) {
+    let base = new URL(scriptUrl, document.baseURI);
+    let files = {};
+    try {
+        let response = await fetch(new URL("manifest.json", base).href, { cache: "no-cache" });
+        if (response.ok) {
+            files = (await response.json()).files || {};
+        }
+    } catch (err) {
+        console.log("Failed to load manifest.json, using unhashed URLs: " + err.message);
+    }
+    let lookup = function(name) {
+        return new URL(files[name] ? files[name].url : name, base).href;
+    };
+    lookup.size = function(name) {
+        return files[name] ? files[name].size : 0;
+    };
+    return lookup;
+}
+
+/**
+ * Merge per-file download progress into one onProgress callback:
+ * { phase, loaded, total, fraction }. Phases: "download", "compile" (the
+ * wasm is fully downloaded and still compiling), "init" (runtime start-up),
+ * "ready" and "error". Downloads map to fraction 0-0.9 by bytes; fraction is
+ * null while a file's size is unknown (compressed response, no manifest).
+ */
+function createLoadProgress(onProgress) {
+    let files = {};
+    let phase = "download";
+    let fractions = { compile: 0.9, init: 0.95, ready: 1 };
+
+    let emit = function() {
+        if (!onProgress) {
+            return;
+        }
+        let loaded = 0;
+        let total = 0;
+        let known = true;
+        for (let name in files) {
+            loaded += files[name].loaded;
+            total += files[name].total;
+            known = known && files[name].total > 0;
+        }
+        let fraction = phase in fractions ? fractions[phase] :
+            (phase === "download" && known && total > 0 ? 0.9 * loaded / total : null);
+        onProgress({ phase: phase, loaded: loaded, total: total, fraction: fraction });
+    };
+
+    return {
+        file: function(name) {
+            files[name] = { loaded: 0, total: 0, done: false };
+            return function(loaded, total, done) {
+                files[name].loaded = loaded;
+                files[name].total = total;
+                files[name].done = Boolean(done);
+                if (phase !== "download") {
+                    return;
+                }
+                emit();
+                let all = Object.keys(files).every(function(key) { return files[key].done; });
+                if (all) {
+                    phase = "compile";
+                    emit();
+                }
+            };
+        },
+        phase: function(next) {
+            // Phases only move forward
+            let order = ["download", "compile", "init", "ready"];
+            if (next === "error" || order.indexOf(next) > order.indexOf(phase)) {
+                phase = next;
+                emit();
+            }
+        }
+    };
+}
+
+async function loadOpenCV(paths, onloadCallback, options = {}) {
     let OPENCV_URL = "";
     let asmPath = "";
     let wasmPath = "";
@@ -84,6 +300,112 @@ async function loadOpenCV(paths, onloadCallback) {
         throw new Error("No available OpenCV.js, please check your paths");
     }
 
+    // Emscripten Module options; opencv.js reads the global Module when it loads
+    let moduleArg = {};
+
+    // Content-hashed URLs for opencv.js, the wasm and worker files
+    let hashedUrl = null;
+    if (options.hashedUrls) {
+        hashedUrl = await loadHashedUrls(OPENCV_URL);
+        OPENCV_URL = hashedUrl("opencv.js");
+        moduleArg.locateFile = function(path) {
+            return hashedUrl(path);
+        };
+    }
+
+    // Pthread workers to start (threaded builds with patches/threads_pre.js)
+    if (options.pthreadPoolSize) {
+        moduleArg.pthreadPoolSize = options.pthreadPoolSize === "auto" ?
+            (navigator.hardwareConcurrency || 4) : options.pthreadPoolSize;
+    }
+
+    let cacheName = options.cache === true ? "opencv-wasm" : (options.cache || "");
+    let scriptUrl = new URL(OPENCV_URL, document.baseURI).href;
+    let wasmUrl = options.wasmUrl || (hashedUrl ? hashedUrl("opencv_js.wasm") : new URL("opencv_js.wasm", scriptUrl).href);
+    let progress = createLoadProgress(options.onProgress);
+    let started = performance.now();
+    let instantiated = started;
+    let report = {
+        url: OPENCV_URL,
+        cache: cacheName ? "miss" : "off",
+        fetchMs: 0,
+        compileMs: 0,
+        instantiateMs: 0,
+        runtimeInitMs: 0,
+        totalMs: 0
+    };
+
+    // Streaming load: the wasm download starts now, in parallel with
+    // opencv.js, instead of after opencv.js has been downloaded and run.
+    // opencv.js runs from a Blob that the pthread workers start from too.
+    let streaming = options.streaming !== false && wasmSupported && typeof fetch === 'function';
+    let scriptProgress = streaming ? progress.file("opencv.js") : null;
+
+    // Settles once: with the runtime after postRun, or with the first load failure
+    let fail;
+    let ready = new Promise(function(resolve, reject) {
+        fail = function(err) {
+            progress.phase("error");
+            reject(err);
+        };
+        moduleArg.postRun = [function() {
+            let now = performance.now();
+            report.runtimeInitMs = now - instantiated;
+            report.totalMs = now - started;
+            if (options.prewarm) {
+                prewarmOpenCVThreads(moduleArg);
+            }
+            progress.phase("ready");
+            if (options.onStartupReport) {
+                options.onStartupReport(report);
+            }
+            resolve(moduleArg);
+        }];
+    });
+
+    if (wasmSupported && (streaming || cacheName || options.onStartupReport || options.onProgress)) {
+        let wasmResponse = fetchOpenCVWasm(wasmUrl, cacheName, report, progress.file("opencv_js.wasm"),
+            hashedUrl ? hashedUrl.size("opencv_js.wasm") : 0);
+        // Failures are reported when opencv.js asks for the instance
+        wasmResponse.catch(function() {});
+
+        moduleArg.instantiateWasm = function(imports, receiveInstance) {
+            instantiateOpenCVWasm(wasmResponse, imports, report, function() {
+                progress.phase("compile");
+            }).then(function(result) {
+                instantiated = performance.now();
+                progress.phase("init");
+                receiveInstance(result.instance, result.module);
+            }).catch(function(err) {
+                console.log("Failed to instantiate opencv_js.wasm: " + err.message);
+                fail(err);
+            });
+            return {};
+        };
+    }
+
+    // Builds with a separate pthread worker script: fetch it alongside
+    if (streaming && hashedUrl && hashedUrl.size("opencv_js.worker.js")) {
+        fetch(hashedUrl("opencv_js.worker.js")).catch(function() {});
+    }
+
+    let scriptSrc = OPENCV_URL;
+    if (streaming) {
+        let scriptResponse = await fetchWithProgress(scriptUrl, scriptProgress,
+            hashedUrl ? hashedUrl.size("opencv.js") : 0);
+        let scriptBlob = new Blob([await scriptResponse.arrayBuffer()], { type: "text/javascript" });
+        moduleArg.mainScriptUrlOrBlob = scriptBlob;
+        // A Blob script has no directory: resolve its files next to the original URL
+        if (!moduleArg.locateFile) {
+            moduleArg.locateFile = function(path) {
+                return new URL(path, scriptUrl).href;
+            };
+        }
+        scriptSrc = URL.createObjectURL(scriptBlob);
+    }
+
+    window.Module = moduleArg;
+
     let script = document.createElement('script');
     script.setAttribute('async', '');
     script.setAttribute('type', 'text/javascript');
@@ -92,10 +414,12 @@ async function loadOpenCV(paths, onloadCallback) {
     });
     script.addEventListener('error', () => {
         console.log('Failed to load opencv.js');
+        fail(new Error("Failed to load " + OPENCV_URL));
     });
-    script.src = OPENCV_URL;
+    script.src = scriptSrc;
     let node = document.getElementsByTagName('script')[0];
-    if (node.src != OPENCV_URL) {
+    if (node.src != scriptSrc) {
         node.parentNode.insertBefore(script, node);
     }
-}
\ No newline at end of file
+    return ready;
+}
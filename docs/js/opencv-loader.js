@@ -1,5 +1,10 @@
 /**
  * OpenCV.js Loader - Centralized loading with progress tracking
+ *
+ * opencv_js.wasm is downloaded in parallel with opencv.js and compiled with
+ * WebAssembly.instantiateStreaming while it downloads; progress reflects the
+ * bytes received. opencv.js runs from a Blob, which the pthread workers of
+ * threaded builds start from as well instead of downloading it again.
  */
 
 const OpenCVLoader = {
@@ -8,6 +13,7 @@ const OpenCVLoader = {
     loadPromise: null,
     callbacks: [],
     loadStartTime: null,
+    prewarm: false,
 
     /**
      * Load OpenCV.js with progress feedback
@@ -15,13 +21,17 @@ const OpenCVLoader = {
      * @param {string} options.buildType - 'full' or 'essential' (default: 'full')
      * @param {Function} options.onProgress - Progress callback (0-100)
      * @param {HTMLElement} options.statusElement - Element to update with status text
+     * @param {boolean} options.streaming - Parallel streaming download (default: true)
+     * @param {boolean} options.prewarm - Start OpenCV's worker threads while loading (default: false)
      * @returns {Promise} Resolves when OpenCV is ready
      */
     load(options = {}) {
         const {
             buildType = 'full',
             onProgress = null,
-            statusElement = null
+            statusElement = null,
+            streaming = typeof fetch === 'function' && typeof WebAssembly !== 'undefined',
+            prewarm = false
         } = options;
 
         // Already loaded
@@ -36,6 +46,7 @@ const OpenCVLoader = {
 
         this.isLoading = true;
         this.loadStartTime = performance.now();
+        this.prewarm = prewarm;
 
         this.loadPromise = new Promise((resolve, reject) => {
             const updateStatus = (text) => {
@@ -81,13 +92,15 @@ const OpenCVLoader = {
             // Store reference to this for callbacks
             const self = this;
 
-            // Simulate progress during load
-            let progressInterval = setInterval(() => {
-                const elapsed = performance.now() - self.loadStartTime;
-                // Slowly increase progress, max out at 80% until actual load
-                const simulatedProgress = Math.min(80, 10 + (elapsed / 100));
-                updateProgress(simulatedProgress);
-            }, 100);
+            // Progress: bytes received map to 10-80%, compile to 80-85%
+            let progressInterval = null;
+            const simulateProgress = () => {
+                // Without byte counts, slowly increase progress, max out at 80% until actual load
+                progressInterval = setInterval(() => {
+                    const elapsed = performance.now() - self.loadStartTime;
+                    updateProgress(Math.min(80, 10 + (elapsed / 100)));
+                }, 100);
+            };
 
             script.onload = function() {
                 clearInterval(progressInterval);
@@ -137,7 +150,8 @@ const OpenCVLoader = {
                     const checkReady = function() {
                         if (cv.Mat) {
                             self.finishLoading(resolve, updateStatus, updateProgress);
-                        } else {
+                        } else if (self.isLoading) {
+                            // Stops once a wasm failure has rejected the load
                             setTimeout(checkReady, 50);
                         }
                     };
@@ -153,16 +167,179 @@ const OpenCVLoader = {
                 reject(new Error(`Failed to load OpenCV.js from ${scriptPath}`));
             };
 
-            document.head.appendChild(script);
+            if (!streaming) {
+                simulateProgress();
+                document.head.appendChild(script);
+                return;
+            }
+
+            this.streamScript(scriptPath, {
+                onBytes: (loaded, total) => {
+                    if (total > 0) {
+                        updateProgress(10 + 70 * loaded / total);
+                    }
+                    updateStatus(`Downloading OpenCV.js... ${(loaded / 1048576).toFixed(1)}MB` +
+                        (total > 0 ? ` / ${(total / 1048576).toFixed(1)}MB` : ''));
+                },
+                onCompile: () => {
+                    updateProgress(80);
+                    updateStatus('Compiling OpenCV WASM...');
+                },
+                onError: (err) => {
+                    this.isLoading = false;
+                    updateStatus('Failed to load OpenCV WASM: ' + err.message);
+                    updateProgress(0);
+                    reject(err);
+                }
+            }).then((src) => {
+                script.src = src;
+                document.head.appendChild(script);
+            }).catch((err) => {
+                console.warn('Streaming load failed, loading opencv.js directly:', err);
+                delete window.Module;
+                script.src = scriptPath;
+                simulateProgress();
+                document.head.appendChild(script);
+            });
         });
 
         return this.loadPromise;
     },
 
+    /**
+     * Fetch a URL, reporting the bytes received
+     * @param {string} url - URL to fetch
+     * @param {Function} onBytes - Called with (loaded, total); total is 0 when unknown
+     * @returns {Promise<Response>} Response whose body is counted as it is read
+     */
+    async fetchWithProgress(url, onBytes) {
+        const response = await fetch(url);
+        if (!response.ok) {
+            throw new Error(`Failed to fetch ${url}: ${response.status}`);
+        }
+        if (!response.body || typeof ReadableStream === 'undefined') {
+            return response;
+        }
+
+        // Content-Length counts encoded bytes; the stream yields decoded ones
+        const total = response.headers.get('Content-Encoding') ? 0 : Number(response.headers.get('Content-Length')) || 0;
+        const reader = response.body.getReader();
+        let loaded = 0;
+        onBytes(0, total);
+        const body = new ReadableStream({
+            async pull(controller) {
+                const chunk = await reader.read();
+                if (chunk.done) {
+                    controller.close();
+                    return;
+                }
+                loaded += chunk.value.byteLength;
+                onBytes(loaded, Math.max(total, loaded));
+                controller.enqueue(chunk.value);
+            },
+            cancel(reason) {
+                return reader.cancel(reason);
+            }
+        });
+        // Same headers, so instantiateStreaming still sees application/wasm
+        return new Response(body, { status: response.status, headers: response.headers });
+    },
+
+    /**
+     * Download opencv.js and opencv_js.wasm in parallel and prepare window.Module
+     * so opencv.js instantiates the wasm that is already downloading
+     * @param {string} scriptPath - URL of opencv.js
+     * @param {Object} handlers - { onBytes(loaded, total), onCompile(), onError(err) for a failed
+     *        wasm fetch, compile or instantiate once opencv.js is running }
+     * @returns {Promise<string>} Object URL to load opencv.js from
+     */
+    async streamScript(scriptPath, handlers) {
+        const scriptUrl = new URL(scriptPath, document.baseURI).href;
+        const wasmUrl = new URL('opencv_js.wasm', scriptUrl).href;
+
+        const files = { script: { loaded: 0, total: 0 }, wasm: { loaded: 0, total: 0 } };
+        let compiling = false;
+        const compile = () => {
+            if (!compiling) {
+                compiling = true;
+                handlers.onCompile();
+            }
+        };
+        const counter = (name) => (loaded, total) => {
+            files[name].loaded = loaded;
+            files[name].total = total;
+            if (compiling) {
+                return;
+            }
+            // Report a fraction only once both sizes are known
+            const known = files.script.total > 0 && files.wasm.total > 0;
+            handlers.onBytes(files.script.loaded + files.wasm.loaded,
+                known ? files.script.total + files.wasm.total : 0);
+            // Downloaded; instantiateStreaming is finishing the compile
+            if (known && files.script.loaded >= files.script.total && files.wasm.loaded >= files.wasm.total) {
+                compile();
+            }
+        };
+
+        const wasmResponse = this.fetchWithProgress(wasmUrl, counter('wasm'));
+        // Failures surface through the instantiateWasm hook or the script fetch
+        wasmResponse.catch(() => {});
+        const scriptResponse = await this.fetchWithProgress(scriptUrl, counter('script'));
+        const scriptBlob = new Blob([await scriptResponse.arrayBuffer()], { type: 'text/javascript' });
+        // Fall back to a plain script tag if the wasm is not there
+        await wasmResponse;
+
+        window.Module = {
+            // Threaded builds start their pthread workers from the same Blob
+            mainScriptUrlOrBlob: scriptBlob,
+            // A Blob script has no directory: resolve files next to the original URL
+            locateFile: (path) => new URL(path, scriptUrl).href,
+            instantiateWasm: (imports, receiveInstance) => {
+                wasmResponse.then((response) => {
+                    if (typeof WebAssembly.instantiateStreaming === 'function' &&
+                        response.headers.get('Content-Type') === 'application/wasm') {
+                        return WebAssembly.instantiateStreaming(response, imports);
+                    }
+                    return response.arrayBuffer().then((bytes) => {
+                        compile();
+                        return WebAssembly.instantiate(bytes, imports);
+                    });
+                }).then((result) => {
+                    receiveInstance(result.instance, result.module);
+                }).catch((err) => {
+                    console.error('Failed to instantiate opencv_js.wasm:', err);
+                    handlers.onError(err);
+                });
+                return {};
+            }
+        };
+        // The wasm keeps downloading (and compiling) while opencv.js starts up
+        return URL.createObjectURL(scriptBlob);
+    },
+
+    /**
+     * Start OpenCV's worker threads now instead of on the first parallel call
+     * (OpenCV creates its thread pool lazily)
+     */
+    prewarmThreads() {
+        if (typeof cv.getNumThreads !== 'function' || cv.getNumThreads() <= 1) {
+            return;
+        }
+        const src = new cv.Mat(512, 512, cv.CV_8UC1);
+        const dst = new cv.Mat();
+        cv.resize(src, dst, new cv.Size(256, 256), 0, 0, cv.INTER_AREA);
+        src.delete();
+        dst.delete();
+    },
+
     finishLoading(resolve, updateStatus, updateProgress) {
         this.isLoaded = true;
         this.isLoading = false;
 
+        if (this.prewarm) {
+            this.prewarmThreads();
+        }
+
         const loadTime = ((performance.now() - this.loadStartTime) / 1000).toFixed(2);
         updateProgress(100);
         updateStatus(`OpenCV.js ready (${loadTime}s)`);
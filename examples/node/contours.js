@@ -250,6 +250,23 @@
         console.log(`  Contour ${i}: [${next}, ${prev}, ${child}, ${parent}]`);
     }
 
+    // ============================================
+    // Example 9: Bulk Export to Typed Arrays
+    // ============================================
+    console.log('\n=== Example 9: Bulk Export ===');
+
+    if (typeof cv.contoursToArrays === 'function') {
+        // Every point of every contour in one call, no per-contour get()
+        const { points, offsets } = cv.contoursToArrays(contours);
+        console.log(`${offsets.length - 1} contours, ${points.length / 2} points in one Int32Array`);
+        for (let i = 0; i < Math.min(offsets.length - 1, 3); i++) {
+            const contour = points.subarray(offsets[i] * 2, offsets[i + 1] * 2);
+            console.log(`  Contour ${i}: ${contour.length / 2} points, first (${contour[0]}, ${contour[1]})`);
+        }
+    } else {
+        console.log('contoursToArrays() is not in this build');
+    }
+
     // ============================================
     // Clean up
     // ============================================
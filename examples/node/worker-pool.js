@@ -0,0 +1,53 @@
+/**
+ * Batch Processing with a Worker Pool
+ *
+ * Demonstrates:
+ * - Creating a worker_threads pool with cv.createPool()
+ * - Passing image data to workers as transferable buffers
+ * - Running the same pipeline over a batch with pool.map()
+ *
+ * Run: node examples/node/worker-pool.js
+ */
+
+const os = require('os');
+
+(async () => {
+    console.log('Loading OpenCV.js...');
+    const cv = await require('../../src/index.js');
+    console.log('OpenCV.js loaded successfully!\n');
+
+    const size = Math.min(os.cpus().length, 4);
+    const pool = cv.createPool({ size });
+    await pool.ready;
+    console.log(`Pool ready with ${pool.size} workers\n`);
+
+    // Build a batch of synthetic grayscale frames on the main thread
+    const frames = [];
+    for (let i = 0; i < 16; i++) {
+        const mat = new cv.Mat(480, 640, cv.CV_8UC1, new cv.Scalar(0));
+        cv.circle(mat, new cv.Point(100 + i * 25, 240), 60, new cv.Scalar(255), -1);
+        frames.push({ rows: mat.rows, cols: mat.cols, type: mat.type(), data: new Uint8Array(mat.data) });
+        mat.delete();
+    }
+
+    // Tasks run inside the workers: they receive that worker's cv and cannot
+    // use variables from this scope
+    const pipeline = (cv, frame, { toMat }) => {
+        const src = toMat(frame);
+        const blurred = new cv.Mat();
+        const edges = new cv.Mat();
+        cv.GaussianBlur(src, blurred, new cv.Size(5, 5), 0);
+        cv.Canny(blurred, edges, 50, 150);
+        const edgePixels = cv.countNonZero(edges);
+        src.delete(); blurred.delete(); edges.delete();
+        return edgePixels;
+    };
+
+    const start = Date.now();
+    const counts = await pool.map(pipeline, frames, { transfer: true });
+    console.log(`Processed ${frames.length} frames in ${Date.now() - start}ms`);
+    console.log(`Edge pixels per frame: ${counts.join(', ')}`);
+
+    await pool.close();
+    console.log('\nWorker pool example completed!');
+})();
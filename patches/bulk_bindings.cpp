@@ -0,0 +1,186 @@
+
+// Bulk result accessors.
+//
+// Appended to OpenCV's modules/js/src/core_bindings.cpp by
+// scripts/download-opencv.sh. Reading a KeyPointVector, DMatchVector or
+// contour MatVector element by element with .get(i) crosses the embind
+// boundary and allocates a JS object per element; these copy a whole vector
+// into one typed array per field in a single call, and build vectors back
+// from typed arrays. src/bulk.js provides the same functions in plain JS for
+// builds without them.
+
+namespace bulk_utils
+{
+    template<typename T>
+    emscripten::val toTypedArray(const char* arrayType, const std::vector<T>& values)
+    {
+        emscripten::val array = emscripten::val::global(arrayType).new_(values.size());
+        if (!values.empty())
+            array.call<void>("set", emscripten::val(emscripten::typed_memory_view(values.size(), values.data())));
+        return array;
+    }
+
+    template<typename T>
+    std::vector<T> field(const emscripten::val& arrays, const char* name, size_t count, T fallback)
+    {
+        if (!arrays.hasOwnProperty(name))
+            return std::vector<T>(count, fallback);
+        std::vector<T> values = emscripten::convertJSArrayToNumberVector<T>(arrays[name]);
+        CV_Assert(values.size() == count);
+        return values;
+    }
+
+    // { pt: Float32Array(2n), size, angle, response: Float32Array(n), octave, classId: Int32Array(n) }
+    emscripten::val keyPointsToArrays(const std::vector<cv::KeyPoint>& keypoints)
+    {
+        const size_t n = keypoints.size();
+        std::vector<float> pt(n * 2), size(n), angle(n), response(n);
+        std::vector<int> octave(n), classId(n);
+        for (size_t i = 0; i < n; i++)
+        {
+            const cv::KeyPoint& kp = keypoints[i];
+            pt[i * 2] = kp.pt.x;
+            pt[i * 2 + 1] = kp.pt.y;
+            size[i] = kp.size;
+            angle[i] = kp.angle;
+            response[i] = kp.response;
+            octave[i] = kp.octave;
+            classId[i] = kp.class_id;
+        }
+        emscripten::val result = emscripten::val::object();
+        result.set("pt", toTypedArray("Float32Array", pt));
+        result.set("size", toTypedArray("Float32Array", size));
+        result.set("angle", toTypedArray("Float32Array", angle));
+        result.set("response", toTypedArray("Float32Array", response));
+        result.set("octave", toTypedArray("Int32Array", octave));
+        result.set("classId", toTypedArray("Int32Array", classId));
+        return result;
+    }
+
+    // pt is required; the other fields default to KeyPoint's defaults (size 1)
+    std::vector<cv::KeyPoint> keyPointsFromArrays(const emscripten::val& arrays)
+    {
+        std::vector<float> pt = emscripten::convertJSArrayToNumberVector<float>(arrays["pt"]);
+        CV_Assert(pt.size() % 2 == 0);
+        const size_t n = pt.size() / 2;
+        std::vector<float> size = field<float>(arrays, "size", n, 1.f);
+        std::vector<float> angle = field<float>(arrays, "angle", n, -1.f);
+        std::vector<float> response = field<float>(arrays, "response", n, 0.f);
+        std::vector<int> octave = field<int>(arrays, "octave", n, 0);
+        std::vector<int> classId = field<int>(arrays, "classId", n, -1);
+
+        std::vector<cv::KeyPoint> keypoints(n);
+        for (size_t i = 0; i < n; i++)
+            keypoints[i] = cv::KeyPoint(pt[i * 2], pt[i * 2 + 1], size[i], angle[i], response[i], octave[i], classId[i]);
+        return keypoints;
+    }
+
+    void appendMatches(const std::vector<cv::DMatch>& matches, std::vector<int>& queryIdx,
+                       std::vector<int>& trainIdx, std::vector<int>& imgIdx, std::vector<float>& distance)
+    {
+        for (const cv::DMatch& m : matches)
+        {
+            queryIdx.push_back(m.queryIdx);
+            trainIdx.push_back(m.trainIdx);
+            imgIdx.push_back(m.imgIdx);
+            distance.push_back(m.distance);
+        }
+    }
+
+    emscripten::val matchArrays(const std::vector<int>& queryIdx, const std::vector<int>& trainIdx,
+                                const std::vector<int>& imgIdx, const std::vector<float>& distance)
+    {
+        emscripten::val result = emscripten::val::object();
+        result.set("queryIdx", toTypedArray("Int32Array", queryIdx));
+        result.set("trainIdx", toTypedArray("Int32Array", trainIdx));
+        result.set("imgIdx", toTypedArray("Int32Array", imgIdx));
+        result.set("distance", toTypedArray("Float32Array", distance));
+        return result;
+    }
+
+    // { queryIdx, trainIdx, imgIdx: Int32Array(n), distance: Float32Array(n) }
+    emscripten::val matchesToArrays(const std::vector<cv::DMatch>& matches)
+    {
+        std::vector<int> queryIdx, trainIdx, imgIdx;
+        std::vector<float> distance;
+        appendMatches(matches, queryIdx, trainIdx, imgIdx, distance);
+        return matchArrays(queryIdx, trainIdx, imgIdx, distance);
+    }
+
+    // knnMatch / radiusMatch results: matches of query i are [offsets[i], offsets[i + 1])
+    emscripten::val knnMatchesToArrays(const std::vector<std::vector<cv::DMatch> >& matches)
+    {
+        std::vector<int> queryIdx, trainIdx, imgIdx, offsets(1, 0);
+        std::vector<float> distance;
+        for (const std::vector<cv::DMatch>& row : matches)
+        {
+            appendMatches(row, queryIdx, trainIdx, imgIdx, distance);
+            offsets.push_back((int)queryIdx.size());
+        }
+        emscripten::val result = matchArrays(queryIdx, trainIdx, imgIdx, distance);
+        result.set("offsets", toTypedArray("Int32Array", offsets));
+        return result;
+    }
+
+    std::vector<cv::DMatch> matchesFromArrays(const emscripten::val& arrays)
+    {
+        std::vector<int> queryIdx = emscripten::convertJSArrayToNumberVector<int>(arrays["queryIdx"]);
+        const size_t n = queryIdx.size();
+        std::vector<int> trainIdx = field<int>(arrays, "trainIdx", n, -1);
+        std::vector<int> imgIdx = field<int>(arrays, "imgIdx", n, -1);
+        std::vector<float> distance = field<float>(arrays, "distance", n, 0.f);
+
+        std::vector<cv::DMatch> matches(n);
+        for (size_t i = 0; i < n; i++)
+            matches[i] = cv::DMatch(queryIdx[i], trainIdx[i], imgIdx[i], distance[i]);
+        return matches;
+    }
+
+    // { points: Int32Array(2 * total) as x, y pairs, offsets: Int32Array(n + 1) in points }
+    emscripten::val contoursToArrays(const std::vector<cv::Mat>& contours)
+    {
+        std::vector<int> points, offsets(1, 0);
+        for (const cv::Mat& contour : contours)
+        {
+            const int count = contour.checkVector(2, CV_32S);
+            CV_Assert(count >= 0);
+            const cv::Mat continuous = contour.isContinuous() ? contour : contour.clone();
+            const int* data = continuous.ptr<int>();
+            points.insert(points.end(), data, data + count * 2);
+            offsets.push_back((int)(points.size() / 2));
+        }
+        emscripten::val result = emscripten::val::object();
+        result.set("points", toTypedArray("Int32Array", points));
+        result.set("offsets", toTypedArray("Int32Array", offsets));
+        return result;
+    }
+
+    // One CV_32SC2 Mat per contour, ready for drawContours / fillPoly
+    std::vector<cv::Mat> contoursFromArrays(const emscripten::val& points, const emscripten::val& offsets)
+    {
+        std::vector<int> xy = emscripten::convertJSArrayToNumberVector<int>(points);
+        std::vector<int> bounds = emscripten::convertJSArrayToNumberVector<int>(offsets);
+        CV_Assert(xy.size() % 2 == 0 && !bounds.empty() && bounds.back() == (int)(xy.size() / 2));
+
+        std::vector<cv::Mat> contours;
+        for (size_t i = 0; i + 1 < bounds.size(); i++)
+        {
+            CV_Assert(bounds[i] <= bounds[i + 1]);
+            cv::Mat contour(bounds[i + 1] - bounds[i], 1, CV_32SC2);
+            std::copy(xy.begin() + bounds[i] * 2, xy.begin() + bounds[i + 1] * 2, contour.ptr<int>());
+            contours.push_back(contour);
+        }
+        return contours;
+    }
+}
+
+EMSCRIPTEN_BINDINGS(bulk_utils)
+{
+    emscripten::function("keyPointsToArrays", &bulk_utils::keyPointsToArrays);
+    emscripten::function("keyPointsFromArrays", &bulk_utils::keyPointsFromArrays);
+    emscripten::function("matchesToArrays", &bulk_utils::matchesToArrays);
+    emscripten::function("knnMatchesToArrays", &bulk_utils::knnMatchesToArrays);
+    emscripten::function("matchesFromArrays", &bulk_utils::matchesFromArrays);
+    emscripten::function("contoursToArrays", &bulk_utils::contoursToArrays);
+    emscripten::function("contoursFromArrays", &bulk_utils::contoursFromArrays);
+}
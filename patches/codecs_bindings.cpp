@@ -0,0 +1,80 @@
+
+// In-wasm image codecs on byte buffers.
+//
+// Appended to OpenCV's modules/js/src/core_bindings.cpp by
+// scripts/download-opencv.sh; only compiled into builds made with
+// WITH_CODECS=1 (scripts/build.sh), which turn imgcodecs and the JPEG, PNG
+// and WebP libraries back on. Encoded bytes are copied into the heap once
+// on decode and out of it once on encode; no RGBA round trip through
+// ImageData.
+
+#include "opencv2/opencv_modules.hpp"
+
+#ifdef HAVE_OPENCV_IMGCODECS
+#include "opencv2/imgcodecs.hpp"
+
+namespace codecs_utils
+{
+    std::vector<uchar> bytesFromJS(const emscripten::val& bytes)
+    {
+        return emscripten::convertJSArrayToNumberVector<uchar>(bytes);
+    }
+
+    // Uint8Array / Buffer / ArrayBuffer view -> Mat (empty Mat if undecodable)
+    cv::Mat imdecode(const emscripten::val& bytes, int flags)
+    {
+        return cv::imdecode(bytesFromJS(bytes), flags);
+    }
+
+    // Every page / frame of a multi-image file (TIFF, animated WebP, ...)
+    std::vector<cv::Mat> imdecodemulti(const emscripten::val& bytes, int flags)
+    {
+        std::vector<cv::Mat> pages;
+        cv::imdecodemulti(bytesFromJS(bytes), flags, pages);
+        return pages;
+    }
+
+    // Array of encoded buffers -> one Mat per buffer, in one call
+    std::vector<cv::Mat> imdecodeBatch(const emscripten::val& buffers, int flags)
+    {
+        const unsigned length = buffers["length"].as<unsigned>();
+        std::vector<cv::Mat> images;
+        images.reserve(length);
+        for (unsigned i = 0; i < length; i++)
+            images.push_back(cv::imdecode(bytesFromJS(buffers[i]), flags));
+        return images;
+    }
+
+    emscripten::val toUint8Array(const std::vector<uchar>& encoded)
+    {
+        emscripten::val array = emscripten::val::global("Uint8Array").new_(encoded.size());
+        if (!encoded.empty())
+            array.call<void>("set", emscripten::val(emscripten::typed_memory_view(encoded.size(), encoded.data())));
+        return array;
+    }
+
+    // ext: ".jpg", ".png", ".webp"; params: [IMWRITE_*, value, ...]
+    emscripten::val imencodeWithParams(const std::string& ext, const cv::Mat& img, const emscripten::val& params)
+    {
+        std::vector<uchar> encoded;
+        std::vector<int> values = emscripten::convertJSArrayToNumberVector<int>(params);
+        if (!cv::imencode(ext, img, encoded, values))
+            CV_Error(cv::Error::StsError, "imencode failed for " + ext);
+        return toUint8Array(encoded);
+    }
+
+    emscripten::val imencode(const std::string& ext, const cv::Mat& img)
+    {
+        return imencodeWithParams(ext, img, emscripten::val::array());
+    }
+}
+
+EMSCRIPTEN_BINDINGS(codecs_utils)
+{
+    emscripten::function("imdecode", &codecs_utils::imdecode);
+    emscripten::function("imdecodemulti", &codecs_utils::imdecodemulti);
+    emscripten::function("imdecodeBatch", &codecs_utils::imdecodeBatch);
+    emscripten::function("imencode", &codecs_utils::imencode);
+    emscripten::function("imencode", &codecs_utils::imencodeWithParams);
+}
+#endif
@@ -0,0 +1,311 @@
+// FLANN descriptor indexes.
+//
+// Appended to OpenCV's modules/js/src/core_bindings.cpp by
+// scripts/download-opencv.sh. The generated bindings only expose BFMatcher,
+// which compares every query against every train descriptor. These add
+// FlannBasedMatcher with LSH / KD-tree / k-means index parameters taken
+// from a plain object, and FlannIndex, an index built once over a
+// descriptor Mat that can be saved to a Uint8Array and loaded again in
+// another process without rebuilding.
+//
+// FLANN cannot save an index without its dataset (Index::load needs the
+// same features), so FlannIndex.save() bundles both:
+//   "OCVFLANN" | u32 version | i32 rows, cols, type, distance |
+//   u32 params length | params JSON | features | Index::save() output
+// The index file goes through MEMFS. LSH indexes store only their dataset
+// and parameters and rehash on load (which FLANN does in a fraction of the
+// build time); tree indexes are restored as saved.
+
+#include "opencv2/opencv_modules.hpp"
+
+#if defined(HAVE_OPENCV_FLANN) && defined(HAVE_OPENCV_FEATURES2D)
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include "opencv2/flann.hpp"
+#include "opencv2/features2d.hpp"
+
+namespace flann_utils
+{
+    const char MAGIC[8] = { 'O', 'C', 'V', 'F', 'L', 'A', 'N', 'N' };
+    const uint32_t VERSION = 1;
+
+    int intParam(const emscripten::val& params, const char* name, int fallback)
+    {
+        return params.hasOwnProperty(name) ? params[name].as<int>() : fallback;
+    }
+
+    float floatParam(const emscripten::val& params, const char* name, float fallback)
+    {
+        return params.hasOwnProperty(name) ? params[name].as<float>() : fallback;
+    }
+
+    // Copy of a JS params object (undefined -> {}) with the algorithm filled in
+    emscripten::val withAlgorithm(const emscripten::val& params, const char* fallback)
+    {
+        emscripten::val copy = emscripten::val::global("Object").call<emscripten::val>(
+            "assign", emscripten::val::object(), params.isUndefined() || params.isNull() ? emscripten::val::object() : params);
+        if (!copy.hasOwnProperty("algorithm"))
+            copy.set("algorithm", std::string(fallback));
+        return copy;
+    }
+
+    // { algorithm: 'lsh', tableNumber, keySize, multiProbeLevel }
+    // { algorithm: 'kdtree', trees }
+    // { algorithm: 'kmeans', branching, iterations, cbIndex }
+    // { algorithm: 'composite', trees, branching, iterations, cbIndex }
+    // { algorithm: 'autotuned', targetPrecision, buildWeight, memoryWeight, sampleFraction }
+    // { algorithm: 'linear' }
+    cv::Ptr<cv::flann::IndexParams> indexParams(const emscripten::val& params)
+    {
+        const std::string algorithm = params["algorithm"].as<std::string>();
+        if (algorithm == "lsh")
+            return cv::makePtr<cv::flann::LshIndexParams>(
+                intParam(params, "tableNumber", 12), intParam(params, "keySize", 20),
+                intParam(params, "multiProbeLevel", 2));
+        if (algorithm == "kdtree")
+            return cv::makePtr<cv::flann::KDTreeIndexParams>(intParam(params, "trees", 4));
+        if (algorithm == "kmeans")
+            return cv::makePtr<cv::flann::KMeansIndexParams>(
+                intParam(params, "branching", 32), intParam(params, "iterations", 11),
+                cvflann::FLANN_CENTERS_RANDOM, floatParam(params, "cbIndex", 0.2f));
+        if (algorithm == "composite")
+            return cv::makePtr<cv::flann::CompositeIndexParams>(
+                intParam(params, "trees", 4), intParam(params, "branching", 32),
+                intParam(params, "iterations", 11), cvflann::FLANN_CENTERS_RANDOM,
+                floatParam(params, "cbIndex", 0.2f));
+        if (algorithm == "autotuned")
+            return cv::makePtr<cv::flann::AutotunedIndexParams>(
+                floatParam(params, "targetPrecision", 0.8f), floatParam(params, "buildWeight", 0.01f),
+                floatParam(params, "memoryWeight", 0.0f), floatParam(params, "sampleFraction", 0.1f));
+        if (algorithm == "linear")
+            return cv::makePtr<cv::flann::LinearIndexParams>();
+        CV_Error(cv::Error::StsBadArg, "Unknown FLANN algorithm '" + algorithm + "'");
+    }
+
+    // { checks, eps, sorted }
+    cv::Ptr<cv::flann::SearchParams> searchParams(const emscripten::val& params)
+    {
+        if (params.isUndefined() || params.isNull())
+            return cv::makePtr<cv::flann::SearchParams>();
+        return cv::makePtr<cv::flann::SearchParams>(
+            intParam(params, "checks", 32), floatParam(params, "eps", 0.0f),
+            !params.hasOwnProperty("sorted") || params["sorted"].as<bool>());
+    }
+
+    // Binary descriptors (ORB, BRISK, BEBLID, ...) are compared by Hamming
+    // distance; float descriptors (SIFT, SURF, ...) by L2
+    cvflann::flann_distance_t distanceFor(const cv::Mat& features, const emscripten::val& params)
+    {
+        if (params.hasOwnProperty("distance"))
+        {
+            const std::string distance = params["distance"].as<std::string>();
+            if (distance == "hamming") return cvflann::FLANN_DIST_HAMMING;
+            if (distance == "l2") return cvflann::FLANN_DIST_L2;
+            if (distance == "l1") return cvflann::FLANN_DIST_L1;
+            CV_Error(cv::Error::StsBadArg, "Unknown FLANN distance '" + distance + "'");
+        }
+        return features.depth() == CV_8U ? cvflann::FLANN_DIST_HAMMING : cvflann::FLANN_DIST_L2;
+    }
+
+    // Same default as cv::FlannBasedMatcher: a 4-tree KD-tree (float descriptors)
+    cv::Ptr<cv::FlannBasedMatcher> createMatcher(const emscripten::val& params, const emscripten::val& search)
+    {
+        return cv::makePtr<cv::FlannBasedMatcher>(indexParams(withAlgorithm(params, "kdtree")), searchParams(search));
+    }
+
+    std::string tempPath()
+    {
+        static int counter = 0;
+        return "/tmp/flann_index_" + std::to_string(counter++) + ".bin";
+    }
+
+    template<typename T>
+    void put(std::vector<uchar>& out, T value)
+    {
+        const uchar* bytes = reinterpret_cast<const uchar*>(&value);
+        out.insert(out.end(), bytes, bytes + sizeof(T));
+    }
+
+    template<typename T>
+    T take(const std::vector<uchar>& in, size_t& offset)
+    {
+        CV_Assert(offset + sizeof(T) <= in.size());
+        T value;
+        std::memcpy(&value, in.data() + offset, sizeof(T));
+        offset += sizeof(T);
+        return value;
+    }
+
+    class FlannIndex
+    {
+    public:
+        // features: one descriptor per row (CV_8U for Hamming, CV_32F for L2 / L1).
+        // Binary descriptors default to LSH, float descriptors to a KD-tree.
+        FlannIndex(const cv::Mat& features, const emscripten::val& params)
+            : features_(features.clone())
+        {
+            CV_Assert(!features_.empty() && features_.channels() == 1);
+            const emscripten::val effective = withAlgorithm(params, features_.depth() == CV_8U ? "lsh" : "kdtree");
+            distance_ = distanceFor(features_, effective);
+            params_ = emscripten::val::global("JSON").call<std::string>("stringify", effective);
+            index_.build(features_, *indexParams(effective), distance_);
+        }
+
+        FlannIndex(const cv::Mat& features, cvflann::flann_distance_t distance,
+                   const std::string& params, const std::string& indexPath)
+            : features_(features), distance_(distance), params_(params)
+        {
+            if (!index_.load(features_, indexPath))
+                CV_Error(cv::Error::StsError, "Could not load the FLANN index");
+        }
+
+        // k nearest neighbours of every query row:
+        // { indices: Int32Array(n * k), distances: Float32Array(n * k) }
+        // Row i is [i * k, (i + 1) * k); missing neighbours have index -1.
+        // Distances are Hamming bit counts or Euclidean (not squared) L2.
+        // search: { checks, eps, sorted } (optional)
+        emscripten::val knnSearch(const cv::Mat& queries, int k, const emscripten::val& search)
+        {
+            CV_Assert(queries.type() == features_.type() && queries.cols == features_.cols && k > 0);
+            cv::Mat indices(queries.rows, k, CV_32S, cv::Scalar(-1));
+            cv::Mat dists;
+            index_.knnSearch(queries, indices, dists, k, *searchParams(search));
+            dists.convertTo(dists, CV_32F);
+            if (distance_ == cvflann::FLANN_DIST_L2)
+                cv::sqrt(dists, dists);
+
+            const size_t count = static_cast<size_t>(queries.rows) * k;
+            emscripten::val result = emscripten::val::object();
+            emscripten::val indexArray = emscripten::val::global("Int32Array").new_(count);
+            emscripten::val distArray = emscripten::val::global("Float32Array").new_(count);
+            if (count)
+            {
+                indexArray.call<void>("set", emscripten::val(emscripten::typed_memory_view(count, indices.ptr<int>())));
+                distArray.call<void>("set", emscripten::val(emscripten::typed_memory_view(count, dists.ptr<float>())));
+            }
+            result.set("indices", indexArray);
+            result.set("distances", distArray);
+            return result;
+        }
+
+        emscripten::val save()
+        {
+            const std::string path = tempPath();
+            index_.save(path);
+            std::ifstream file(path, std::ios::binary);
+            std::vector<uchar> saved((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+            file.close();
+            std::remove(path.c_str());
+            CV_Assert(!saved.empty());
+
+            const size_t featureBytes = features_.total() * features_.elemSize();
+            std::vector<uchar> out;
+            out.reserve(sizeof(MAGIC) + 24 + params_.size() + featureBytes + saved.size());
+            out.insert(out.end(), MAGIC, MAGIC + sizeof(MAGIC));
+            put<uint32_t>(out, VERSION);
+            put<int32_t>(out, features_.rows);
+            put<int32_t>(out, features_.cols);
+            put<int32_t>(out, features_.type());
+            put<int32_t>(out, distance_);
+            put<uint32_t>(out, static_cast<uint32_t>(params_.size()));
+            out.insert(out.end(), params_.begin(), params_.end());
+            out.insert(out.end(), features_.data, features_.data + featureBytes);
+            out.insert(out.end(), saved.begin(), saved.end());
+
+            emscripten::val array = emscripten::val::global("Uint8Array").new_(out.size());
+            array.call<void>("set", emscripten::val(emscripten::typed_memory_view(out.size(), out.data())));
+            return array;
+        }
+
+        static FlannIndex* load(const emscripten::val& bytes)
+        {
+            const std::vector<uchar> in = emscripten::convertJSArrayToNumberVector<uchar>(bytes);
+            if (in.size() < sizeof(MAGIC) || std::memcmp(in.data(), MAGIC, sizeof(MAGIC)) != 0)
+                CV_Error(cv::Error::StsBadArg, "Not a saved FlannIndex");
+            size_t offset = sizeof(MAGIC);
+            if (take<uint32_t>(in, offset) != VERSION)
+                CV_Error(cv::Error::StsBadArg, "Unsupported FlannIndex version");
+            const int rows = take<int32_t>(in, offset);
+            const int cols = take<int32_t>(in, offset);
+            const int type = take<int32_t>(in, offset);
+            const auto distance = static_cast<cvflann::flann_distance_t>(take<int32_t>(in, offset));
+            const uint32_t paramsLength = take<uint32_t>(in, offset);
+            CV_Assert(offset + paramsLength <= in.size());
+            const std::string params(in.begin() + offset, in.begin() + offset + paramsLength);
+            offset += paramsLength;
+
+            cv::Mat features(rows, cols, type);
+            const size_t featureBytes = features.total() * features.elemSize();
+            CV_Assert(offset + featureBytes < in.size());
+            std::memcpy(features.data, in.data() + offset, featureBytes);
+            offset += featureBytes;
+
+            const std::string path = tempPath();
+            {
+                std::ofstream file(path, std::ios::binary);
+                file.write(reinterpret_cast<const char*>(in.data() + offset), in.size() - offset);
+            }
+            try
+            {
+                FlannIndex* index = new FlannIndex(features, distance, params, path);
+                std::remove(path.c_str());
+                return index;
+            }
+            catch (...)
+            {
+                std::remove(path.c_str());
+                throw;
+            }
+        }
+
+        int size() const { return features_.rows; }
+        int descriptorSize() const { return features_.cols; }
+        int descriptorType() const { return features_.type(); }
+        // The parameters the index was built with, as passed to the constructor
+        emscripten::val params() const
+        {
+            return emscripten::val::global("JSON").call<emscripten::val>("parse", params_);
+        }
+
+    private:
+        cv::Mat features_;
+        cvflann::flann_distance_t distance_;
+        std::string params_;
+        cv::flann::Index index_;
+    };
+}
+
+EMSCRIPTEN_BINDINGS(flann_utils)
+{
+    using emscripten::val;
+    using emscripten::optional_override;
+    using flann_utils::FlannIndex;
+
+    // train() / match() / knnMatch() come from the DescriptorMatcher base
+    emscripten::class_<cv::FlannBasedMatcher, emscripten::base<cv::DescriptorMatcher>>("FlannBasedMatcher")
+        .smart_ptr_constructor("Ptr<FlannBasedMatcher>", optional_override([]() {
+            return flann_utils::createMatcher(val::undefined(), val::undefined());
+        }))
+        .constructor(optional_override([](const val& params) {
+            return flann_utils::createMatcher(params, val::undefined());
+        }))
+        .constructor(&flann_utils::createMatcher);
+
+    emscripten::class_<FlannIndex>("FlannIndex")
+        .constructor(optional_override([](const cv::Mat& features) {
+            return new FlannIndex(features, val::undefined());
+        }), emscripten::allow_raw_pointers())
+        .constructor<const cv::Mat&, const val&>()
+        .function("knnSearch", optional_override([](FlannIndex& self, const cv::Mat& queries, int k) {
+            return self.knnSearch(queries, k, val::undefined());
+        }))
+        .function("knnSearch", &FlannIndex::knnSearch)
+        .function("save", &FlannIndex::save)
+        .function("size", &FlannIndex::size)
+        .function("descriptorSize", &FlannIndex::descriptorSize)
+        .function("descriptorType", &FlannIndex::descriptorType)
+        .function("params", &FlannIndex::params)
+        .class_function("load", &FlannIndex::load, emscripten::allow_raw_pointers());
+}
+#endif
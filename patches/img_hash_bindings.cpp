@@ -0,0 +1,51 @@
+// Batch image hashing.
+//
+// Appended to OpenCV's modules/js/src/core_bindings.cpp by
+// scripts/download-opencv.sh. ImgHashBase.compute() hashes one Mat per call
+// and returns the hash as a Mat; computeHashes() hashes a whole MatVector
+// and packs the hashes row after row into one Uint8Array, ready for the
+// Hamming index in src/imghash.js (which also provides the same function in
+// plain JS for builds without it).
+
+#include "opencv2/opencv_modules.hpp"
+
+#ifdef HAVE_OPENCV_IMG_HASH
+#include "opencv2/img_hash.hpp"
+
+namespace img_hash_utils
+{
+    // { hashes: Uint8Array(count * hashBytes), hashBytes, count }
+    emscripten::val computeHashes(cv::img_hash::ImgHashBase& algorithm, const std::vector<cv::Mat>& images)
+    {
+        std::vector<uchar> packed;
+        size_t hashBytes = 0;
+        cv::Mat hash;
+        for (size_t i = 0; i < images.size(); i++)
+        {
+            algorithm.compute(images[i], hash);
+            const size_t bytes = hash.total() * hash.elemSize();
+            if (i == 0)
+            {
+                hashBytes = bytes;
+                packed.reserve(images.size() * hashBytes);
+            }
+            CV_Assert(bytes == hashBytes && hash.isContinuous());
+            packed.insert(packed.end(), hash.data, hash.data + bytes);
+        }
+
+        emscripten::val result = emscripten::val::object();
+        emscripten::val array = emscripten::val::global("Uint8Array").new_(packed.size());
+        if (!packed.empty())
+            array.call<void>("set", emscripten::val(emscripten::typed_memory_view(packed.size(), packed.data())));
+        result.set("hashes", array);
+        result.set("hashBytes", static_cast<int>(hashBytes));
+        result.set("count", static_cast<int>(images.size()));
+        return result;
+    }
+}
+
+EMSCRIPTEN_BINDINGS(img_hash_utils)
+{
+    emscripten::function("computeHashes", &img_hash_utils::computeHashes);
+}
+#endif
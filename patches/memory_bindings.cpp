@@ -0,0 +1,92 @@
+// Heap statistics.
+//
+// Appended to OpenCV's modules/js/src/core_bindings.cpp by
+// scripts/download-opencv.sh. mallocStats() reports the allocator's view of
+// the wasm heap (mallinfo) plus live Mat buffers, counted by a MatAllocator
+// that wraps OpenCV's default one. src/memory.js combines it with the heap
+// size into cv.memoryStats().
+
+#include <atomic>
+#include <malloc.h>
+#include <emscripten/heap.h>
+
+namespace memory_utils
+{
+    // Counts Mat data buffers (not Mat headers over user memory or ROIs)
+    class CountingAllocator : public cv::MatAllocator
+    {
+    public:
+        explicit CountingAllocator(const cv::MatAllocator* base) : base_(base) {}
+
+        cv::UMatData* allocate(int dims, const int* sizes, int type, void* data, size_t* step,
+                               cv::AccessFlag flags, cv::UMatUsageFlags usageFlags) const CV_OVERRIDE
+        {
+            cv::UMatData* u = base_->allocate(dims, sizes, type, data, step, flags, usageFlags);
+            if (u && !data)
+            {
+                // Route deallocate() back through this allocator
+                u->currAllocator = this;
+                live_++;
+                const size_t bytes = (bytes_ += u->size);
+                size_t peak = peak_.load();
+                while (bytes > peak && !peak_.compare_exchange_weak(peak, bytes)) {}
+            }
+            return u;
+        }
+
+        bool allocate(cv::UMatData* data, cv::AccessFlag accessflags, cv::UMatUsageFlags usageFlags) const CV_OVERRIDE
+        {
+            return base_->allocate(data, accessflags, usageFlags);
+        }
+
+        void deallocate(cv::UMatData* u) const CV_OVERRIDE
+        {
+            if (u && u->refcount == 0 && u->currAllocator == this)
+            {
+                live_--;
+                bytes_ -= u->size;
+            }
+            base_->deallocate(u);
+        }
+
+        size_t live() const { return live_.load(); }
+        size_t bytes() const { return bytes_.load(); }
+        size_t peak() const { return peak_.load(); }
+
+    private:
+        const cv::MatAllocator* base_;
+        mutable std::atomic<size_t> live_{0};
+        mutable std::atomic<size_t> bytes_{0};
+        mutable std::atomic<size_t> peak_{0};
+    };
+
+    CountingAllocator& matAllocator()
+    {
+        static CountingAllocator allocator(cv::Mat::getStdAllocator());
+        return allocator;
+    }
+
+    // { heapSize, heapMax, arena, inUse, free, liveMats, matBytes, peakMatBytes }
+    emscripten::val mallocStats()
+    {
+        const struct mallinfo info = mallinfo();
+        const CountingAllocator& mats = matAllocator();
+        emscripten::val result = emscripten::val::object();
+        result.set("heapSize", static_cast<double>(emscripten_get_heap_size()));
+        result.set("heapMax", static_cast<double>(emscripten_get_heap_max()));
+        // Bytes malloc has taken from the heap, in use by live allocations, and free inside it
+        result.set("arena", static_cast<double>(info.arena));
+        result.set("inUse", static_cast<double>(info.uordblks));
+        result.set("free", static_cast<double>(info.fordblks));
+        result.set("liveMats", static_cast<double>(mats.live()));
+        result.set("matBytes", static_cast<double>(mats.bytes()));
+        result.set("peakMatBytes", static_cast<double>(mats.peak()));
+        return result;
+    }
+}
+
+EMSCRIPTEN_BINDINGS(memory_utils)
+{
+    cv::Mat::setDefaultAllocator(&memory_utils::matAllocator());
+    emscripten::function("mallocStats", &memory_utils::mallocStats);
+}
@@ -0,0 +1,122 @@
+// Trained model persistence and batched prediction for the ml module.
+//
+// Appended to OpenCV's modules/js/src/core_bindings.cpp by
+// scripts/download-opencv.sh. The StatModel bindings have no save/load, and
+// Algorithm::save() / load() go through files. statModelToBuffer() writes a
+// trained model with FileStorage in memory (YAML, JSON or XML) and
+// statModelFromBuffer() reads one back as its concrete class (SVM, RTrees,
+// ANN_MLP, ...), picked from the model's top-level node name.
+// predictBatch() splits a sample matrix into row blocks predicted in
+// parallel_for_ and returns the responses as one Float32Array.
+// src/ml.js wraps these as cv.saveStatModel(), cv.loadStatModel() and
+// cv.predictBatch().
+
+#include "opencv2/opencv_modules.hpp"
+
+#ifdef HAVE_OPENCV_ML
+#include "opencv2/ml.hpp"
+
+namespace ml_utils
+{
+    template<typename T>
+    emscripten::val readModel(const cv::FileNode& node)
+    {
+        cv::Ptr<T> model = T::create();
+        model->read(node);
+        CV_Assert(model->isTrained());
+        return emscripten::val(model);
+    }
+
+    // format: 'yml', 'json' or 'xml'
+    emscripten::val statModelToBuffer(const cv::Ptr<cv::ml::StatModel>& model, const std::string& format)
+    {
+        CV_Assert(model && model->isTrained());
+        CV_Assert(format == "yml" || format == "yaml" || format == "json" || format == "xml");
+        cv::FileStorage fs("." + format, cv::FileStorage::WRITE | cv::FileStorage::MEMORY);
+        // Same layout as Algorithm::save(), so files saved natively load too
+        fs << model->getDefaultName() << "{";
+        model->write(fs);
+        fs << "}";
+        const std::string text = fs.releaseAndGetString();
+
+        emscripten::val array = emscripten::val::global("Uint8Array").new_(text.size());
+        array.call<void>("set", emscripten::val(emscripten::typed_memory_view(text.size(), reinterpret_cast<const uchar*>(text.data()))));
+        return array;
+    }
+
+    emscripten::val statModelFromBuffer(const emscripten::val& bytes)
+    {
+        const std::vector<uchar> data = emscripten::convertJSArrayToNumberVector<uchar>(bytes);
+        const std::string text(data.begin(), data.end());
+        cv::FileStorage fs(text, cv::FileStorage::READ | cv::FileStorage::MEMORY);
+        const cv::FileNode node = fs.getFirstTopLevelNode();
+        const std::string name = node.name();
+
+        if (name == "opencv_ml_svm") return readModel<cv::ml::SVM>(node);
+        if (name == "opencv_ml_rtrees") return readModel<cv::ml::RTrees>(node);
+        if (name == "opencv_ml_dtree") return readModel<cv::ml::DTrees>(node);
+        if (name == "opencv_ml_boost") return readModel<cv::ml::Boost>(node);
+        if (name == "opencv_ml_ann_mlp") return readModel<cv::ml::ANN_MLP>(node);
+        if (name == "opencv_ml_knn") return readModel<cv::ml::KNearest>(node);
+        if (name == "opencv_ml_lr") return readModel<cv::ml::LogisticRegression>(node);
+        if (name == "opencv_ml_nbayes") return readModel<cv::ml::NormalBayesClassifier>(node);
+        if (name == "opencv_ml_em") return readModel<cv::ml::EM>(node);
+        CV_Error(cv::Error::StsBadArg, "statModelFromBuffer: unknown model type '" + name + "'");
+    }
+
+    // { responses: Float32Array(rows * cols), rows, cols }
+    emscripten::val predictBatch(const cv::Ptr<cv::ml::StatModel>& model, const cv::Mat& samples, int flags, bool parallel)
+    {
+        CV_Assert(model && model->isTrained());
+        cv::Mat input = samples;
+        if (input.type() != CV_32F)
+            samples.convertTo(input, CV_32F);
+        const int rows = input.rows;
+
+        // Row blocks rather than rows: predict() has a per-call setup cost
+        const int blocks = parallel ? std::max(1, std::min(rows, cv::getNumThreads() * 4)) : 1;
+        std::vector<cv::Mat> parts(blocks);
+        auto predictBlocks = [&](const cv::Range& range) {
+            for (int b = range.start; b < range.end; b++)
+            {
+                const int begin = static_cast<int>(static_cast<int64>(rows) * b / blocks);
+                const int end = static_cast<int>(static_cast<int64>(rows) * (b + 1) / blocks);
+                if (begin < end)
+                    model->predict(input.rowRange(begin, end), parts[b], flags);
+            }
+        };
+        if (blocks > 1)
+            cv::parallel_for_(cv::Range(0, blocks), predictBlocks);
+        else
+            predictBlocks(cv::Range(0, blocks));
+
+        std::vector<cv::Mat> filled;
+        for (cv::Mat& part : parts)
+        {
+            if (part.empty()) continue;
+            if (part.type() != CV_32F) part.convertTo(part, CV_32F);
+            filled.push_back(part);
+        }
+        cv::Mat results;
+        if (!filled.empty())
+            cv::vconcat(filled, results);
+
+        const size_t count = results.total();
+        emscripten::val array = emscripten::val::global("Float32Array").new_(count);
+        if (count)
+            array.call<void>("set", emscripten::val(emscripten::typed_memory_view(count, results.ptr<float>())));
+        emscripten::val out = emscripten::val::object();
+        out.set("responses", array);
+        out.set("rows", results.rows);
+        out.set("cols", results.cols);
+        return out;
+    }
+}
+
+EMSCRIPTEN_BINDINGS(ml_utils)
+{
+    emscripten::function("statModelToBuffer", &ml_utils::statModelToBuffer);
+    emscripten::function("statModelFromBuffer", &ml_utils::statModelFromBuffer);
+    emscripten::function("predictBatch", &ml_utils::predictBatch);
+}
+#endif
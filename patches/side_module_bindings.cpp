@@ -0,0 +1,30 @@
+// Bindings template for split-build side modules.
+//
+// Used by scripts/build-side-modules.sh in place of OpenCV's
+// modules/js/src/core_bindings.cpp. The main module already registers Mat,
+// the vector types and the binding_utils helpers, so this template only
+// provides the includes and namespaces the generated wrappers expect.
+// embindgen substitutes @INCLUDES@ and appends the generated bindings.
+
+#include <emscripten/bind.h>
+
+#include "opencv2/opencv_modules.hpp"
+#include "opencv2/core.hpp"
+#include "opencv2/imgproc.hpp"
+
+@INCLUDES@
+
+using namespace emscripten;
+using namespace cv;
+
+#ifdef HAVE_OPENCV_DNN
+using namespace cv::dnn;
+#endif
+
+#ifdef HAVE_OPENCV_ARUCO
+using namespace aruco;
+#endif
+
+#ifdef HAVE_OPENCV_VIDEO
+typedef TrackerMIL::Params TrackerMIL_Params;
+#endif
@@ -0,0 +1,12 @@
+// Emscripten --pre-js for threaded builds (added by scripts/build.sh)
+//
+// The build links with -sPTHREAD_POOL_SIZE=opencvPthreadPoolSize, so the
+// number of pthread workers started with the module is read from the
+// Module object at load time instead of being fixed at build time.
+// Module.pthreadPoolSize is set by src/runtime.js (Node) and loadOpenCV()
+// (dist/loader.js); the default matches build_js.py's PTHREAD_POOL_SIZE=4.
+var opencvPthreadPoolSize = Module['pthreadPoolSize'] > 0 ? Module['pthreadPoolSize'] : 4;
+Module['pthreadPoolSize'] = opencvPthreadPoolSize;
+// Loaders put pthreadPoolSize on the Module object for every build, so it
+// does not show whether the build has threads; this marker does
+Module['pthreadsEnabled'] = true;
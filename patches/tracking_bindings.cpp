@@ -0,0 +1,197 @@
+// Multi-object tracking.
+//
+// Appended to OpenCV's modules/js/src/core_bindings.cpp by
+// scripts/download-opencv.sh. MultiTracker holds any number of cv::Tracker
+// objects (KCF, CSRT, MIL, DaSiamRPN, Nano, Vit, ...) and updates them all
+// with one call per frame: the frame crosses into C++ once, the colour
+// conversion and downscale every target would otherwise repeat happen once,
+// and the per-target updates run on the pthread pool (parallel_for_). All
+// boxes, scores and states come back as typed arrays. src/tracking.js
+// provides the same class in plain JS for builds without it.
+
+#include "opencv2/opencv_modules.hpp"
+
+#ifdef HAVE_OPENCV_VIDEO
+#include "opencv2/video/tracking.hpp"
+
+namespace tracking_utils
+{
+    class MultiTracker
+    {
+    public:
+        // options: { scale: 1, colorConversion: -1, parallel: true }
+        explicit MultiTracker(const emscripten::val& options)
+        {
+            if (options.isUndefined() || options.isNull())
+                return;
+            if (options.hasOwnProperty("scale"))
+                scale_ = options["scale"].as<double>();
+            if (options.hasOwnProperty("colorConversion"))
+                colorConversion_ = options["colorConversion"].as<int>();
+            if (options.hasOwnProperty("parallel"))
+                parallel_ = options["parallel"].as<bool>();
+            CV_Assert(scale_ > 0 && scale_ <= 1);
+        }
+
+        // Start tracking rect (frame coordinates) in frame; returns the target id
+        int add(const cv::Ptr<cv::Tracker>& tracker, const cv::Mat& frame, const cv::Rect& rect)
+        {
+            CV_Assert(tracker);
+            tracker->init(prepare(frame), toWork(rect));
+            targets_.push_back({ nextId_, tracker, rect, true, 1.0f });
+            return nextId_++;
+        }
+
+        bool remove(int id)
+        {
+            for (size_t i = 0; i < targets_.size(); i++)
+            {
+                if (targets_[i].id == id)
+                {
+                    targets_.erase(targets_.begin() + i);
+                    return true;
+                }
+            }
+            return false;
+        }
+
+        void clear() { targets_.clear(); }
+        int size() const { return static_cast<int>(targets_.size()); }
+
+        // { ids: Int32Array(n), boxes: Float32Array(4n) as x, y, width, height,
+        //   scores: Float32Array(n), found: Uint8Array(n) }
+        // Lost targets keep their last box with found = 0.
+        emscripten::val update(const cv::Mat& frame)
+        {
+            const cv::Mat work = prepare(frame);
+            auto updateRange = [&](const cv::Range& range) {
+                for (int i = range.start; i < range.end; i++)
+                {
+                    Target& target = targets_[i];
+                    cv::Rect box;
+                    target.found = target.tracker->update(work, box);
+                    if (target.found)
+                        target.box = toFrame(box);
+                    target.score = scoreOf(*target.tracker, target.found);
+                }
+            };
+            const cv::Range all(0, size());
+            if (parallel_ && size() > 1)
+                cv::parallel_for_(all, updateRange);
+            else
+                updateRange(all);
+            return result();
+        }
+
+        // Current state without updating
+        emscripten::val result() const
+        {
+            const size_t n = targets_.size();
+            std::vector<int> ids(n);
+            std::vector<float> boxes(n * 4), scores(n);
+            std::vector<uchar> found(n);
+            for (size_t i = 0; i < n; i++)
+            {
+                const Target& target = targets_[i];
+                ids[i] = target.id;
+                boxes[i * 4] = target.box.x;
+                boxes[i * 4 + 1] = target.box.y;
+                boxes[i * 4 + 2] = target.box.width;
+                boxes[i * 4 + 3] = target.box.height;
+                scores[i] = target.score;
+                found[i] = target.found ? 1 : 0;
+            }
+            emscripten::val out = emscripten::val::object();
+            out.set("ids", typedArray("Int32Array", ids));
+            out.set("boxes", typedArray("Float32Array", boxes));
+            out.set("scores", typedArray("Float32Array", scores));
+            out.set("found", typedArray("Uint8Array", found));
+            return out;
+        }
+
+    private:
+        struct Target
+        {
+            int id;
+            cv::Ptr<cv::Tracker> tracker;
+            cv::Rect2f box;
+            bool found;
+            float score;
+        };
+
+        template<typename T>
+        static emscripten::val typedArray(const char* arrayType, const std::vector<T>& values)
+        {
+            emscripten::val array = emscripten::val::global(arrayType).new_(values.size());
+            if (!values.empty())
+                array.call<void>("set", emscripten::val(emscripten::typed_memory_view(values.size(), values.data())));
+            return array;
+        }
+
+        // Trackers with a confidence report it; the others score 1 when found
+        static float scoreOf(cv::Tracker& tracker, bool found)
+        {
+#ifdef HAVE_OPENCV_DNN
+            if (auto* t = dynamic_cast<cv::TrackerDaSiamRPN*>(&tracker)) return t->getTrackingScore();
+            if (auto* t = dynamic_cast<cv::TrackerNano*>(&tracker)) return t->getTrackingScore();
+            if (auto* t = dynamic_cast<cv::TrackerVit*>(&tracker)) return t->getTrackingScore();
+#endif
+            return found ? 1.0f : 0.0f;
+        }
+
+        // The one conversion and downscale every target shares
+        cv::Mat prepare(const cv::Mat& frame)
+        {
+            cv::Mat work = frame;
+            if (colorConversion_ >= 0)
+            {
+                cv::cvtColor(work, converted_, colorConversion_);
+                work = converted_;
+            }
+            if (scale_ != 1)
+            {
+                cv::resize(work, scaled_, cv::Size(), scale_, scale_, cv::INTER_AREA);
+                work = scaled_;
+            }
+            return work;
+        }
+
+        cv::Rect toWork(const cv::Rect& rect) const
+        {
+            if (scale_ == 1) return rect;
+            return cv::Rect(cvRound(rect.x * scale_), cvRound(rect.y * scale_),
+                            std::max(1, cvRound(rect.width * scale_)), std::max(1, cvRound(rect.height * scale_)));
+        }
+
+        cv::Rect2f toFrame(const cv::Rect& rect) const
+        {
+            const float s = static_cast<float>(1 / scale_);
+            return cv::Rect2f(rect.x * s, rect.y * s, rect.width * s, rect.height * s);
+        }
+
+        std::vector<Target> targets_;
+        cv::Mat converted_, scaled_;
+        double scale_ = 1;
+        int colorConversion_ = -1;
+        bool parallel_ = true;
+        int nextId_ = 0;
+    };
+}
+
+EMSCRIPTEN_BINDINGS(tracking_utils)
+{
+    using tracking_utils::MultiTracker;
+
+    emscripten::class_<MultiTracker>("MultiTracker")
+        .constructor(emscripten::optional_override([]() {
+            return new MultiTracker(emscripten::val::undefined());
+        }), emscripten::allow_raw_pointers())
+        .constructor<const emscripten::val&>()
+        .function("add", &MultiTracker::add)
+        .function("remove", &MultiTracker::remove)
+        .function("clear", &MultiTracker::clear)
+        .function("size", &MultiTracker::size)
+        .function("update", &MultiTracker::update)
+        .function("result", &MultiTracker::result);
+}
+#endif
@@ -0,0 +1,116 @@
+#!/bin/bash
+set -e
+
+# Builds the lazily loaded side modules for BUILD_TYPE=split.
+#
+# Called by scripts/build.sh inside the Emscripten container after the main
+# module has been linked. For every group in patches/side_modules.json this:
+#   1. writes the group's whitelist with scripts/generate-whitelist.py --only
+#   2. generates embind bindings for just that whitelist
+#   3. links the bindings and the group's static libraries as a SIDE_MODULE
+# and finally writes ${OUTPUT_DIR}/modules.json for src/side-modules.js.
+
+MANIFEST="patches/side_modules.json"
+SPLIT_DIR="${SPLIT_DIR:-build_split}"
+OUTPUT_DIR="${OUTPUT_DIR:-dist/split}"
+LIBS_DIR="${SPLIT_DIR}/libs"
+
+manifest() {
+    python3 -c "import json; d = json.load(open('${MANIFEST}')); $1"
+}
+
+GROUP_NAMES="$(manifest "print(' '.join(d['groups']))")"
+ALL_LIBS="$(manifest "print(','.join(sorted({l for g in d['groups'].values() for l in g['libs']})))")"
+
+echo ""
+echo "=== Building side module libraries ==="
+echo "Libraries: ${ALL_LIBS}"
+
+# Second tree with every side module library, position independent so it can
+# be linked into SIDE_MODULEs. Core symbols resolve against the main module.
+python3 ./opencv/platforms/js/build_js.py ${LIBS_DIR} \
+    --build_wasm --simd --threads --config_only \
+    --build_flags="-fPIC" \
+    --cmake_option="-DCMAKE_CXX_STANDARD=17" \
+    --cmake_option="-DBUILD_DOCS=OFF" \
+    --cmake_option="-DBUILD_EXAMPLES=OFF" \
+    --cmake_option="-DBUILD_TESTS=OFF" \
+    --cmake_option="-DBUILD_PERF_TESTS=OFF" \
+    --cmake_option="-DBUILD_LIST=${ALL_LIBS},js" \
+    --cmake_option="-DCMAKE_POSITION_INDEPENDENT_CODE=ON" \
+    --cmake_option="-DOPENCV_ENABLE_NONFREE=ON" \
+    --cmake_option="-DOPENCV_EXTRA_MODULES_PATH=$(pwd)/opencv_contrib/modules"
+
+for LIB in ${ALL_LIBS//,/ }; do
+    cmake --build ${LIBS_DIR} --target opencv_${LIB} --parallel
+done
+
+# Header list and parser settings written by the bindings generator's cmake step
+GEN_CONFIG="$(grep -rl core_bindings_file_path ${LIBS_DIR}/modules --include='*.json' | head -1)"
+if [ -z "${GEN_CONFIG}" ]; then
+    echo "Error: bindings generator config not found under ${LIBS_DIR}/modules"
+    exit 1
+fi
+
+# Include paths: build tree (cvconfig.h, opencv_modules.hpp) and module headers
+INCLUDES="-I${LIBS_DIR}"
+for DIR in opencv/modules/*/include opencv_contrib/modules/*/include; do
+    INCLUDES="${INCLUDES} -I${DIR}"
+done
+
+mkdir -p ${OUTPUT_DIR}
+
+for GROUP in ${GROUP_NAMES}; do
+    GROUP_DIR="${SPLIT_DIR}/${GROUP}"
+    MODULES="$(manifest "print(','.join(d['groups']['${GROUP}']['modules']))")"
+    LIBS="$(manifest "print(' '.join('${LIBS_DIR}/lib/libopencv_%s.a' % l for l in d['groups']['${GROUP}']['libs']))")"
+    THIRDPARTY="$(manifest "print(' '.join('${LIBS_DIR}/3rdparty/lib/%s.a' % l for l in d['groups']['${GROUP}']['thirdparty']))")"
+
+    echo ""
+    echo "=== Side module: ${GROUP} (${MODULES}) ==="
+
+    python3 scripts/generate-whitelist.py --only "${MODULES}" --out "${GROUP_DIR}"
+
+    # Same headers, but a template without the core bindings the main module
+    # already registers
+    python3 -c "
+import json
+config = json.load(open('${GEN_CONFIG}'))
+config['core_bindings_file_path'] = '$(pwd)/patches/side_module_bindings.cpp'
+json.dump(config, open('${GROUP_DIR}/gen_config.json', 'w'))
+"
+
+    python3 opencv/modules/js/generator/embindgen.py \
+        --parser opencv/modules/python/src2/hdr_parser.py \
+        --output_file "${GROUP_DIR}/bindings.cpp" \
+        --config "${GROUP_DIR}/gen_config.json" \
+        --whitelist "${GROUP_DIR}/opencv_js.config.py"
+
+    # Whole archives: later groups may link against any symbol of this one
+    em++ -std=c++17 -O3 -fPIC -pthread -msimd128 \
+        -sSIDE_MODULE=1 \
+        ${INCLUDES} \
+        "${GROUP_DIR}/bindings.cpp" \
+        -Wl,--whole-archive ${LIBS} -Wl,--no-whole-archive ${THIRDPARTY} \
+        -o "${OUTPUT_DIR}/opencv_${GROUP}.wasm"
+done
+
+# Manifest read by src/side-modules.js
+python3 -c "
+import json, os
+d = json.load(open('${MANIFEST}'))
+out = {'main': d['main'], 'groups': {}}
+for name, group in d['groups'].items():
+    file = 'opencv_%s.wasm' % name
+    out['groups'][name] = {
+        'file': file,
+        'size': os.path.getsize(os.path.join('${OUTPUT_DIR}', file)),
+        'modules': group['modules'],
+        'depends': group['depends'],
+    }
+json.dump(out, open('${OUTPUT_DIR}/modules.json', 'w'), indent=2)
+"
+
+echo ""
+echo "=== Side modules complete ==="
+ls -la ${OUTPUT_DIR}/opencv_*.wasm
@@ -3,7 +3,18 @@ set -e
 
 # Configuration
 OPENCV_VERSION="4.13.0"
-BUILD_TYPE="${BUILD_TYPE:-full}"  # essential | full
+BUILD_TYPE="${BUILD_TYPE:-full}"  # essential | full | custom | split
+CUSTOM_DIR="${CUSTOM_DIR:-custom}"  # output of scripts/generate-whitelist.py
+SPLIT_DIR="${SPLIT_DIR:-build_split}"  # per-group configs and libraries for split builds
+WITH_CODECS="${WITH_CODECS:-0}"  # 1: imgcodecs with JPEG/PNG/WebP (cv.imdecode / cv.imencode)
+INITIAL_MEMORY="${INITIAL_MEMORY:-}"  # e.g. 256MB; heap size at startup (Emscripten default: 16MB)
+MAXIMUM_MEMORY="${MAXIMUM_MEMORY:-}"  # e.g. 4GB; growth limit (Emscripten default: 2GB)
+MEMORY64="${MEMORY64:-0}"  # 1: 64-bit wasm memory for heaps beyond 4GB (output: dist/<type>-memory64)
+THREADS="${THREADS:-0}"  # 1: pthreads in the essential build (output: dist/essential-threads)
+RELAXED_SIMD="${RELAXED_SIMD:-0}"  # 1: relaxed SIMD instructions (output: dist/<type>-relaxed-simd)
+CONFIG_FILE=""
+EXTRA_BUILD_FLAGS=""
+RUNTIME_METHODS="FS,HEAPU8"  # Emscripten runtime functions exported on cv (HEAPU8: heap size in src/memory.js)
 
 echo "=== OpenCV.js Build System ==="
 echo "Build type: ${BUILD_TYPE}"
@@ -25,7 +36,13 @@ case "$BUILD_TYPE" in
             "-DBUILD_opencv_photo=OFF"
             "-DBUILD_opencv_objdetect=OFF"
         )
-        echo "Features: SIMD enabled, DNN/video/ml disabled"
+        if [ "${THREADS}" = "1" ]; then
+            BUILD_FLAGS="${BUILD_FLAGS} --threads"
+            OUTPUT_DIR="${OUTPUT_DIR}-threads"
+            echo "Features: SIMD + Threading, DNN/video/ml disabled"
+        else
+            echo "Features: SIMD enabled, DNN/video/ml disabled"
+        fi
         echo "Target size: ~2-4MB WASM"
         ;;
     full)
@@ -102,21 +119,138 @@ case "$BUILD_TYPE" in
         echo "Modules: xfeatures2d, ximgproc, xphoto, tracking, optflow, face, bgsegm, saliency, etc."
         echo "Target size: ~15-25MB WASM"
         ;;
+    custom)
+        # Minimal build from a usage trace (see src/trace.js)
+        if [ ! -f "${CUSTOM_DIR}/opencv_js.config.py" ] || [ ! -f "${CUSTOM_DIR}/modules.txt" ]; then
+            echo "Error: ${CUSTOM_DIR}/opencv_js.config.py or ${CUSTOM_DIR}/modules.txt not found."
+            echo "Run 'python3 scripts/generate-whitelist.py <trace.json>' first."
+            exit 1
+        fi
+        BUILD_DIR="build"
+        OUTPUT_DIR="dist/custom"
+        BUILD_FLAGS="--build_wasm --simd --threads"
+        CONFIG_FILE="$(pwd)/${CUSTOM_DIR}/opencv_js.config.py"
+        # BUILD_LIST builds only the listed modules plus their dependencies
+        CUSTOM_MODULES="$(grep -v '^[[:space:]]*$' "${CUSTOM_DIR}/modules.txt" | tr '\n' ',')js"
+        CMAKE_OPTS=(
+            "-DBUILD_LIST=${CUSTOM_MODULES}"
+            "-DOPENCV_ENABLE_NONFREE=ON"
+            "-DOPENCV_EXTRA_MODULES_PATH=$(pwd)/opencv_contrib/modules"
+        )
+        echo "Features: SIMD + Threading, traced bindings only"
+        echo "Modules: ${CUSTOM_MODULES}"
+        ;;
+    split)
+        # Main module with core groups; the rest become side modules
+        # loaded on demand (see patches/side_modules.json)
+        BUILD_DIR="build"
+        OUTPUT_DIR="dist/split"
+        BUILD_FLAGS="--build_wasm --simd --threads"
+        CONFIG_FILE="$(pwd)/${SPLIT_DIR}/main/opencv_js.config.py"
+        MAIN_MODULES="$(python3 -c "import json; print(','.join(json.load(open('patches/side_modules.json'))['main']))")"
+        EXTRA_BUILD_FLAGS="-fPIC -sMAIN_MODULE=1"
+        RUNTIME_METHODS="${RUNTIME_METHODS},loadDynamicLibrary"
+        CMAKE_OPTS=(
+            "-DBUILD_LIST=${MAIN_MODULES},js"
+            "-DCMAKE_POSITION_INDEPENDENT_CODE=ON"
+        )
+        echo "Features: SIMD + Threading, dynamically linked side modules"
+        echo "Main module: ${MAIN_MODULES}"
+        ;;
     *)
         echo "Error: Unknown BUILD_TYPE '${BUILD_TYPE}'"
-        echo "Valid options: essential, full"
+        echo "Valid options: essential, full, custom, split"
         exit 1
         ;;
 esac
 
+# Threaded builds read the pthread pool size from Module.pthreadPoolSize at
+# load time (patches/threads_pre.js) instead of build_js.py's fixed 4
+if [[ " ${BUILD_FLAGS} " == *" --threads "* ]]; then
+    EXTRA_BUILD_FLAGS="${EXTRA_BUILD_FLAGS:+${EXTRA_BUILD_FLAGS} }-sPTHREAD_POOL_SIZE=opencvPthreadPoolSize --pre-js $(pwd)/patches/threads_pre.js"
+fi
+
+# NODEFS lets the Node entry points mount host directories (cv.mountHost,
+# cv.hostFile in src/models.js) so loaders read model files in place; it
+# stays unused in browsers. cv.FS exposes FS.mount and FS.filesystems.
+EXTRA_BUILD_FLAGS="${EXTRA_BUILD_FLAGS:+${EXTRA_BUILD_FLAGS} }-lnodefs.js -sEXPORTED_RUNTIME_METHODS=${RUNTIME_METHODS}"
+
+# Relaxed SIMD (FMA, relaxed lane selects and truncations) lets the
+# compiler pick the host's fastest form of these operations. Runs in
+# engines with relaxed SIMD (Chrome 114+, Node 22+); the entry points
+# only select these builds where it validates (src/select.js)
+if [ "${RELAXED_SIMD}" = "1" ]; then
+    EXTRA_BUILD_FLAGS="${EXTRA_BUILD_FLAGS} -mrelaxed-simd"
+    BUILD_DIR="${BUILD_DIR}_relaxed_simd"
+    OUTPUT_DIR="${OUTPUT_DIR}-relaxed-simd"
+    echo "SIMD: relaxed SIMD enabled"
+fi
+
+# Heap sizing. A larger initial heap avoids grow-and-copy stalls on the
+# first large images; threaded builds can also take it at load time
+# (INITIAL_MEMORY on the Module object, see src/memory.js)
+if [ -n "${INITIAL_MEMORY}" ]; then
+    EXTRA_BUILD_FLAGS="${EXTRA_BUILD_FLAGS} -sINITIAL_MEMORY=${INITIAL_MEMORY}"
+fi
+if [ -n "${MAXIMUM_MEMORY}" ]; then
+    EXTRA_BUILD_FLAGS="${EXTRA_BUILD_FLAGS} -sMAXIMUM_MEMORY=${MAXIMUM_MEMORY}"
+fi
+# wasm64: every object file is compiled for 64-bit pointers, so it gets its
+# own build directory. Runs in engines with memory64 (Node 24+, Chrome 133+)
+if [ "${MEMORY64}" = "1" ]; then
+    EXTRA_BUILD_FLAGS="${EXTRA_BUILD_FLAGS} -sMEMORY64=1"
+    BUILD_DIR="${BUILD_DIR}_memory64"
+    OUTPUT_DIR="${OUTPUT_DIR}-memory64"
+    echo "Memory: 64-bit (wasm64), maximum ${MAXIMUM_MEMORY:-16GB}"
+    if [ -z "${MAXIMUM_MEMORY}" ]; then
+        EXTRA_BUILD_FLAGS="${EXTRA_BUILD_FLAGS} -sMAXIMUM_MEMORY=16GB"
+    fi
+fi
+
+# Opt-in image codecs: build_js.py turns imgcodecs and the image libraries
+# off; later -D options override it. The bindings come from
+# patches/codecs_bindings.cpp (applied by scripts/download-opencv.sh)
+if [ "${WITH_CODECS}" = "1" ]; then
+    CMAKE_OPTS+=(
+        "-DBUILD_opencv_imgcodecs=ON"
+        "-DWITH_JPEG=ON" "-DBUILD_JPEG=ON"
+        "-DWITH_PNG=ON" "-DBUILD_PNG=ON"
+        "-DWITH_WEBP=ON" "-DBUILD_WEBP=ON"
+        "-DBUILD_ZLIB=ON"
+    )
+    # custom and split builds only build the modules in BUILD_LIST
+    for i in "${!CMAKE_OPTS[@]}"; do
+        if [[ "${CMAKE_OPTS[$i]}" == -DBUILD_LIST=* ]]; then
+            CMAKE_OPTS[$i]="${CMAKE_OPTS[$i]},imgcodecs"
+        fi
+    done
+    echo "Codecs: imgcodecs with JPEG, PNG and WebP"
+fi
+
+# Modules in this build, for build.json: the core set build_js.py always
+# builds plus the modules turned on above (or the BUILD_LIST of custom and
+# split builds)
+BUILD_MODULES="core,imgproc,features2d,calib3d,flann"
+for opt in "${CMAKE_OPTS[@]}"; do
+    case "${opt}" in
+        -DBUILD_LIST=*)
+            BUILD_MODULES="$(echo "${opt#-DBUILD_LIST=}" | sed 's/,js,/,/; s/,js$//')"
+            ;;
+        -DBUILD_opencv_*=ON)
+            MODULE="${opt#-DBUILD_opencv_}"
+            BUILD_MODULES="${BUILD_MODULES},${MODULE%=ON}"
+            ;;
+    esac
+done
+
 # Ensure opencv source exists
 if [ ! -d "opencv" ]; then
     echo "Error: opencv directory not found. Run 'npm run download' first."
     exit 1
 fi
 
-# For full build, ensure contrib exists
-if [ "$BUILD_TYPE" = "full" ] && [ ! -d "opencv_contrib" ]; then
+# For full and custom builds, ensure contrib exists
+if [ "$BUILD_TYPE" != "essential" ] && [ ! -d "opencv_contrib" ]; then
     echo "Error: opencv_contrib directory not found. Run 'npm run download' first."
     exit 1
 fi
@@ -129,11 +263,26 @@ if [ -f /.dockerenv ] || grep -q docker /proc/1/cgroup 2>/dev/null; then
     echo "Running inside Docker container..."
     echo ""
 
+    # Split builds generate the main module whitelist from the group manifest
+    if [ "$BUILD_TYPE" = "split" ]; then
+        python3 scripts/generate-whitelist.py --only "${MAIN_MODULES}" --out "${SPLIT_DIR}/main"
+    fi
+
     # Build command arguments
     BUILD_CMD="python3 ./opencv/platforms/js/build_js.py ${BUILD_DIR}"
     BUILD_CMD="${BUILD_CMD} ${BUILD_FLAGS}"
     BUILD_CMD="${BUILD_CMD} --disable_single_file"
 
+    # Custom builds replace the bindings whitelist
+    if [ -n "${CONFIG_FILE}" ]; then
+        BUILD_CMD="${BUILD_CMD} --config=\"${CONFIG_FILE}\""
+    fi
+
+    # Extra Emscripten compile/link flags
+    if [ -n "${EXTRA_BUILD_FLAGS}" ]; then
+        BUILD_CMD="${BUILD_CMD} --build_flags=\"${EXTRA_BUILD_FLAGS}\""
+    fi
+
     # Add common cmake options
     BUILD_CMD="${BUILD_CMD} --cmake_option=\"-DCMAKE_CXX_STANDARD=17\""
     BUILD_CMD="${BUILD_CMD} --cmake_option=\"-DBUILD_DOCS=OFF\""
@@ -171,6 +320,25 @@ if [ -f /.dockerenv ] || grep -q docker /proc/1/cgroup 2>/dev/null; then
         cp ${BUILD_DIR}/bin/opencv_js.worker.js ${OUTPUT_DIR}/
     fi
 
+    # Build description read by the entry points' build selection (src/select.js)
+    cat > ${OUTPUT_DIR}/build.json <<EOF
+{
+  "type": "${BUILD_TYPE}",
+  "modules": [$(echo "${BUILD_MODULES}" | sed 's/[^,]*/"&"/g; s/,/, /g')],
+  "threads": $([[ " ${BUILD_FLAGS} " == *" --threads "* ]] && echo true || echo false),
+  "relaxedSimd": $([ "${RELAXED_SIMD}" = "1" ] && echo true || echo false),
+  "memory64": $([ "${MEMORY64}" = "1" ] && echo true || echo false)
+}
+EOF
+
+    # Side modules for split builds
+    if [ "$BUILD_TYPE" = "split" ]; then
+        SPLIT_DIR=${SPLIT_DIR} OUTPUT_DIR=${OUTPUT_DIR} bash scripts/build-side-modules.sh
+    fi
+
+    # Brotli/gzip variants and the content-hash manifest served by server.js
+    node scripts/compress-dist.js ${OUTPUT_DIR}
+
 else
     echo "Running outside Docker, launching container..."
 
@@ -180,6 +348,14 @@ else
         -v "$(pwd)":/src \
         -u "$(id -u):$(id -g)" \
         -e BUILD_TYPE=${BUILD_TYPE} \
+        -e CUSTOM_DIR=${CUSTOM_DIR} \
+        -e SPLIT_DIR=${SPLIT_DIR} \
+        -e WITH_CODECS=${WITH_CODECS} \
+        -e INITIAL_MEMORY=${INITIAL_MEMORY} \
+        -e MAXIMUM_MEMORY=${MAXIMUM_MEMORY} \
+        -e MEMORY64=${MEMORY64} \
+        -e THREADS=${THREADS} \
+        -e RELAXED_SIMD=${RELAXED_SIMD} \
         opencv-wasm-builder \
         bash scripts/build.sh
 fi
@@ -0,0 +1,111 @@
+/**
+ * Precompress build artifacts and write a content-hash manifest
+ *
+ * For every opencv.js, opencv_js.wasm, opencv_js.worker.js and side module
+ * in a build directory this writes <file>.br (brotli, quality 11) and
+ * <file>.gz (gzip -9) next to it, so server.js can send the smallest
+ * variant the client accepts without compressing per request. Files are
+ * only recompressed when they changed.
+ *
+ * manifest.json lists each file's SHA-256 prefix and its content-hashed URL
+ * (opencv_js.<hash>.wasm). server.js serves those URLs as immutable and
+ * dist/loader.js uses them with the `hashedUrls` option.
+ *
+ * Run:
+ *   node scripts/compress-dist.js                  # every build in dist/
+ *   node scripts/compress-dist.js dist/full        # one build
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const MANIFEST_VERSION = 1;
+const HASH_LENGTH = 16;
+const ASSET_PATTERN = /^(opencv\.js|opencv_js\.wasm|opencv_js\.worker\.js|opencv_[a-z0-9_]+\.wasm)$/;
+
+function hashedName(file, hash) {
+    const ext = path.extname(file);
+    return `${file.slice(0, -ext.length)}.${hash}${ext}`;
+}
+
+function isFresh(source, target) {
+    if (!fs.existsSync(target)) return false;
+    return fs.statSync(target).mtimeMs >= fs.statSync(source).mtimeMs;
+}
+
+function compressFile(source, content) {
+    const brPath = `${source}.br`;
+    const gzPath = `${source}.gz`;
+    if (!isFresh(source, brPath)) {
+        fs.writeFileSync(brPath, zlib.brotliCompressSync(content, {
+            params: {
+                [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+                [zlib.constants.BROTLI_PARAM_SIZE_HINT]: content.length,
+            },
+        }));
+    }
+    if (!isFresh(source, gzPath)) {
+        fs.writeFileSync(gzPath, zlib.gzipSync(content, { level: zlib.constants.Z_BEST_COMPRESSION }));
+    }
+    return { br: fs.statSync(brPath).size, gzip: fs.statSync(gzPath).size };
+}
+
+/**
+ * Compress the assets of one build directory and write its manifest
+ * @param {string} dir - Build directory, e.g. dist/full
+ * @returns {Object} The manifest
+ */
+function compressBuild(dir) {
+    const manifest = { version: MANIFEST_VERSION, files: {} };
+    const files = fs.readdirSync(dir).filter(file => ASSET_PATTERN.test(file)).sort();
+    for (const file of files) {
+        const source = path.join(dir, file);
+        const content = fs.readFileSync(source);
+        const hash = crypto.createHash('sha256').update(content).digest('hex').slice(0, HASH_LENGTH);
+        manifest.files[file] = {
+            hash,
+            url: hashedName(file, hash),
+            size: content.length,
+            ...compressFile(source, content),
+        };
+    }
+    fs.writeFileSync(path.join(dir, 'manifest.json'), JSON.stringify(manifest, null, 2) + '\n');
+    return manifest;
+}
+
+function formatSize(bytes) {
+    return `${(bytes / 1048576).toFixed(2)}MB`;
+}
+
+function main() {
+    const distDir = path.join(__dirname, '..', 'dist');
+    let dirs = process.argv.slice(2);
+    if (!dirs.length) {
+        dirs = fs.readdirSync(distDir)
+            .map(name => path.join(distDir, name))
+            .filter(dir => fs.statSync(dir).isDirectory() && fs.existsSync(path.join(dir, 'opencv.js')));
+    }
+    if (!dirs.length) {
+        console.error('No builds found in dist/. Run "npm run build" first.');
+        process.exit(1);
+    }
+
+    for (const dir of dirs) {
+        const manifest = compressBuild(dir);
+        console.log(`${dir}:`);
+        for (const [file, entry] of Object.entries(manifest.files)) {
+            console.log(
+                `  ${file.padEnd(28)} ${formatSize(entry.size).padStart(9)}  ` +
+                `br ${formatSize(entry.br).padStart(9)}  gzip ${formatSize(entry.gzip).padStart(9)}  -> ${entry.url}`
+            );
+        }
+    }
+}
+
+if (require.main === module) {
+    main();
+}
+
+module.exports = { compressBuild, hashedName, HASH_LENGTH };
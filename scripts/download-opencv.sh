@@ -111,6 +111,34 @@ if [ -f "patches/opencv_js.config.py" ]; then
     echo "  Applied patches/opencv_js.config.py"
 fi
 
+# Extra embind bindings registered with the core bindings:
+#   bulk_bindings.cpp    bulk typed-array accessors for result vectors
+#   codecs_bindings.cpp  imdecode/imencode on byte buffers (WITH_CODECS=1 builds)
+#   flann_bindings.cpp   FlannBasedMatcher and serializable FlannIndex
+#   img_hash_bindings.cpp  computeHashes(), batch img_hash hashing
+#   memory_bindings.cpp  mallocStats() and live Mat counts for cv.memoryStats()
+#   ml_bindings.cpp      ml model save/load to buffers and batched predictBatch()
+#   tracking_bindings.cpp  MultiTracker, batched multi-object tracking
+CORE_BINDINGS="opencv/modules/js/src/core_bindings.cpp"
+for NAME in bulk codecs flann img_hash memory ml tracking; do
+    if [ -f "patches/${NAME}_bindings.cpp" ] && [ -f "${CORE_BINDINGS}" ]; then
+        if grep -q "EMSCRIPTEN_BINDINGS(${NAME}_utils)" "${CORE_BINDINGS}"; then
+            echo "  ${NAME}_bindings.cpp already present in core_bindings.cpp"
+        else
+            cat "patches/${NAME}_bindings.cpp" >> "${CORE_BINDINGS}"
+            echo "  Appended patches/${NAME}_bindings.cpp to core_bindings.cpp"
+        fi
+    fi
+done
+
+# imgcodecs is not wrapped for JS upstream; WITH_CODECS=1 builds need its
+# IMREAD_* / IMWRITE_* constants
+IMGCODECS_CMAKE="opencv/modules/imgcodecs/CMakeLists.txt"
+if [ -f "${IMGCODECS_CMAKE}" ] && ! grep -q "WRAP.*js" "${IMGCODECS_CMAKE}"; then
+    sed -i 's/\(ocv_[a-z]*_module(imgcodecs[^)]*WRAP[^)]*\))/\1 js)/' "${IMGCODECS_CMAKE}"
+    echo "  imgcodecs: Enabling JS bindings..."
+fi
+
 echo ""
 echo "=== Download complete ==="
 echo "OpenCV version: ${OPENCV_VERSION}"
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Generate a minimal OpenCV.js whitelist from usage traces.
+
+Reads one or more JSON traces written by src/trace.js and the full binding
+config in patches/opencv_js.config.py, and writes:
+
+  <out>/opencv_js.config.py   pruned white_list with only the traced bindings
+  <out>/modules.txt           OpenCV modules needed by the pruned white_list
+
+`BUILD_TYPE=custom bash scripts/build.sh` consumes both files.
+
+With --only and no traces, the listed module dicts are copied unpruned;
+BUILD_TYPE=split uses this to write one config per side module group.
+
+Usage:
+  python3 scripts/generate-whitelist.py opencv-trace.json [more.json ...]
+  python3 scripts/generate-whitelist.py --out custom --keep imgproc:resize trace.json
+  python3 scripts/generate-whitelist.py --only dnn,dnn_superres --out build_split/dnn
+"""
+
+import argparse
+import json
+import os
+import sys
+
+DEFAULT_CONFIG = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'patches', 'opencv_js.config.py'))
+
+# Modules every custom build needs, whether traced or not
+REQUIRED_MODULES = ['core', 'imgproc']
+
+
+def load_config(path):
+    """Execute the binding config and return its module dicts in white_list order."""
+    captured = []
+
+    def make_white_list(module_list):
+        captured.extend(module_list)
+        return {}
+
+    scope = {'makeWhiteList': make_white_list, 'namespace_prefix_override': {}}
+    with open(path) as f:
+        exec(compile(f.read(), path, 'exec'), scope)
+
+    names = {id(value): name for name, value in scope.items() if isinstance(value, dict)}
+    return [(names[id(module)], module) for module in captured]
+
+
+def load_traces(paths):
+    """Merge trace files into (functions, classes) usage sets."""
+    functions = set()
+    classes = {}
+    for path in paths:
+        with open(path) as f:
+            trace = json.load(f)
+        if trace.get('version') != 1:
+            sys.exit('Error: unsupported trace version in %s' % path)
+        functions.update(trace.get('functions', {}))
+        for name, entry in trace.get('classes', {}).items():
+            merged = classes.setdefault(name, {'constructed': False, 'methods': set(), 'bases': []})
+            merged['constructed'] = merged['constructed'] or entry.get('constructed', 0) > 0
+            merged['methods'].update(entry.get('methods', {}))
+            merged['bases'] = merged['bases'] or entry.get('bases', [])
+    return functions, classes
+
+
+def js_names(name):
+    """Names a whitelist entry may have on the cv object.
+
+    Lowercase namespace prefixes (dnn_, aruco_, fisheye_, ...) can be dropped
+    by the bindings generator, so both spellings are accepted.
+    """
+    names = {name}
+    prefix, sep, rest = name.partition('_')
+    if sep and rest and prefix.islower():
+        names.add(rest)
+    return names
+
+
+def prune(modules, functions, classes, keep):
+    """Return {module: {key: [methods]}} holding only used bindings."""
+    used_classes = set(classes)
+    for entry in classes.values():
+        used_classes.update(entry['bases'])
+
+    def class_used(key):
+        return bool(js_names(key) & used_classes)
+
+    def class_info(key):
+        for name in js_names(key):
+            if name in classes:
+                return classes[name]
+        return {'constructed': False, 'methods': set(), 'bases': []}
+
+    pruned = {}
+    for module_name, module in modules:
+        kept_manually = {name for (mod, name) in keep if mod == module_name}
+        result = {}
+        for key, methods in module.items():
+            if key == '':
+                kept = [m for m in methods if js_names(m) & functions or m in kept_manually]
+                if kept:
+                    result[key] = kept
+                continue
+
+            if not methods:
+                # Empty entries are either value classes or free factory functions
+                if class_used(key) or js_names(key) & functions or key in kept_manually:
+                    result[key] = []
+                continue
+
+            if key in kept_manually:
+                result[key] = list(methods)
+                continue
+            if not class_used(key):
+                continue
+
+            info = class_info(key)
+            constructor = key.rsplit('_', 1)[-1]
+            kept = []
+            for method in methods:
+                if method in info['methods'] or method in kept_manually:
+                    kept.append(method)
+                elif info['constructed'] and method in ('create', constructor):
+                    kept.append(method)
+            result[key] = kept
+        if result:
+            pruned[module_name] = result
+    return pruned
+
+
+def count_bindings(modules):
+    return sum(len(methods) or 1 for module in modules for methods in module.values())
+
+
+def write_config(path, pruned, sources):
+    lines = [
+        '# Classes and methods whitelist',
+        '#',
+        '# Generated by scripts/generate-whitelist.py from:',
+    ]
+    lines += ['#   %s' % source for source in sources]
+    lines += ['# Do not edit - regenerate with scripts/generate-whitelist.py instead.', '']
+    for module_name, module in pruned.items():
+        lines.append('%s = {' % module_name)
+        for key, methods in module.items():
+            lines.append('    %r: %r,' % (key, methods))
+        lines.append('}')
+        lines.append('')
+    lines.append('white_list = makeWhiteList([%s])' % ', '.join(pruned))
+    lines.append('')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a minimal OpenCV.js whitelist from usage traces')
+    parser.add_argument('traces', nargs='*', help='Trace JSON files written by src/trace.js')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='Full binding config (default: patches/opencv_js.config.py)')
+    parser.add_argument('--out', default='custom', help='Output directory (default: custom)')
+    parser.add_argument('--keep', action='append', default=[], metavar='MODULE:NAME',
+                        help='Always keep a binding, e.g. imgproc:resize or features2d:ORB')
+    parser.add_argument('--only', metavar='MODULES',
+                        help='Comma-separated module dicts to emit (unpruned when no traces are given)')
+    parser.add_argument('--verbose', action='store_true', help='List traced names missing from the config')
+    args = parser.parse_args()
+
+    keep = set()
+    for item in args.keep:
+        module_name, sep, name = item.partition(':')
+        if not sep:
+            sys.exit('Error: --keep expects MODULE:NAME, got %r' % item)
+        keep.add((module_name, name))
+
+    modules = load_config(args.config)
+    if args.only:
+        only = args.only.split(',')
+        unknown = set(only) - {name for name, _ in modules}
+        if unknown:
+            sys.exit('Error: unknown module(s) in --only: %s' % ', '.join(sorted(unknown)))
+        modules = [(name, module) for name, module in modules if name in only]
+    elif not args.traces:
+        parser.error('at least one trace file is required without --only')
+
+    if args.traces:
+        functions, classes = load_traces(args.traces)
+        pruned = prune(modules, functions, classes, keep)
+    else:
+        pruned = {name: dict(module) for name, module in modules}
+
+    if args.only:
+        module_list = list(pruned)
+    else:
+        module_list = list(REQUIRED_MODULES)
+        module_list += [name for name in pruned if name not in module_list]
+        for name in REQUIRED_MODULES:
+            pruned.setdefault(name, {})
+
+    os.makedirs(args.out, exist_ok=True)
+    write_config(os.path.join(args.out, 'opencv_js.config.py'), pruned, args.traces or [args.config])
+    with open(os.path.join(args.out, 'modules.txt'), 'w') as f:
+        f.write('\n'.join(module_list) + '\n')
+
+    total = count_bindings(module for _, module in modules)
+    kept = count_bindings(pruned.values())
+    print('=== Custom whitelist generated ===')
+    print('Bindings kept: %d of %d' % (kept, total))
+    print('Modules: %s' % ', '.join(module_list))
+    print('Output: %s' % args.out)
+
+    # Without traces there are no traced names to report
+    if args.verbose and args.traces:
+        known = set()
+        for _, module in modules:
+            for key, methods in module.items():
+                known.update(js_names(key))
+                for method in methods:
+                    known.update(js_names(method))
+        missing = sorted((functions | set(classes)) - known)
+        if missing:
+            print('Traced names not in config (runtime helpers or core types): %s' % ', '.join(missing))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,62 +1,278 @@
+/**
+ * Static server for the examples, docs and dist builds
+ *
+ * - COOP/COEP headers, required for SharedArrayBuffer (threaded builds)
+ * - Streams files instead of buffering them, with single byte-range support
+ * - ETag / Last-Modified revalidation (304 Not Modified)
+ * - Serves <file>.br / <file>.gz written by scripts/compress-dist.js when the
+ *   client accepts them, keeping Content-Type: application/wasm so
+ *   WebAssembly.instantiateStreaming can compile while downloading
+ * - Content-hashed URLs from dist/<build>/manifest.json
+ *   (opencv_js.<hash>.wasm) are cached as immutable
+ *
+ * Run:
+ *   node server.js                        # development: every response revalidates
+ *   node server.js --production           # short max-age on unhashed files
+ *   PORT=3000 node server.js
+ */
+
 const http = require('http');
 const fs = require('fs');
 const path = require('path');
 
-const PORT = 8080;
+const PORT = Number(process.env.PORT) || 8080;
 
 const mimeTypes = {
-    '.html': 'text/html',
-    '.js': 'application/javascript',
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.mjs': 'application/javascript; charset=utf-8',
     '.wasm': 'application/wasm',
-    '.css': 'text/css',
-    '.json': 'application/json',
+    '.css': 'text/css; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.map': 'application/json; charset=utf-8',
+    '.txt': 'text/plain; charset=utf-8',
     '.png': 'image/png',
     '.jpg': 'image/jpeg',
     '.gif': 'image/gif',
     '.svg': 'image/svg+xml',
+    '.webp': 'image/webp',
+    '.onnx': 'application/octet-stream',
 };
 
-const server = http.createServer((req, res) => {
-    // Required headers for SharedArrayBuffer (threading support)
-    res.setHeader('Cross-Origin-Opener-Policy', 'same-origin');
-    res.setHeader('Cross-Origin-Embedder-Policy', 'require-corp');
+// Precompressed variants, in order of preference
+const ENCODINGS = [
+    { name: 'br', suffix: '.br' },
+    { name: 'gzip', suffix: '.gz' },
+];
+
+// opencv_js.0123456789abcdef.wasm -> opencv_js.wasm
+const HASHED_URL = /^(.+)\.([0-9a-f]{16})(\.[a-z]+)$/;
+
+const IMMUTABLE = 'public, max-age=31536000, immutable';
+
+/**
+ * Hash of a file from its build's manifest.json (re-read when the manifest changes)
+ */
+function createManifestLookup() {
+    const manifests = new Map();
+    return (filePath) => {
+        const manifestPath = path.join(path.dirname(filePath), 'manifest.json');
+        let stats;
+        try {
+            stats = fs.statSync(manifestPath);
+        } catch (err) {
+            return null;
+        }
+        let cached = manifests.get(manifestPath);
+        if (!cached || cached.mtimeMs !== stats.mtimeMs) {
+            try {
+                cached = { mtimeMs: stats.mtimeMs, files: JSON.parse(fs.readFileSync(manifestPath, 'utf8')).files };
+            } catch (err) {
+                cached = { mtimeMs: stats.mtimeMs, files: {} };
+            }
+            manifests.set(manifestPath, cached);
+        }
+        const entry = cached.files[path.basename(filePath)];
+        return entry ? entry.hash : null;
+    };
+}
+
+function acceptedEncodings(req) {
+    const header = req.headers['accept-encoding'] || '';
+    const accepted = new Set();
+    for (const part of header.split(',')) {
+        const [name, ...params] = part.trim().split(';');
+        const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+        if (name && (!q || Number(q.slice(2)) > 0)) accepted.add(name.toLowerCase());
+    }
+    return accepted;
+}
+
+/**
+ * Parse a single "bytes=" range against a representation size
+ * @returns {Object|null|false} { start, end }, null when absent, false when unsatisfiable
+ */
+function parseRange(header, size) {
+    if (!header) return null;
+    const match = /^bytes=(\d*)-(\d*)$/.exec(header.trim());
+    // Multiple or malformed ranges: ignore the header and send the whole file
+    if (!match || (match[1] === '' && match[2] === '')) return null;
 
-    let filePath = req.url === '/' ? '/examples/browser/index.html' : req.url;
-    // Handle directory paths by appending index.html
-    if (filePath.endsWith('/')) {
-        filePath += 'index.html';
+    let start;
+    let end;
+    if (match[1] === '') {
+        start = Math.max(0, size - Number(match[2]));
+        end = size - 1;
+    } else {
+        start = Number(match[1]);
+        end = match[2] === '' ? size - 1 : Math.min(Number(match[2]), size - 1);
     }
-    filePath = path.join(__dirname, filePath);
+    if (start >= size || start > end) return false;
+    return { start, end };
+}
 
-    const ext = path.extname(filePath).toLowerCase();
-    const contentType = mimeTypes[ext] || 'application/octet-stream';
+function statFile(filePath) {
+    try {
+        const stats = fs.statSync(filePath);
+        return stats.isFile() ? stats : null;
+    } catch (err) {
+        return null;
+    }
+}
+
+/**
+ * Create the request handler
+ * @param {Object} options - Configuration options
+ * @param {string} options.root - Directory to serve (default: this directory)
+ * @param {boolean} options.production - Let browsers cache unhashed files briefly (default: false)
+ * @returns {Function} (req, res) handler for http.createServer
+ */
+function createHandler(options = {}) {
+    const root = path.resolve(options.root || __dirname);
+    const production = Boolean(options.production);
+    const manifestHash = createManifestLookup();
+
+    const send = (res, status, message) => {
+        res.writeHead(status, { 'Content-Type': 'text/plain; charset=utf-8' });
+        res.end(message);
+    };
+
+    return (req, res) => {
+        // Required headers for SharedArrayBuffer (threading support)
+        res.setHeader('Cross-Origin-Opener-Policy', 'same-origin');
+        res.setHeader('Cross-Origin-Embedder-Policy', 'require-corp');
+
+        if (req.method !== 'GET' && req.method !== 'HEAD') {
+            res.setHeader('Allow', 'GET, HEAD');
+            send(res, 405, 'Method not allowed');
+            return;
+        }
+
+        let pathname;
+        try {
+            pathname = decodeURIComponent(new URL(req.url, 'http://localhost').pathname);
+        } catch (err) {
+            send(res, 400, 'Bad request');
+            return;
+        }
+        if (pathname === '/') {
+            pathname = '/examples/browser/index.html';
+        }
 
-    fs.stat(filePath, (statErr, stats) => {
-        if (!statErr && stats.isDirectory()) {
+        let filePath = path.join(root, path.normalize(pathname));
+        if (filePath !== root && !filePath.startsWith(root + path.sep)) {
+            send(res, 403, 'Forbidden');
+            return;
+        }
+        // Directory paths serve their index.html
+        if (pathname.endsWith('/') || (fs.existsSync(filePath) && fs.statSync(filePath).isDirectory())) {
             filePath = path.join(filePath, 'index.html');
         }
-        fs.readFile(filePath, (err, content) => {
-        if (err) {
-            if (err.code === 'ENOENT') {
-                res.writeHead(404);
-                res.end('File not found: ' + req.url);
-            } else {
-                res.writeHead(500);
-                res.end('Server error: ' + err.code);
+
+        let cacheControl = production ? 'public, max-age=300' : 'no-cache';
+        let stats = statFile(filePath);
+        if (!stats) {
+            // Content-hashed URL of a build artifact
+            const hashed = HASHED_URL.exec(path.basename(filePath));
+            const original = hashed && path.join(path.dirname(filePath), hashed[1] + hashed[3]);
+            if (hashed && manifestHash(original) === hashed[2]) {
+                filePath = original;
+                stats = statFile(filePath);
+                cacheControl = IMMUTABLE;
+            }
+        }
+        if (!stats) {
+            send(res, 404, 'File not found: ' + pathname);
+            return;
+        }
+
+        // Pick the smallest accepted precompressed variant that is up to date
+        const accepted = acceptedEncodings(req);
+        let encoding = null;
+        let servedPath = filePath;
+        let servedStats = stats;
+        for (const candidate of ENCODINGS) {
+            if (!accepted.has(candidate.name)) continue;
+            const variant = statFile(filePath + candidate.suffix);
+            if (variant && variant.mtimeMs >= stats.mtimeMs) {
+                encoding = candidate.name;
+                servedPath = filePath + candidate.suffix;
+                servedStats = variant;
+                break;
             }
+        }
+
+        const etag = `"${servedStats.size.toString(16)}-${Math.floor(servedStats.mtimeMs).toString(16)}${encoding ? '-' + encoding : ''}"`;
+        const headers = {
+            'Content-Type': mimeTypes[path.extname(filePath).toLowerCase()] || 'application/octet-stream',
+            'Cache-Control': cacheControl,
+            'ETag': etag,
+            'Last-Modified': stats.mtime.toUTCString(),
+            'Accept-Ranges': 'bytes',
+            'Vary': 'Accept-Encoding',
+        };
+        if (encoding) {
+            headers['Content-Encoding'] = encoding;
+        }
+
+        const ifNoneMatch = req.headers['if-none-match'];
+        const ifModifiedSince = req.headers['if-modified-since'];
+        const notModified = ifNoneMatch
+            ? ifNoneMatch.split(',').some(tag => tag.trim().replace(/^W\//, '') === etag || tag.trim() === '*')
+            : Boolean(ifModifiedSince) && Date.parse(ifModifiedSince) >= Math.floor(stats.mtimeMs / 1000) * 1000;
+        if (notModified) {
+            delete headers['Content-Type'];
+            delete headers['Content-Encoding'];
+            res.writeHead(304, headers);
+            res.end();
+            return;
+        }
+
+        // If-Range: only honour Range when the client's copy is current
+        const ifRange = req.headers['if-range'];
+        const range = ifRange && ifRange !== etag ? null : parseRange(req.headers.range, servedStats.size);
+        if (range === false) {
+            headers['Content-Range'] = `bytes */${servedStats.size}`;
+            res.writeHead(416, headers);
+            res.end();
+            return;
+        }
+
+        let status = 200;
+        let streamOptions = {};
+        if (range) {
+            status = 206;
+            streamOptions = { start: range.start, end: range.end };
+            headers['Content-Range'] = `bytes ${range.start}-${range.end}/${servedStats.size}`;
+            headers['Content-Length'] = range.end - range.start + 1;
         } else {
-            const finalExt = path.extname(filePath).toLowerCase();
-            const finalContentType = mimeTypes[finalExt] || 'application/octet-stream';
-            res.writeHead(200, { 'Content-Type': finalContentType });
-            res.end(content);
+            headers['Content-Length'] = servedStats.size;
         }
-        });
+
+        res.writeHead(status, headers);
+        if (req.method === 'HEAD') {
+            res.end();
+            return;
+        }
+        const stream = fs.createReadStream(servedPath, streamOptions);
+        stream.on('error', () => res.destroy());
+        stream.pipe(res);
+    };
+}
+
+if (require.main === module) {
+    const production = process.argv.includes('--production') || process.env.NODE_ENV === 'production';
+    const server = http.createServer(createHandler({ production }));
+
+    server.listen(PORT, () => {
+        console.log(`Server running at http://localhost:${PORT}`);
+        console.log(`Demo: http://localhost:${PORT}/examples/browser/`);
+        console.log('');
+        console.log('COOP/COEP headers enabled for SharedArrayBuffer support');
+        console.log(production
+            ? 'Production caching: hashed URLs immutable, other files max-age=300'
+            : 'Development caching: every response revalidates (ETag)');
     });
-});
-
-server.listen(PORT, () => {
-    console.log(`Server running at http://localhost:${PORT}`);
-    console.log(`Demo: http://localhost:${PORT}/examples/browser/`);
-    console.log('');
-    console.log('COOP/COEP headers enabled for SharedArrayBuffer support');
-});
+}
+
+module.exports = { createHandler };
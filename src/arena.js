@@ -0,0 +1,315 @@
+/**
+ * Scoped Mat Arena and Leak Tracking
+ *
+ * Every Mat, MatVector, KeyPointVector, ... is a C++ object on the wasm heap
+ * that lives until .delete() is called. cv.scope() records each embind
+ * object created while a function runs - by constructors, static factories
+ * like Mat.zeros(), methods like roi() or MatVector.get(), and cv functions -
+ * and deletes them all when it returns.
+ *
+ * Usage:
+ *   const edges = cv.scope(() => {
+ *       const gray = new cv.Mat();
+ *       const out = new cv.Mat();
+ *       cv.cvtColor(src, gray, cv.COLOR_RGBA2GRAY);
+ *       cv.Canny(gray, out, 50, 150);
+ *       return out;            // returned objects survive (owned by the outer scope, if any)
+ *   });                        // gray is deleted here
+ *
+ *   cv.enableLeakTracking({ collect: true });
+ *   // ... later ...
+ *   console.log(cv.leakReport());   // { live: { Mat: 3 }, leaked: { MatVector: 1 }, ... }
+ *
+ * Objects are recorded through Proxy wrappers installed on the cv object
+ * the first time a scope opens or cv.enableLeakTracking() is called; until
+ * then the bindings are untouched. The wrappers stay installed, and outside
+ * a scope without leak tracking they only forward the call. Scopes are
+ * synchronous: objects created after an await cannot be attributed to a
+ * scope.
+ */
+
+const {
+    isRuntimeExport,
+    isEmbindClass,
+    isEmbindFunction,
+    isEmbindObject,
+    classHandlePrototype,
+    classPrototypes,
+} = require('./bindings');
+
+function typeName(obj) {
+    const proto = Object.getPrototypeOf(obj);
+    return (proto && proto.constructor && proto.constructor.name) || 'Unknown';
+}
+
+function countBy(map, key, delta) {
+    const value = (map.get(key) || 0) + delta;
+    if (value === 0) {
+        map.delete(key);
+    } else {
+        map.set(key, value);
+    }
+}
+
+/**
+ * Add scope(), keep(), enableLeakTracking() and leakReport() to a cv module
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv object
+ */
+function attachArena(cv) {
+    const scopes = [];
+    const kept = new WeakSet();
+    let installed = false;
+    let tracking = null;
+
+    const record = (obj) => {
+        if (scopes.length) {
+            scopes[scopes.length - 1].push(obj);
+        }
+        if (tracking) {
+            tracking.register(obj);
+        }
+        return obj;
+    };
+
+    // Wrappers only do work while a scope is open or tracking is enabled
+    const recordResult = (result) => {
+        if ((scopes.length || tracking) && isEmbindObject(result)) {
+            record(result);
+        }
+        return result;
+    };
+
+    // Proxies rather than plain wrappers: embind's overload dispatcher reads
+    // overloadTable from cv[name] / proto[name] on every call
+    const wrapFunction = fn => new Proxy(fn, {
+        apply(target, thisArg, args) {
+            return recordResult(Reflect.apply(target, thisArg, args));
+        },
+    });
+    const wrapClass = ctor => new Proxy(ctor, {
+        construct(target, args, newTarget) {
+            return record(Reflect.construct(target, args, newTarget));
+        },
+    });
+    const wrapDelete = originalDelete => function () {
+        if (tracking) tracking.unregister(this);
+        return originalDelete.call(this);
+    };
+
+    // { owner, key, wrap } for every binding objects are recorded through
+    const collectBindings = () => {
+        const entries = [];
+        const add = (owner, key, wrap) => entries.push({ owner, key, wrap });
+        const wrappedPrototypes = new WeakSet();
+        let handlePrototype = null;
+
+        for (const name of Object.keys(cv)) {
+            if (isRuntimeExport(name)) continue;
+            const original = cv[name];
+            if (typeof original !== 'function') continue;
+
+            if (isEmbindClass(original)) {
+                for (const proto of classPrototypes(original)) {
+                    if (wrappedPrototypes.has(proto)) continue;
+                    wrappedPrototypes.add(proto);
+                    for (const key of Object.getOwnPropertyNames(proto)) {
+                        if (key === 'constructor') continue;
+                        const descriptor = Object.getOwnPropertyDescriptor(proto, key);
+                        if (descriptor && typeof descriptor.value === 'function') {
+                            add(proto, key, wrapFunction);
+                        }
+                    }
+                }
+                // Static factories such as Mat.zeros()
+                for (const key of Object.getOwnPropertyNames(original)) {
+                    const descriptor = Object.getOwnPropertyDescriptor(original, key);
+                    if (descriptor && descriptor.writable && typeof descriptor.value === 'function' &&
+                        !isEmbindClass(descriptor.value)) {
+                        add(original, key, wrapFunction);
+                    }
+                }
+                handlePrototype = handlePrototype || classHandlePrototype(original.prototype);
+                add(cv, name, wrapClass);
+            } else if (isEmbindFunction(original)) {
+                // JS helpers (imread, matFromArray, ...) create objects through the wrapped classes
+                add(cv, name, wrapFunction);
+            }
+        }
+
+        if (handlePrototype) {
+            // Shallow ClassHandle.clone() returns a new handle that needs its own delete()
+            add(handlePrototype, 'clone', wrapFunction);
+            add(handlePrototype, 'delete', wrapDelete);
+        }
+        return entries;
+    };
+
+    // Wrap the bindings once, when first needed. Rewriting them per scope
+    // would cost a write per binding per frame and keep invalidating V8's
+    // inline caches for every embind method.
+    const install = () => {
+        if (installed) return;
+        installed = true;
+        for (const { owner, key, wrap } of collectBindings()) {
+            owner[key] = wrap(owner[key]);
+        }
+    };
+
+    const release = (objects, result) => {
+        const survivors = new Set();
+        const collect = (value, depth) => {
+            if (isEmbindObject(value)) {
+                survivors.add(value);
+            } else if (depth < 2 && Array.isArray(value)) {
+                value.forEach(item => collect(item, depth + 1));
+            } else if (depth < 2 && value !== null && typeof value === 'object' &&
+                Object.getPrototypeOf(value) === Object.prototype) {
+                Object.values(value).forEach(item => collect(item, depth + 1));
+            }
+        };
+        collect(result, 0);
+
+        const parent = scopes.length ? scopes[scopes.length - 1] : null;
+        for (const obj of objects) {
+            if (kept.has(obj)) continue;
+            if (survivors.has(obj)) {
+                if (parent) parent.push(obj);
+                continue;
+            }
+            if (!obj.isDeleted()) {
+                try {
+                    obj.delete();
+                } catch (err) {
+                    // Already scheduled with deleteLater()
+                }
+            }
+        }
+    };
+
+    /**
+     * Run fn and delete every embind object it created, except those it returns
+     * @param {Function} fn - Synchronous function
+     * @returns {*} fn's return value
+     */
+    cv.scope = (fn) => {
+        install();
+        const objects = [];
+        scopes.push(objects);
+        let result;
+        try {
+            result = fn();
+        } catch (err) {
+            scopes.pop();
+            release(objects, undefined);
+            throw err;
+        }
+        scopes.pop();
+        release(objects, result);
+        if (result && typeof result.then === 'function') {
+            // The caller never sees this promise; keep its failure from going unhandled
+            if (typeof result.catch === 'function') result.catch(() => {});
+            throw new Error('cv.scope() does not support async functions; objects created after an await are not tracked');
+        }
+        return result;
+    };
+
+    /**
+     * Exclude an object from every scope (it must be deleted manually)
+     * @param {Object} obj - Embind object
+     * @returns {Object} obj
+     */
+    cv.keep = (obj) => {
+        kept.add(obj);
+        return obj;
+    };
+
+    /**
+     * Count live embind objects by type, optionally deleting ones that are garbage collected
+     * @param {Object} options - Configuration options
+     * @param {boolean} options.collect - Delete objects that become unreachable without delete() (default: false)
+     * @param {boolean} options.stacks - Record creation stack traces for leakReport() (default: false)
+     */
+    cv.enableLeakTracking = (options = {}) => {
+        const { collect = false, stacks = false } = options;
+        if (tracking) return;
+        install();
+
+        const live = new Map();
+        const leaked = new Map();
+        const entries = new Map();
+        let nextId = 1;
+
+        // Held values keep the handle's internal pointer record ($$), not the
+        // handle itself, so an abandoned handle can still be freed after GC
+        const registry = typeof FinalizationRegistry === 'function'
+            ? new FinalizationRegistry(({ id, type, $$, proto }) => {
+                entries.delete(id);
+                countBy(live, type, -1);
+                countBy(leaked, type, 1);
+                // Smart-pointer handles (Ptr<Algorithm>) are already released by embind's own finalizer
+                if (collect && $$ && $$.ptr && !$$.smartPtr) {
+                    try {
+                        Object.create(proto, { $$: { value: $$ } }).delete();
+                    } catch (err) {
+                        // Freed through another handle in the meantime
+                    }
+                }
+            })
+            : null;
+        const tokens = new WeakMap();
+
+        tracking = {
+            register(obj) {
+                if (tokens.has(obj)) return;
+                const id = nextId++;
+                const type = typeName(obj);
+                const token = { id, type };
+                tokens.set(obj, token);
+                countBy(live, type, 1);
+                if (stacks) {
+                    entries.set(id, { type, stack: new Error().stack.split('\n').slice(3).join('\n') });
+                }
+                if (registry) {
+                    registry.register(obj, { id, type, $$: obj.$$, proto: Object.getPrototypeOf(obj) }, token);
+                }
+            },
+            unregister(obj) {
+                const token = tokens.get(obj);
+                if (!token) return;
+                tokens.delete(obj);
+                entries.delete(token.id);
+                countBy(live, token.type, -1);
+                if (registry) registry.unregister(token);
+            },
+            report() {
+                const sorted = map => Object.fromEntries([...map].sort());
+                const report = {
+                    live: sorted(live),
+                    leaked: sorted(leaked),
+                    totalLive: [...live.values()].reduce((a, b) => a + b, 0),
+                    collect,
+                };
+                if (stacks) {
+                    report.objects = [...entries.values()];
+                }
+                return report;
+            },
+        };
+    };
+
+    /**
+     * Live objects by type, plus objects garbage collected without delete()
+     * @returns {Object} Leak report (enableLeakTracking() must have been called)
+     */
+    cv.leakReport = () => {
+        if (!tracking) {
+            throw new Error('Call cv.enableLeakTracking() before cv.leakReport()');
+        }
+        return tracking.report();
+    };
+
+    return cv;
+}
+
+module.exports = { attachArena };
@@ -0,0 +1,106 @@
+/**
+ * Embind introspection helpers
+ *
+ * Shared by the modules that instrument a cv object at runtime (usage
+ * tracer, scoped arena). They tell bindings apart from Emscripten runtime
+ * exports and find the prototypes that carry a class's methods.
+ */
+
+// Methods every embind class inherits from ClassHandle
+const CLASS_HANDLE_METHODS = new Set([
+    'constructor', 'clone', 'delete', 'deleteLater', 'isAliasOf', 'isDeleted',
+]);
+
+// Emscripten runtime exports that are not bindings
+const RUNTIME_EXPORTS = new Set([
+    'then', 'onRuntimeInitialized', 'preInit', 'preRun', 'postRun',
+    'addRunDependency', 'removeRunDependency', 'locateFile', 'instantiateWasm',
+]);
+
+function isRuntimeExport(name) {
+    return name.startsWith('_') ||
+        name.startsWith('dynCall') ||
+        name.startsWith('FS') ||
+        name.startsWith('HEAP') ||
+        RUNTIME_EXPORTS.has(name);
+}
+
+/**
+ * Check whether a cv export is an embind class constructor
+ * @param {Function} fn - Exported function
+ * @returns {boolean}
+ */
+function isEmbindClass(fn) {
+    return typeof fn === 'function' &&
+        fn.prototype != null &&
+        typeof fn.prototype.isAliasOf === 'function' &&
+        typeof fn.prototype.delete === 'function';
+}
+
+/**
+ * Check whether a cv export is an embind free function
+ *
+ * Embind marks registered functions with argCount, or with an overloadTable
+ * when several overloads share the name; JS helpers such as cv.imread or
+ * cv.Point have neither.
+ *
+ * @param {Function} fn - Exported function
+ * @returns {boolean}
+ */
+function isEmbindFunction(fn) {
+    return typeof fn === 'function' &&
+        !isEmbindClass(fn) &&
+        (Object.prototype.hasOwnProperty.call(fn, 'argCount') ||
+            Object.prototype.hasOwnProperty.call(fn, 'overloadTable'));
+}
+
+/**
+ * Check whether a value is an embind object handle (Mat, MatVector, ...)
+ * @param {*} value - Any value
+ * @returns {boolean}
+ */
+function isEmbindObject(value) {
+    return value !== null &&
+        typeof value === 'object' &&
+        typeof value.isAliasOf === 'function' &&
+        typeof value.delete === 'function';
+}
+
+/**
+ * The ClassHandle prototype shared by every embind class
+ * @param {Object} proto - Prototype of any embind class
+ * @returns {Object|null}
+ */
+function classHandlePrototype(proto) {
+    while (proto && typeof proto.isAliasOf === 'function') {
+        if (Object.prototype.hasOwnProperty.call(proto, 'isAliasOf')) return proto;
+        proto = Object.getPrototypeOf(proto);
+    }
+    return null;
+}
+
+/**
+ * Prototypes of a class and its embind bases, nearest first, excluding ClassHandle
+ * @param {Function} ctor - Embind class constructor
+ * @returns {Object[]}
+ */
+function classPrototypes(ctor) {
+    const prototypes = [];
+    let proto = ctor.prototype;
+    while (proto && typeof proto.isAliasOf === 'function') {
+        if (Object.prototype.hasOwnProperty.call(proto, 'isAliasOf')) break;
+        prototypes.push(proto);
+        proto = Object.getPrototypeOf(proto);
+    }
+    return prototypes;
+}
+
+module.exports = {
+    CLASS_HANDLE_METHODS,
+    isRuntimeExport,
+    isEmbindClass,
+    isEmbindFunction,
+    isEmbindObject,
+    classHandlePrototype,
+    classPrototypes,
+};
@@ -0,0 +1,188 @@
+/**
+ * OpenCV.js Bulk Result Accessors
+ *
+ * Builds from this package register keyPointsToArrays(), matchesToArrays(),
+ * knnMatchesToArrays(), contoursToArrays() and their *FromArrays()
+ * counterparts natively (patches/bulk_bindings.cpp): a whole KeyPointVector,
+ * DMatchVector, DMatchVectorVector or contour MatVector is copied into flat
+ * typed arrays in one call instead of one .get(i) per element.
+ *
+ * For other builds, attachBulkHelpers() defines the same functions in plain
+ * JS, so code can use them unconditionally; only the speed differs.
+ *
+ * Usage:
+ *   orb.detectAndCompute(gray, mask, keypoints, descriptors);
+ *   const { pt, response } = cv.keyPointsToArrays(keypoints);   // pt: x0, y0, x1, y1, ...
+ *
+ *   matcher.knnMatch(desc1, desc2, knn, 2);
+ *   const { trainIdx, distance, offsets } = cv.knnMatchesToArrays(knn);
+ *
+ *   cv.findContours(binary, contours, hierarchy, cv.RETR_LIST, cv.CHAIN_APPROX_NONE);
+ *   const { points, offsets } = cv.contoursToArrays(contours);
+ *   // contour i: points.subarray(offsets[i] * 2, offsets[i + 1] * 2)
+ */
+
+function keyPointsToArrays(keypoints) {
+    const n = keypoints.size();
+    const result = {
+        pt: new Float32Array(n * 2),
+        size: new Float32Array(n),
+        angle: new Float32Array(n),
+        response: new Float32Array(n),
+        octave: new Int32Array(n),
+        classId: new Int32Array(n),
+    };
+    for (let i = 0; i < n; i++) {
+        const kp = keypoints.get(i);
+        result.pt[i * 2] = kp.pt.x;
+        result.pt[i * 2 + 1] = kp.pt.y;
+        result.size[i] = kp.size;
+        result.angle[i] = kp.angle;
+        result.response[i] = kp.response;
+        result.octave[i] = kp.octave;
+        result.classId[i] = kp.class_id;
+    }
+    return result;
+}
+
+function fieldOr(arrays, name, count, fallback) {
+    const values = arrays[name];
+    if (values === undefined) return () => fallback;
+    if (values.length !== count) {
+        throw new RangeError(`${name}: expected ${count} values, got ${values.length}`);
+    }
+    return i => values[i];
+}
+
+function matchArrays(count) {
+    return {
+        queryIdx: new Int32Array(count),
+        trainIdx: new Int32Array(count),
+        imgIdx: new Int32Array(count),
+        distance: new Float32Array(count),
+    };
+}
+
+function setMatch(result, index, match) {
+    result.queryIdx[index] = match.queryIdx;
+    result.trainIdx[index] = match.trainIdx;
+    result.imgIdx[index] = match.imgIdx;
+    result.distance[index] = match.distance;
+}
+
+function matchesToArrays(matches) {
+    const n = matches.size();
+    const result = matchArrays(n);
+    for (let i = 0; i < n; i++) setMatch(result, i, matches.get(i));
+    return result;
+}
+
+function knnMatchesToArrays(matches) {
+    const rows = [];
+    const offsets = new Int32Array(matches.size() + 1);
+    for (let i = 0; i < matches.size(); i++) {
+        const row = matches.get(i);
+        rows.push(row);
+        offsets[i + 1] = offsets[i] + row.size();
+    }
+    const result = matchArrays(offsets[rows.length]);
+    rows.forEach((row, i) => {
+        for (let k = 0; k < row.size(); k++) setMatch(result, offsets[i] + k, row.get(k));
+        row.delete();
+    });
+    result.offsets = offsets;
+    return result;
+}
+
+function contoursToArrays(contours) {
+    const mats = [];
+    const offsets = new Int32Array(contours.size() + 1);
+    for (let i = 0; i < contours.size(); i++) {
+        const contour = contours.get(i);
+        mats.push(contour);
+        offsets[i + 1] = offsets[i] + contour.data32S.length / 2;
+    }
+    const points = new Int32Array(offsets[mats.length] * 2);
+    mats.forEach((contour, i) => {
+        points.set(contour.data32S, offsets[i] * 2);
+        contour.delete();
+    });
+    return { points, offsets };
+}
+
+/**
+ * Define the bulk accessors a build does not register natively
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv object
+ */
+function attachBulkHelpers(cv) {
+    const fallbacks = {
+        keyPointsToArrays,
+        matchesToArrays,
+        knnMatchesToArrays,
+        contoursToArrays,
+
+        keyPointsFromArrays(arrays) {
+            const pt = arrays.pt;
+            const n = pt.length / 2;
+            const size = fieldOr(arrays, 'size', n, 1);
+            const angle = fieldOr(arrays, 'angle', n, -1);
+            const response = fieldOr(arrays, 'response', n, 0);
+            const octave = fieldOr(arrays, 'octave', n, 0);
+            const classId = fieldOr(arrays, 'classId', n, -1);
+            const keypoints = new cv.KeyPointVector();
+            for (let i = 0; i < n; i++) {
+                keypoints.push_back({
+                    pt: { x: pt[i * 2], y: pt[i * 2 + 1] },
+                    size: size(i),
+                    angle: angle(i),
+                    response: response(i),
+                    octave: octave(i),
+                    class_id: classId(i),
+                });
+            }
+            return keypoints;
+        },
+
+        matchesFromArrays(arrays) {
+            const n = arrays.queryIdx.length;
+            const trainIdx = fieldOr(arrays, 'trainIdx', n, -1);
+            const imgIdx = fieldOr(arrays, 'imgIdx', n, -1);
+            const distance = fieldOr(arrays, 'distance', n, 0);
+            const matches = new cv.DMatchVector();
+            for (let i = 0; i < n; i++) {
+                matches.push_back({
+                    queryIdx: arrays.queryIdx[i],
+                    trainIdx: trainIdx(i),
+                    imgIdx: imgIdx(i),
+                    distance: distance(i),
+                });
+            }
+            return matches;
+        },
+
+        contoursFromArrays(points, offsets) {
+            if (offsets[offsets.length - 1] * 2 !== points.length) {
+                throw new RangeError('contoursFromArrays: offsets do not match the number of points');
+            }
+            const contours = new cv.MatVector();
+            for (let i = 0; i + 1 < offsets.length; i++) {
+                const count = offsets[i + 1] - offsets[i];
+                const contour = new cv.Mat(count, 1, cv.CV_32SC2);
+                contour.data32S.set(points.subarray
+                    ? points.subarray(offsets[i] * 2, offsets[i + 1] * 2)
+                    : points.slice(offsets[i] * 2, offsets[i + 1] * 2));
+                contours.push_back(contour);
+                contour.delete();
+            }
+            return contours;
+        },
+    };
+
+    for (const [name, fn] of Object.entries(fallbacks)) {
+        if (typeof cv[name] !== 'function') cv[name] = fn;
+    }
+    return cv;
+}
+
+module.exports = { attachBulkHelpers };
@@ -0,0 +1,27 @@
+/**
+ * OpenCV.js Custom Build - CommonJS Entry Point
+ *
+ * Minimal build containing only the bindings an application was traced
+ * calling (see src/trace.js and scripts/generate-whitelist.py).
+ *
+ * Usage:
+ *   const cvPromise = require('opencv-contrib-wasm/custom');
+ *   const cv = await cvPromise;
+ */
+
+const path = require('path');
+const fs = require('fs');
+const { load, optionsFromEnv } = require('./runtime');
+
+const opencvPath = path.join(__dirname, '..', 'dist', 'custom', 'opencv.js');
+
+if (!fs.existsSync(opencvPath)) {
+    throw new Error(
+        'OpenCV Custom WASM files not found. Please run "npm run build:custom" first ' +
+        '(see scripts/generate-whitelist.py).'
+    );
+}
+
+const cvPromise = load(opencvPath, optionsFromEnv());
+
+module.exports = cvPromise;
@@ -0,0 +1,33 @@
+/**
+ * OpenCV.js Custom Build - ES Module Entry Point
+ *
+ * Minimal build containing only the bindings an application was traced
+ * calling (see src/trace.js and scripts/generate-whitelist.py).
+ *
+ * Usage:
+ *   import cvPromise from 'opencv-contrib-wasm/custom';
+ *   const cv = await cvPromise;
+ */
+
+import { createRequire } from 'module';
+import { fileURLToPath } from 'url';
+import { dirname, join } from 'path';
+import { existsSync } from 'fs';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const opencvPath = join(__dirname, '..', 'dist', 'custom', 'opencv.js');
+
+if (!existsSync(opencvPath)) {
+    throw new Error(
+        'OpenCV Custom WASM files not found. Please run "npm run build:custom" first ' +
+        '(see scripts/generate-whitelist.py).'
+    );
+}
+
+const require = createRequire(import.meta.url);
+const { load, optionsFromEnv } = require('./runtime.js');
+const cvPromise = load(opencvPath, optionsFromEnv());
+
+export default cvPromise;
@@ -0,0 +1,306 @@
+/**
+ * OpenCV.js DNN Helpers
+ *
+ * Batched inference around the dnn bindings:
+ *
+ * - cv.blobFromImageArray(images, options) packs N images into one NCHW blob
+ *   with cv.blobFromImages, so a single forward() runs the whole batch.
+ * - cv.forwardOutputs(net, names) runs one forward pass and returns every
+ *   requested output, instead of one forward() per output layer.
+ * - cv.nmsBoxes() / cv.nmsBoxesBatched() apply OpenCV's greedy NMS to plain
+ *   arrays or flat typed arrays, without building Rect objects per box.
+ * - cv.readNetFromBuffer(bytes, options) loads a model from memory (fetch,
+ *   fs.readFileSync, a bundled asset) without a file on disk.
+ * - cv.layerTimings(net) turns getPerfProfile() into per-layer milliseconds.
+ *
+ * Inference threads follow cv.setNumThreads() (threaded builds).
+ *
+ * Usage:
+ *   const net = cv.readNetFromBuffer(fs.readFileSync('yolo.onnx'), { format: 'onnx' });
+ *   const blob = cv.blobFromImageArray(frames, { scale: 1 / 255, size: [640, 640], swapRB: true });
+ *   net.setInput(blob);
+ *   const outputs = cv.forwardOutputs(net);    // { output0: Mat } with batch dimension N
+ *   const keep = cv.nmsBoxes(boxes, scores, 0.25, 0.45);
+ */
+
+// File extensions readNet() uses to pick the importer, per format
+const MODEL_FORMATS = {
+    onnx: { model: '.onnx' },
+    tflite: { model: '.tflite' },
+    caffe: { model: '.caffemodel', config: '.prototxt' },
+    tensorflow: { model: '.pb', config: '.pbtxt' },
+    darknet: { model: '.weights', config: '.cfg' },
+    torch: { model: '.t7' },
+};
+
+let bufferCounter = 0;
+
+function toBytes(data) {
+    if (data instanceof Uint8Array) return data;
+    if (ArrayBuffer.isView(data)) return new Uint8Array(data.buffer, data.byteOffset, data.byteLength);
+    if (data instanceof ArrayBuffer) return new Uint8Array(data);
+    if (typeof data === 'string') return new TextEncoder().encode(data);
+    throw new TypeError('Expected a Buffer, typed array, ArrayBuffer or string');
+}
+
+function toList(vector) {
+    if (Array.isArray(vector)) return vector;
+    const list = [];
+    for (let i = 0; i < vector.size(); i++) list.push(vector.get(i));
+    return list;
+}
+
+/**
+ * Read box i as [x, y, width, height] from an array of {x, y, width, height},
+ * an array of [x, y, w, h], or a flat array of 4 numbers per box
+ */
+function boxReader(boxes, count) {
+    if (boxes.length === count * 4 && typeof boxes[0] === 'number') {
+        return i => [boxes[i * 4], boxes[i * 4 + 1], boxes[i * 4 + 2], boxes[i * 4 + 3]];
+    }
+    return (i) => {
+        const box = boxes[i];
+        return Array.isArray(box) ? box : [box.x, box.y, box.width, box.height];
+    };
+}
+
+function overlap(a, b) {
+    const x1 = Math.max(a[0], b[0]);
+    const y1 = Math.max(a[1], b[1]);
+    const x2 = Math.min(a[0] + a[2], b[0] + b[2]);
+    const y2 = Math.min(a[1] + a[3], b[1] + b[3]);
+    const inter = Math.max(0, x2 - x1) * Math.max(0, y2 - y1);
+    const union = a[2] * a[3] + b[2] * b[3] - inter;
+    return union > 0 ? inter / union : 0;
+}
+
+/**
+ * Greedy non-maximum suppression with the semantics of cv::dnn::NMSBoxes
+ * @param {Array|ArrayLike} boxes - {x, y, width, height} objects, [x, y, w, h] arrays or a flat array
+ * @param {ArrayLike<number>} scores - One score per box
+ * @param {number} scoreThreshold - Boxes scoring below this are dropped
+ * @param {number} nmsThreshold - IoU above which the lower-scoring box is suppressed
+ * @param {Object} options - { eta: adaptive threshold factor (default 1), topK: keep at most this many (0 = all) }
+ * @returns {number[]} Indices of kept boxes, highest score first
+ */
+function nmsBoxes(boxes, scores, scoreThreshold, nmsThreshold, options = {}) {
+    const { eta = 1, topK = 0 } = options;
+    const count = scores.length;
+    const read = boxReader(boxes, count);
+
+    const order = [];
+    for (let i = 0; i < count; i++) {
+        if (scores[i] > scoreThreshold) order.push(i);
+    }
+    // Stable sort keeps the lower index first on equal scores, like OpenCV
+    order.sort((a, b) => scores[b] - scores[a]);
+    if (topK > 0 && order.length > topK) order.length = topK;
+
+    const kept = [];
+    const keptBoxes = [];
+    let threshold = nmsThreshold;
+    for (const index of order) {
+        const box = read(index);
+        let keep = true;
+        for (let k = 0; k < keptBoxes.length && keep; k++) {
+            keep = overlap(box, keptBoxes[k]) <= threshold;
+        }
+        if (keep) {
+            kept.push(index);
+            keptBoxes.push(box);
+        }
+        if (keep && eta < 1 && threshold > 0.5) threshold *= eta;
+    }
+    return kept;
+}
+
+/**
+ * Per-class NMS (cv::dnn::NMSBoxesBatched): boxes only suppress boxes of the same class
+ * @param {Array|ArrayLike} boxes - As for nmsBoxes()
+ * @param {ArrayLike<number>} scores - One score per box
+ * @param {ArrayLike<number>} classIds - One class id per box
+ * @param {number} scoreThreshold - Boxes scoring below this are dropped
+ * @param {number} nmsThreshold - IoU above which the lower-scoring box is suppressed
+ * @param {Object} options - As for nmsBoxes()
+ * @returns {number[]} Indices of kept boxes, highest score first
+ */
+function nmsBoxesBatched(boxes, scores, classIds, scoreThreshold, nmsThreshold, options = {}) {
+    const { topK = 0, ...groupOptions } = options;
+    const read = boxReader(boxes, scores.length);
+
+    // topK limits the score-sorted candidates before suppression, as in nmsBoxes()
+    const order = [];
+    for (let i = 0; i < scores.length; i++) {
+        if (scores[i] > scoreThreshold) order.push(i);
+    }
+    order.sort((a, b) => scores[b] - scores[a]);
+    if (topK > 0 && order.length > topK) order.length = topK;
+
+    const groups = new Map();
+    for (const i of order) {
+        let group = groups.get(classIds[i]);
+        if (!group) {
+            group = [];
+            groups.set(classIds[i], group);
+        }
+        group.push(i);
+    }
+
+    const kept = [];
+    for (const indices of groups.values()) {
+        const groupBoxes = indices.map(read);
+        const groupScores = indices.map(i => scores[i]);
+        const groupKept = nmsBoxes(groupBoxes, groupScores, scoreThreshold, nmsThreshold, groupOptions);
+        for (const k of groupKept) kept.push(indices[k]);
+    }
+    kept.sort((a, b) => scores[b] - scores[a] || a - b);
+    return kept;
+}
+
+/**
+ * Add blobFromImageArray(), forwardOutputs(), nmsBoxes(), nmsBoxesBatched(),
+ * readNetFromBuffer() and layerTimings() to a cv module
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv object
+ */
+function attachDnnHelpers(cv) {
+    if (typeof cv.dnn_Net !== 'function') return cv;
+
+    /**
+     * Pack images into one NCHW blob (cv.blobFromImages)
+     * @param {cv.Mat[]|cv.MatVector} images - Images of any size; each is resized to `size`
+     * @param {Object} options - { scale, size: [w, h] or cv.Size, mean: [b, g, r] or cv.Scalar, swapRB, crop }
+     * @returns {cv.Mat} 4D blob [N, C, H, W] (caller deletes it)
+     */
+    cv.blobFromImageArray = (images, options = {}) => {
+        if (typeof cv.blobFromImages !== 'function') {
+            throw new Error('blobFromImages is not in this build; rebuild with the current dnn whitelist');
+        }
+        const { scale = 1, size = [0, 0], mean = [0, 0, 0], swapRB = false, crop = false } = options;
+        const dsize = Array.isArray(size) ? new cv.Size(size[0], size[1]) : size;
+        const scalar = Array.isArray(mean) ? new cv.Scalar(...mean) : mean;
+
+        if (!Array.isArray(images)) {
+            return cv.blobFromImages(images, scale, dsize, scalar, swapRB, crop);
+        }
+        const vector = new cv.MatVector();
+        try {
+            for (const image of images) vector.push_back(image);
+            return cv.blobFromImages(vector, scale, dsize, scalar, swapRB, crop);
+        } finally {
+            vector.delete();
+        }
+    };
+
+    let sequentialWarned = false;
+
+    /**
+     * Run one forward pass and collect several outputs
+     * @param {cv.dnn_Net} net - Network with its input set
+     * @param {string[]} names - Output layer names (default: getUnconnectedOutLayersNames())
+     * @returns {Object} Output Mats by layer name (caller deletes them)
+     */
+    cv.forwardOutputs = (net, names) => {
+        const outNames = names || toList(net.getUnconnectedOutLayersNames());
+        if (outNames.length === 1) {
+            return { [outNames[0]]: net.forward(outNames[0]) };
+        }
+
+        if (typeof cv.StringVector === 'function') {
+            const namesVector = new cv.StringVector();
+            const outs = new cv.MatVector();
+            try {
+                outNames.forEach(name => namesVector.push_back(name));
+                net.forward(outs, namesVector);
+                const result = {};
+                outNames.forEach((name, i) => { result[name] = outs.get(i); });
+                return result;
+            } catch (err) {
+                // forward(outputBlobs, outBlobNames) is not bound in this build
+                if (!(err instanceof Error)) throw err;
+            } finally {
+                namesVector.delete();
+                outs.delete();
+            }
+        }
+
+        if (!sequentialWarned) {
+            console.warn(
+                'opencv-contrib-wasm: multi-output forward() is not bound in this build; ' +
+                'running one forward() per output'
+            );
+            sequentialWarned = true;
+        }
+        const result = {};
+        for (const name of outNames) result[name] = net.forward(name);
+        return result;
+    };
+
+    /**
+     * Load a network from memory
+     * @param {Uint8Array|ArrayBuffer|Buffer} model - Weights / model file contents
+     * @param {Object} options - { format: onnx|tflite|caffe|tensorflow|darknet|torch, config: contents of the
+     *                            .prototxt / .pbtxt / .cfg file when the format has one }
+     * @returns {cv.dnn_Net}
+     */
+    cv.readNetFromBuffer = (model, options = {}) => {
+        const { format = 'onnx', config } = options;
+        const extensions = MODEL_FORMATS[format];
+        if (!extensions) {
+            throw new Error(`readNetFromBuffer: unknown format '${format}' (${Object.keys(MODEL_FORMATS).join(', ')})`);
+        }
+        if (typeof cv.FS_createDataFile !== 'function') {
+            throw new Error('readNetFromBuffer: this build does not export the virtual filesystem');
+        }
+
+        const base = `/readnet_${Date.now()}_${bufferCounter++}`;
+        const modelPath = base + extensions.model;
+        const configPath = config !== undefined && extensions.config ? base + extensions.config : '';
+        const written = [];
+        try {
+            // canOwn: MEMFS keeps the caller's bytes as the file contents
+            // instead of a second copy of the model
+            cv.FS_createDataFile('/', modelPath.slice(1), toBytes(model), true, false, true);
+            written.push(modelPath);
+            if (configPath) {
+                cv.FS_createDataFile('/', configPath.slice(1), toBytes(config), true, false, true);
+                written.push(configPath);
+            }
+            // The importer copies what it needs; the files can go right away
+            return cv.readNet(modelPath, configPath);
+        } finally {
+            for (const file of written) cv.FS_unlink(file);
+        }
+    };
+
+    /**
+     * Per-layer timings of the last forward pass (net.getPerfProfile)
+     * @param {cv.dnn_Net} net - Network that has run forward()
+     * @returns {Object} { totalMs, layers: [{ name, ms }] }
+     */
+    cv.layerTimings = (net) => {
+        if (typeof net.getPerfProfile !== 'function' || typeof cv.getTickFrequency !== 'function') {
+            throw new Error('getPerfProfile is not in this build; rebuild with the current dnn whitelist');
+        }
+        const ticksPerMs = cv.getTickFrequency() / 1000;
+        const timings = new cv.DoubleVector();
+        try {
+            // int64 return value: a BigInt with WASM_BIGINT
+            const total = Number(net.getPerfProfile(timings));
+            const names = toList(net.getLayerNames());
+            const layers = [];
+            for (let i = 0; i < timings.size(); i++) {
+                layers.push({ name: names[i], ms: timings.get(i) / ticksPerMs });
+            }
+            return { totalMs: total / ticksPerMs, layers };
+        } finally {
+            timings.delete();
+        }
+    };
+
+    cv.nmsBoxes = nmsBoxes;
+    cv.nmsBoxesBatched = nmsBoxesBatched;
+    return cv;
+}
+
+module.exports = { attachDnnHelpers, nmsBoxes, nmsBoxesBatched, MODEL_FORMATS };
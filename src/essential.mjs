@@ -41,6 +41,7 @@ if (!existsSync(opencvPath)) {
 }
 
 const require = createRequire(import.meta.url);
-const cvPromise = require(opencvPath);
+const { load, optionsFromEnv } = require('./runtime.js');
+const cvPromise = load(opencvPath, optionsFromEnv());
 
 export default cvPromise;
@@ -24,6 +24,7 @@
 
 const path = require('path');
 const fs = require('fs');
+const { load, optionsFromEnv } = require('./runtime');
 
 const opencvPath = path.join(__dirname, '..', 'dist', 'full', 'opencv.js');
 
@@ -34,6 +35,6 @@ if (!fs.existsSync(opencvPath)) {
     );
 }
 
-const cvPromise = require(opencvPath);
+const cvPromise = load(opencvPath, optionsFromEnv());
 
 module.exports = cvPromise;
@@ -0,0 +1,270 @@
+/**
+ * OpenCV.js Heap Buffers and Mat Pool
+ *
+ * WebAssembly code can only address its own heap, so pixels from a decoder,
+ * socket or file always have to land there once. These helpers make that the
+ * only copy:
+ *
+ * - cv.allocHeap(byteLength) reserves a heap region and hands out typed-array
+ *   views to fill directly (fs.readSync, stream reads, decoder output) and
+ *   Mats that use the region as their data without copying it. Several Mats
+ *   can share one region, e.g. the Y and UV planes of an NV12 frame.
+ * - cv.matView(mat) returns a typed array over a Mat's pixels with the Mat's
+ *   element type, for reading results without copying them out.
+ * - cv.createMatPool() recycles Mats by size and type, so per-frame Mats stop
+ *   reallocating and the heap stops fragmenting.
+ *
+ * Views point into the wasm heap: read them before the next OpenCV call that
+ * may allocate (heap growth can detach them) and never keep them past
+ * free() / delete().
+ *
+ * Usage:
+ *   const frame = cv.allocHeap(width * height * 4);
+ *   fs.readSync(fd, frame.bytes());                 // decoder writes into the heap
+ *   const rgba = frame.mat(height, width, cv.CV_8UC4);
+ *
+ *   const pool = cv.createMatPool();
+ *   const gray = pool.acquire(height, width, cv.CV_8UC1);
+ *   cv.cvtColor(rgba, gray, cv.COLOR_RGBA2GRAY);
+ *   socket.write(cv.matView(gray));                 // no copy out of the heap
+ *   pool.release(gray);
+ *   rgba.delete();
+ *   frame.free();
+ */
+
+// Typed array per Mat depth (CV_8U ... CV_16F)
+const DEPTH_ARRAYS = [
+    Uint8Array, Int8Array, Uint16Array, Int16Array,
+    Int32Array, Float32Array, Float64Array, Uint16Array,
+];
+
+const DEPTH_BYTES = [1, 1, 2, 2, 4, 4, 8, 2];
+
+function matDepth(type) {
+    return type & 7;
+}
+
+function matChannels(type) {
+    return (type >> 3) + 1;
+}
+
+/**
+ * Bytes per element (all channels) of a Mat type
+ * @param {number} type - Mat type, e.g. cv.CV_8UC3
+ * @returns {number}
+ */
+function elemSize(type) {
+    return DEPTH_BYTES[matDepth(type)] * matChannels(type);
+}
+
+/**
+ * Add allocHeap(), matView(), matBytes() and createMatPool() to a cv module
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv object
+ */
+function attachHeapHelpers(cv) {
+    // Taken before cv.scope() can wrap the class, so heap regions and pooled
+    // Mats are never released by a scope
+    const Mat = cv.Mat;
+
+    const matBytes = (mat) => {
+        if (!mat.isContinuous()) {
+            throw new Error('matBytes: Mat is not continuous; clone() it first');
+        }
+        return mat.data;
+    };
+
+    const matView = (mat) => {
+        const bytes = matBytes(mat);
+        const ArrayType = DEPTH_ARRAYS[matDepth(mat.type())];
+        return new ArrayType(bytes.buffer, bytes.byteOffset, bytes.byteLength / ArrayType.BYTES_PER_ELEMENT);
+    };
+
+    /**
+     * Reserve a region of the wasm heap
+     * @param {number} byteLength - Region size in bytes
+     * @returns {Object} Heap buffer with bytes(), view(), mat() and free()
+     */
+    const allocHeap = (byteLength) => {
+        if (!Number.isInteger(byteLength) || byteLength <= 0) {
+            throw new Error(`allocHeap: byteLength must be a positive integer, got ${byteLength}`);
+        }
+        const ptr = cv._malloc(byteLength);
+        if (!ptr) {
+            throw new Error(`allocHeap: out of memory allocating ${byteLength} bytes`);
+        }
+        // A header-only Mat over the region, used to reach the current heap view
+        let region = new Mat(1, byteLength, cv.CV_8UC1, ptr, 0);
+
+        const checkLive = () => {
+            if (!region) throw new Error('Heap buffer has been freed');
+        };
+
+        return {
+            ptr,
+            byteLength,
+
+            /**
+             * Uint8Array over the region (re-fetch after calls that may grow the heap)
+             * @returns {Uint8Array}
+             */
+            bytes() {
+                checkLive();
+                return region.data;
+            },
+
+            /**
+             * Typed array over the region
+             * @param {Function} ArrayType - e.g. Float32Array (default: Uint8Array)
+             * @param {number} byteOffset - Offset into the region
+             * @param {number} length - Element count (default: rest of the region)
+             * @returns {ArrayBufferView}
+             */
+            view(ArrayType = Uint8Array, byteOffset = 0, length) {
+                checkLive();
+                const bytes = region.data;
+                const count = length === undefined
+                    ? Math.floor((byteLength - byteOffset) / ArrayType.BYTES_PER_ELEMENT)
+                    : length;
+                if (byteOffset + count * ArrayType.BYTES_PER_ELEMENT > byteLength) {
+                    throw new RangeError('view: range exceeds the heap buffer');
+                }
+                return new ArrayType(bytes.buffer, bytes.byteOffset + byteOffset, count);
+            },
+
+            /**
+             * Mat using the region as its data (no copy). Delete it before free().
+             * @param {number} rows - Rows
+             * @param {number} cols - Columns
+             * @param {number} type - Mat type
+             * @param {number} byteOffset - Offset of the first pixel in the region
+             * @param {number} step - Bytes per row (default: cols * element size)
+             * @returns {cv.Mat}
+             */
+            mat(rows, cols, type, byteOffset = 0, step = 0) {
+                checkLive();
+                const rowBytes = step || cols * elemSize(type);
+                if (byteOffset + (rows - 1) * rowBytes + cols * elemSize(type) > byteLength) {
+                    throw new RangeError('mat: rows x cols exceeds the heap buffer');
+                }
+                return new cv.Mat(rows, cols, type, ptr + byteOffset, step);
+            },
+
+            /**
+             * Release the region. Mats created with mat() must be deleted first.
+             */
+            free() {
+                if (!region) return;
+                region.delete();
+                region = null;
+                cv._free(ptr);
+            },
+        };
+    };
+
+    /**
+     * Pool of Mats recycled by size and type
+     * @param {Object} options - Configuration options
+     * @param {number} options.maxPerShape - Free Mats kept per size/type (default: 8)
+     * @returns {Object} Pool with acquire(), release(), fromBuffer(), stats() and clear()
+     */
+    const createMatPool = (options = {}) => {
+        const { maxPerShape = 8 } = options;
+        const free = new Map();
+        const pooled = new Set();
+        const stats = { hits: 0, misses: 0, released: 0, discarded: 0 };
+
+        const key = (rows, cols, type) => `${rows}x${cols}:${type}`;
+
+        const pool = {
+            /**
+             * Take a Mat of the given shape; its contents are undefined
+             * @returns {cv.Mat}
+             */
+            acquire(rows, cols, type) {
+                const list = free.get(key(rows, cols, type));
+                if (list && list.length) {
+                    stats.hits++;
+                    const mat = list.pop();
+                    pooled.delete(mat);
+                    return mat;
+                }
+                stats.misses++;
+                return new Mat(rows, cols, type);
+            },
+
+            /**
+             * Return a Mat for reuse (deleted instead if its shape's list is full)
+             * @param {cv.Mat} mat - Mat from acquire() or any owning Mat
+             */
+            release(mat) {
+                if (pooled.has(mat) || mat.isDeleted()) return;
+                const k = key(mat.rows, mat.cols, mat.type());
+                let list = free.get(k);
+                if (!list) {
+                    list = [];
+                    free.set(k, list);
+                }
+                if (list.length >= maxPerShape) {
+                    stats.discarded++;
+                    mat.delete();
+                    return;
+                }
+                stats.released++;
+                list.push(mat);
+                pooled.add(mat);
+            },
+
+            /**
+             * Acquire a Mat and copy pixels into it in one pass
+             * @param {ArrayBufferView|ArrayBuffer} data - Pixels (Node Buffer, typed array, ArrayBuffer)
+             * @returns {cv.Mat}
+             */
+            fromBuffer(data, rows, cols, type) {
+                const mat = pool.acquire(rows, cols, type);
+                const bytes = mat.data;
+                const source = ArrayBuffer.isView(data)
+                    ? new Uint8Array(data.buffer, data.byteOffset, data.byteLength)
+                    : new Uint8Array(data);
+                if (source.byteLength !== bytes.byteLength) {
+                    pool.release(mat);
+                    throw new RangeError(
+                        `fromBuffer: expected ${bytes.byteLength} bytes for ${rows}x${cols}, got ${source.byteLength}`
+                    );
+                }
+                bytes.set(source);
+                return mat;
+            },
+
+            /**
+             * Pool counters and the number of free Mats held
+             * @returns {Object}
+             */
+            stats() {
+                let bytes = 0;
+                for (const mat of pooled) {
+                    bytes += mat.rows * mat.cols * elemSize(mat.type());
+                }
+                return { ...stats, pooled: pooled.size, pooledBytes: bytes };
+            },
+
+            /**
+             * Delete every free Mat held by the pool
+             */
+            clear() {
+                for (const mat of pooled) mat.delete();
+                pooled.clear();
+                free.clear();
+            },
+        };
+        return pool;
+    };
+
+    cv.allocHeap = allocHeap;
+    cv.matBytes = matBytes;
+    cv.matView = matView;
+    cv.createMatPool = createMatPool;
+    return cv;
+}
+
+module.exports = { attachHeapHelpers, elemSize };
@@ -0,0 +1,387 @@
+/**
+ * OpenCV.js Image Hash Search
+ *
+ * Batch hashing and a Hamming-space index for near-duplicate search over
+ * img_hash hashes (AverageHash, PHash, BlockMeanHash, MarrHildrethHash):
+ *
+ * - cv.computeHashes(algorithm, images) hashes a MatVector or an array of
+ *   Mats and packs the hashes into one Uint8Array. Builds from this package
+ *   register it natively (patches/img_hash_bindings.cpp); other builds get
+ *   the plain JS version below.
+ * - createHashIndex({ hashBytes }) is a multi-index hashing (MIH) index:
+ *   every hash is split into 16-bit chunks, each chunk keyed into its own
+ *   table. Two hashes within distance r agree to within floor(r / m) bits
+ *   on at least one of their m chunks, so a query only probes the chunk
+ *   buckets near its own chunks and checks the full distance of those
+ *   candidates instead of comparing against every hash.
+ * - index.serialize() / loadHashIndex(bytes) persist the hashes and labels;
+ *   the chunk tables are rebuilt on load.
+ *
+ * Usage:
+ *   const pHash = new cv.PHash();
+ *   const { hashes, hashBytes } = cv.computeHashes(pHash, images);
+ *   const index = cv.createHashIndex({ hashBytes });
+ *   index.add(hashes, ids);
+ *   index.radiusSearch(queryHash, 8);   // [{ index, label, distance }, ...]
+ *   index.knnSearch(queryHash, 5);
+ *   index.findDuplicates(4);            // [[i, j, distance], ...]
+ *
+ * Only bit-string hashes are meaningful here; RadialVarianceHash and
+ * ColorMomentHash are compared by correlation / L2 and need compare().
+ */
+
+const MAGIC = 'OCVHIDX1';
+const CHUNK_BITS = 16;
+
+// Set bits per byte value
+const POPCOUNT = new Uint8Array(256);
+for (let i = 1; i < 256; i++) POPCOUNT[i] = (i & 1) + POPCOUNT[i >> 1];
+
+// XOR masks of `bits` width with exactly `weight` bits set, keyed "bits:weight"
+const maskCache = new Map();
+
+function masksOfWeight(bits, weight) {
+    const key = `${bits}:${weight}`;
+    let masks = maskCache.get(key);
+    if (!masks) {
+        masks = [];
+        const visit = (start, left, mask) => {
+            if (left === 0) {
+                masks.push(mask);
+                return;
+            }
+            for (let bit = start; bit <= bits - left; bit++) {
+                visit(bit + 1, left - 1, mask | (1 << bit));
+            }
+        };
+        visit(0, weight, 0);
+        maskCache.set(key, masks);
+    }
+    return masks;
+}
+
+/**
+ * Hash every image with one img_hash algorithm
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @param {Object} algorithm - e.g. new cv.PHash()
+ * @param {Object|Object[]} images - MatVector or array of Mats
+ * @returns {Object} { hashes: Uint8Array(count * hashBytes), hashBytes, count }
+ */
+function computeHashes(cv, algorithm, images) {
+    const count = Array.isArray(images) ? images.length : images.size();
+    const hash = new cv.Mat();
+    let hashes = null;
+    let hashBytes = 0;
+    try {
+        for (let i = 0; i < count; i++) {
+            if (Array.isArray(images)) {
+                algorithm.compute(images[i], hash);
+            } else {
+                // MatVector.get() returns a new handle that needs its own delete()
+                const image = images.get(i);
+                try {
+                    algorithm.compute(image, hash);
+                } finally {
+                    image.delete();
+                }
+            }
+            if (i === 0) {
+                hashBytes = hash.data.length;
+                hashes = new Uint8Array(count * hashBytes);
+            } else if (hash.data.length !== hashBytes) {
+                throw new RangeError(`computeHashes: hash ${i} has ${hash.data.length} bytes, expected ${hashBytes}`);
+            }
+            hashes.set(hash.data, i * hashBytes);
+        }
+    } finally {
+        hash.delete();
+    }
+    return { hashes: hashes || new Uint8Array(0), hashBytes, count };
+}
+
+/**
+ * Bytes of one hash from a Uint8Array / Buffer / hash Mat
+ */
+function hashData(hash, hashBytes) {
+    const data = hash && typeof hash.type === 'function' && hash.data ? hash.data : hash;
+    const bytes = ArrayBuffer.isView(data)
+        ? new Uint8Array(data.buffer, data.byteOffset, data.byteLength)
+        : Uint8Array.from(data);
+    if (bytes.length !== hashBytes) {
+        throw new RangeError(`Expected a ${hashBytes}-byte hash, got ${bytes.length} bytes`);
+    }
+    return bytes;
+}
+
+/**
+ * Create a multi-index hashing index over fixed-size binary hashes
+ * @param {Object} options - Configuration options
+ * @param {number} options.hashBytes - Bytes per hash (8 for AverageHash / PHash, 32 for BlockMeanHash)
+ * @param {number} options.capacity - Hashes to allocate room for up front (default: 1024)
+ * @returns {Object} Index with add(), radiusSearch(), knnSearch(), findDuplicates(), serialize()
+ */
+function createHashIndex(options = {}) {
+    const { hashBytes } = options;
+    if (!Number.isInteger(hashBytes) || hashBytes <= 0) {
+        throw new TypeError('createHashIndex: hashBytes must be a positive integer');
+    }
+    const chunkCount = Math.ceil(hashBytes / 2);
+    const chunkBits = c => (c * 2 + 1 < hashBytes ? CHUNK_BITS : 8);
+    // tables[c][key] -> array of hash indices whose chunk c equals key
+    const tables = Array.from({ length: chunkCount }, (_, c) => new Array(1 << chunkBits(c)));
+    const labels = [];
+
+    let hashes = new Uint8Array(Math.max(1, options.capacity || 1024) * hashBytes);
+    let count = 0;
+    // Per-query "seen" stamps, so candidates found through several chunks are checked once
+    let seen = new Uint32Array(hashes.length / hashBytes);
+    let stamp = 0;
+
+    const chunkOf = (bytes, offset, c) => (chunkBits(c) === CHUNK_BITS
+        ? bytes[offset + c * 2] | (bytes[offset + c * 2 + 1] << 8)
+        : bytes[offset + c * 2]);
+
+    const distanceAt = (query, i, limit) => {
+        let distance = 0;
+        const offset = i * hashBytes;
+        for (let b = 0; b < hashBytes; b++) {
+            distance += POPCOUNT[query[b] ^ hashes[offset + b]];
+            if (distance > limit) break;
+        }
+        return distance;
+    };
+
+    const grow = (needed) => {
+        if (needed * hashBytes <= hashes.length) return;
+        let capacity = hashes.length / hashBytes;
+        while (capacity < needed) capacity *= 2;
+        const next = new Uint8Array(capacity * hashBytes);
+        next.set(hashes.subarray(0, count * hashBytes));
+        hashes = next;
+        const nextSeen = new Uint32Array(capacity);
+        nextSeen.set(seen);
+        seen = nextSeen;
+    };
+
+    const insert = (i) => {
+        const offset = i * hashBytes;
+        for (let c = 0; c < chunkCount; c++) {
+            const key = chunkOf(hashes, offset, c);
+            const bucket = tables[c][key];
+            if (bucket) bucket.push(i);
+            else tables[c][key] = [i];
+        }
+    };
+
+    const nextStamp = () => {
+        if (++stamp === 0xffffffff) {
+            seen.fill(0);
+            stamp = 1;
+        }
+        return stamp;
+    };
+
+    /**
+     * Probe every chunk bucket at exactly `weight` bits from the query's chunks
+     * and hand unseen candidates within `limit` to visit(i, distance)
+     */
+    const probe = (query, weight, limit, current, visit) => {
+        for (let c = 0; c < chunkCount; c++) {
+            const bits = chunkBits(c);
+            if (weight > bits) continue;
+            const key = chunkOf(query, 0, c);
+            for (const mask of masksOfWeight(bits, weight)) {
+                const bucket = tables[c][key ^ mask];
+                if (!bucket) continue;
+                for (let j = 0; j < bucket.length; j++) {
+                    const i = bucket[j];
+                    if (seen[i] === current) continue;
+                    seen[i] = current;
+                    const distance = distanceAt(query, i, limit);
+                    if (distance <= limit) visit(i, distance);
+                }
+            }
+        }
+    };
+
+    const result = (i, distance) => ({ index: i, label: labels[i], distance });
+    const byDistance = (a, b) => a.distance - b.distance || a.index - b.index;
+
+    const index = {
+        get hashBytes() {
+            return hashBytes;
+        },
+
+        get size() {
+            return count;
+        },
+
+        /**
+         * Add hashes
+         * @param {Uint8Array|Object} packed - count * hashBytes bytes (as from computeHashes) or one hash Mat
+         * @param {Array} hashLabels - Label per hash (default: its index)
+         * @returns {number} Index of the first added hash
+         */
+        add(packed, hashLabels) {
+            const data = packed && typeof packed.type === 'function' && packed.data ? packed.data : packed;
+            const bytes = ArrayBuffer.isView(data)
+                ? new Uint8Array(data.buffer, data.byteOffset, data.byteLength)
+                : Uint8Array.from(data);
+            if (bytes.length % hashBytes !== 0) {
+                throw new RangeError(`add: ${bytes.length} bytes is not a multiple of the ${hashBytes}-byte hash size`);
+            }
+            const added = bytes.length / hashBytes;
+            if (hashLabels && hashLabels.length !== added) {
+                throw new RangeError(`add: ${added} hashes but ${hashLabels.length} labels`);
+            }
+            const first = count;
+            grow(count + added);
+            hashes.set(bytes, count * hashBytes);
+            for (let k = 0; k < added; k++) {
+                labels.push(hashLabels ? hashLabels[k] : first + k);
+                insert(first + k);
+            }
+            count += added;
+            return first;
+        },
+
+        /**
+         * Hash at an index (a view into the index's storage)
+         */
+        hashAt(i) {
+            return hashes.subarray(i * hashBytes, (i + 1) * hashBytes);
+        },
+
+        labelAt(i) {
+            return labels[i];
+        },
+
+        /**
+         * Every hash within a Hamming distance of the query
+         * @param {Uint8Array|Object} hash - Query hash (bytes or hash Mat)
+         * @param {number} radius - Maximum Hamming distance (bits)
+         * @returns {Object[]} { index, label, distance }, nearest first
+         */
+        radiusSearch(hash, radius) {
+            const query = hashData(hash, hashBytes);
+            const found = [];
+            const current = nextStamp();
+            // Pigeonhole: a match within radius is within this many bits on some chunk
+            const chunkRadius = Math.floor(radius / chunkCount);
+            for (let weight = 0; weight <= chunkRadius; weight++) {
+                probe(query, weight, radius, current, (i, distance) => found.push(result(i, distance)));
+            }
+            return found.sort(byDistance);
+        },
+
+        /**
+         * The k nearest hashes to the query
+         * @param {Uint8Array|Object} hash - Query hash (bytes or hash Mat)
+         * @param {number} k - Neighbours to return
+         * @param {number} maxDistance - Stop searching beyond this distance (default: every bit)
+         * @returns {Object[]} { index, label, distance }, nearest first
+         */
+        knnSearch(hash, k, maxDistance = hashBytes * 8) {
+            const query = hashData(hash, hashBytes);
+            const found = [];
+            const current = nextStamp();
+            const maxWeight = Math.min(CHUNK_BITS, Math.floor(maxDistance / chunkCount));
+            for (let weight = 0; weight <= maxWeight; weight++) {
+                probe(query, weight, maxDistance, current, (i, distance) => found.push(result(i, distance)));
+                found.sort(byDistance);
+                if (found.length > k) found.length = k;
+                // Every hash within (weight + 1) * m - 1 bits has now been seen
+                if (found.length === k && found[k - 1].distance < (weight + 1) * chunkCount) break;
+            }
+            return found;
+        },
+
+        /**
+         * Pairs of stored hashes within a Hamming distance of each other
+         * @param {number} radius - Maximum Hamming distance (bits)
+         * @returns {Array[]} [i, j, distance] with i < j
+         */
+        findDuplicates(radius) {
+            const pairs = [];
+            for (let i = 0; i < count; i++) {
+                for (const match of index.radiusSearch(index.hashAt(i), radius)) {
+                    if (match.index > i) pairs.push([i, match.index, match.distance]);
+                }
+            }
+            return pairs;
+        },
+
+        /**
+         * Hashes and labels as bytes (labels must be JSON-serializable)
+         * @returns {Uint8Array}
+         */
+        serialize() {
+            const labelBytes = Buffer.from(JSON.stringify(labels));
+            const header = 8 + 4 * 3;
+            const out = new Uint8Array(header + count * hashBytes + labelBytes.length);
+            const view = new DataView(out.buffer);
+            out.set(Buffer.from(MAGIC, 'latin1'), 0);
+            view.setUint32(8, hashBytes, true);
+            view.setUint32(12, count, true);
+            view.setUint32(16, labelBytes.length, true);
+            out.set(hashes.subarray(0, count * hashBytes), header);
+            out.set(labelBytes, header + count * hashBytes);
+            return out;
+        },
+    };
+    return index;
+}
+
+/**
+ * Rebuild an index saved with index.serialize()
+ * @param {Uint8Array|Buffer} bytes - Serialized index
+ * @returns {Object} Index
+ */
+function loadHashIndex(bytes) {
+    const data = Buffer.from(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    if (data.length < 20 || data.toString('latin1', 0, 8) !== MAGIC) {
+        throw new Error('loadHashIndex: not a serialized hash index');
+    }
+    const hashBytes = data.readUInt32LE(8);
+    const count = data.readUInt32LE(12);
+    const labelLength = data.readUInt32LE(16);
+    const hashesEnd = 20 + count * hashBytes;
+    if (data.length < hashesEnd + labelLength) {
+        throw new Error('loadHashIndex: truncated data');
+    }
+    const labels = JSON.parse(data.toString('utf8', hashesEnd, hashesEnd + labelLength));
+    const index = createHashIndex({ hashBytes, capacity: count });
+    index.add(data.subarray(20, hashesEnd), labels);
+    return index;
+}
+
+/**
+ * Attach cv.computeHashes() (where the build lacks it), cv.createHashIndex()
+ * and cv.loadHashIndex()
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv module
+ */
+function attachImgHashHelpers(cv) {
+    const native = cv.computeHashes;
+    if (typeof native !== 'function') {
+        cv.computeHashes = (algorithm, images) => computeHashes(cv, algorithm, images);
+    } else if (!native.acceptsArrays) {
+        // The native version takes a MatVector; wrap arrays of Mats in one
+        cv.computeHashes = (algorithm, images) => {
+            if (!Array.isArray(images)) return native(algorithm, images);
+            const vector = new cv.MatVector();
+            try {
+                images.forEach(image => vector.push_back(image));
+                return native(algorithm, vector);
+            } finally {
+                vector.delete();
+            }
+        };
+        cv.computeHashes.acceptsArrays = true;
+    }
+    cv.createHashIndex = createHashIndex;
+    cv.loadHashIndex = loadHashIndex;
+    return cv;
+}
+
+module.exports = { attachImgHashHelpers, computeHashes, createHashIndex, loadHashIndex };
@@ -5,13 +5,18 @@
  *
  * Available builds:
  * - Essential (~3MB): Core image processing, fast loading
+ * - Essential + threads: the same modules with pthreads (THREADS=1)
  * - Full (~12MB): All modules including contrib, DNN, threading
+ * - Relaxed SIMD variants of each (RELAXED_SIMD=1)
  *
  * Usage:
  *   // Default export (full build for backwards compatibility)
  *   const cvPromise = require('opencv-contrib-wasm');
  *   const cv = await cvPromise;
  *
+ *   // Smallest build with these modules, fastest instruction set the host runs
+ *   const cv = await require('opencv-contrib-wasm')({ modules: ['imgproc', 'features2d'] });
+ *
  *   // Explicit build selection
  *   const cvEssential = require('opencv-contrib-wasm/essential');
  *   const cvFull = require('opencv-contrib-wasm/full');
@@ -19,28 +24,106 @@
 
 const path = require('path');
 const fs = require('fs');
+const { load, optionsFromEnv } = require('./runtime');
+const { selectBuild } = require('./select');
 
-// Try full build first, fall back to essential if full doesn't exist
 const fullPath = path.join(__dirname, '..', 'dist', 'full', 'opencv.js');
 const essentialPath = path.join(__dirname, '..', 'dist', 'essential', 'opencv.js');
 
-let opencvPath;
+// Loaded instances, keyed by build path and load options
+const instances = new Map();
 
-if (fs.existsSync(fullPath)) {
-    opencvPath = fullPath;
-} else if (fs.existsSync(essentialPath)) {
-    console.warn(
-        'opencv-contrib-wasm: Full build not found, using essential build. ' +
-        'Some features (DNN, contrib modules, threading) may not be available.'
-    );
-    opencvPath = essentialPath;
-} else {
+/**
+ * Canonical JSON for load options (key order ignored), or null when they
+ * hold values JSON cannot tell apart, such as a wasmModule or a callback
+ */
+function optionsKey(value) {
+    if (value === null || ['string', 'number', 'boolean'].includes(typeof value)) return JSON.stringify(value);
+    if (Array.isArray(value)) {
+        const items = value.map(optionsKey);
+        return items.includes(null) ? null : `[${items.join(',')}]`;
+    }
+    const proto = typeof value === 'object' ? Object.getPrototypeOf(value) : undefined;
+    if (proto !== Object.prototype && proto !== null) return null;
+    const fields = [];
+    for (const name of Object.keys(value).sort()) {
+        if (value[name] === undefined) continue;
+        const field = optionsKey(value[name]);
+        if (field === null) return null;
+        fields.push(`${JSON.stringify(name)}:${field}`);
+    }
+    return `{${fields.join(',')}}`;
+}
+
+function instance(opencvPath, loadOptions) {
+    const loadInstance = () => load(opencvPath, { ...optionsFromEnv(), ...loadOptions }).then((cv) => {
+        // Name of the loaded build, e.g. 'essential-threads'
+        cv.build = path.basename(path.dirname(opencvPath));
+        return cv;
+    });
+    const options = optionsKey(loadOptions);
+    // Options that cannot be compared get an instance of their own
+    if (options === null) return loadInstance();
+    const key = `${opencvPath}|${options}`;
+    if (!instances.has(key)) instances.set(key, loadInstance());
+    return instances.get(key);
+}
+
+/**
+ * The build `require('opencv-contrib-wasm')` resolves to when awaited directly:
+ * full if it exists, otherwise essential
+ */
+function defaultPath() {
+    if (fs.existsSync(fullPath)) return fullPath;
+    if (fs.existsSync(essentialPath)) {
+        console.warn(
+            'opencv-contrib-wasm: Full build not found, using essential build. ' +
+            'Some features (DNN, contrib modules, threading) may not be available.'
+        );
+        return essentialPath;
+    }
     throw new Error(
         'OpenCV WASM files not found. Please run "npm run build" first, ' +
         'or install the pre-built package from npm.'
     );
 }
 
-const cvPromise = require(opencvPath);
+/**
+ * Load the smallest build that covers the given modules
+ * @param {Object} options - Selection options (see src/select.js) plus load() options
+ * @param {string[]} options.modules - OpenCV modules used, e.g. ['imgproc', 'features2d']
+ * @param {boolean} options.threads - Require (true) or avoid (false) a threaded build
+ * @param {boolean} options.relaxedSimd - Require (true) or avoid (false) relaxed SIMD (default: when supported)
+ * @param {string} options.build - Load this build under dist/ instead of selecting one
+ * @returns {Promise<Object>} Initialized cv; the same instance for the same build and load options
+ *          (a separate one for each call whose options include a wasmModule or a function)
+ */
+function opencv(options = {}) {
+    const { modules, threads, relaxedSimd, build, ...loadOptions } = options;
+    let selected;
+    try {
+        selected = selectBuild({ modules, threads, relaxedSimd, build, ...loadOptions });
+    } catch (err) {
+        return Promise.reject(err);
+    }
+    return instance(selected.path, loadOptions);
+}
+
+// Awaiting the export itself loads the default build, as before; it is
+// only loaded once something awaits it
+let defaultPromise = null;
+const defaultInstance = () => {
+    if (!defaultPromise) {
+        try {
+            defaultPromise = instance(defaultPath(), {});
+        } catch (err) {
+            defaultPromise = Promise.reject(err);
+        }
+    }
+    return defaultPromise;
+};
+opencv.then = (onFulfilled, onRejected) => defaultInstance().then(onFulfilled, onRejected);
+opencv.catch = onRejected => defaultInstance().catch(onRejected);
+opencv.finally = onFinally => defaultInstance().finally(onFinally);
 
-module.exports = cvPromise;
+module.exports = opencv;
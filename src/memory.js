@@ -0,0 +1,132 @@
+/**
+ * OpenCV.js Memory Statistics and Heap Sizing
+ *
+ * - cv.memoryStats() reports the wasm heap: its size and limit, bytes in
+ *   use and free inside malloc's arena, fragmentation, live Mat buffers and
+ *   their peak. Builds from this package register the allocator counters
+ *   natively (patches/memory_bindings.cpp); other builds report the heap
+ *   size only. With cv.enableLeakTracking() it also counts live objects.
+ * - cv.reserveHeap(bytes) grows the heap once to at least that size, so
+ *   the first large frames do not pay for repeated grow-and-copy steps.
+ *   The freed block stays with malloc for later allocations.
+ * - load(opencvPath, { initialMemory }) / OPENCV_WASM_INITIAL_MEMORY does
+ *   this at load time. Threaded builds, whose memory is created in JS,
+ *   start at that size directly.
+ *
+ * Usage:
+ *   cv.reserveHeap('512MB');
+ *   const { heapSize, inUse, fragmentation, liveMats } = cv.memoryStats();
+ */
+
+const UNITS = { B: 1, KB: 1024, MB: 1024 ** 2, GB: 1024 ** 3 };
+const WASM_PAGE = 65536;
+
+/**
+ * Parse a byte size: a number, or a string such as '256MB' or '2GB'
+ * @param {number|string} size - Size
+ * @returns {number} Bytes
+ */
+function parseBytes(size) {
+    if (typeof size === 'number') return size;
+    const match = /^\s*(\d+(?:\.\d+)?)\s*([KMG]?B)?\s*$/i.exec(String(size));
+    if (!match) {
+        throw new Error(`Invalid memory size '${size}' (expected bytes or e.g. '256MB')`);
+    }
+    return Math.round(Number(match[1]) * UNITS[(match[2] || 'B').toUpperCase()]);
+}
+
+/**
+ * Current size of the wasm memory in bytes, from the heap view
+ * scripts/build.sh exports (null if the build does not export one).
+ * Cheap enough for the profiler to call around every binding.
+ */
+function heapSize(cv) {
+    const heap = cv.HEAPU8 || cv.HEAP8;
+    if (heap) return heap.buffer.byteLength;
+    return cv.wasmMemory ? cv.wasmMemory.buffer.byteLength : null;
+}
+
+/**
+ * Attach cv.memoryStats() and cv.reserveHeap()
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv module
+ */
+function attachMemoryStats(cv) {
+    // Captured before the profiler can wrap it; mallinfo() walks the heap,
+    // so it is only a fallback for builds without a heap view
+    const native = typeof cv.mallocStats === 'function' ? cv.mallocStats : null;
+    const measureHeap = () => {
+        const size = heapSize(cv);
+        return size === null && native ? native().heapSize : size;
+    };
+    let peakInUse = 0;
+
+    /**
+     * Heap and allocator statistics
+     * @returns {Object} { heapSize, heapMax, arena, inUse, free, peakInUse, fragmentation,
+     *                     liveMats, matBytes, peakMatBytes, liveObjects }
+     */
+    cv.memoryStats = () => {
+        const stats = {
+            heapSize: heapSize(cv),
+            heapMax: null,
+            arena: null,
+            inUse: null,
+            free: null,
+            peakInUse: null,
+            fragmentation: null,
+            liveMats: null,
+            matBytes: null,
+            peakMatBytes: null,
+            liveObjects: null,
+        };
+        if (native) {
+            Object.assign(stats, native());
+            peakInUse = Math.max(peakInUse, stats.inUse);
+            stats.peakInUse = peakInUse;
+            // Share of malloc's arena that is free but held in scattered chunks
+            stats.fragmentation = stats.arena > 0 ? stats.free / stats.arena : 0;
+        }
+        if (typeof cv.leakReport === 'function') {
+            try {
+                stats.liveObjects = cv.leakReport().live;
+            } catch (err) {
+                // Leak tracking is not enabled
+            }
+        }
+        return stats;
+    };
+
+    /**
+     * Grow the heap to at least `size` bytes now
+     * @param {number|string} size - Bytes, or e.g. '512MB'
+     * @returns {number} Heap size afterwards
+     */
+    cv.reserveHeap = (size) => {
+        const target = parseBytes(size);
+        const current = measureHeap();
+        if (current === null) {
+            throw new Error('reserveHeap: this build exports no heap view or mallocStats(); rebuild with scripts/build.sh');
+        }
+        if (current >= target) return current;
+        // Blocks that fit in free space do not grow the heap; hold them until it has grown
+        const blocks = [];
+        try {
+            while (measureHeap() < target) {
+                const bytes = Math.ceil((target - measureHeap()) / WASM_PAGE) * WASM_PAGE;
+                const ptr = cv._malloc(bytes);
+                if (!ptr) {
+                    throw new Error(`reserveHeap: could not grow the heap to ${target} bytes`);
+                }
+                blocks.push(ptr);
+            }
+        } finally {
+            blocks.forEach(ptr => cv._free(ptr));
+        }
+        return measureHeap();
+    };
+
+    return cv;
+}
+
+module.exports = { attachMemoryStats, parseBytes, heapSize };
@@ -0,0 +1,126 @@
+/**
+ * OpenCV.js ml Model Persistence and Batched Prediction
+ *
+ * - cv.saveStatModel(model) serializes a trained SVM, RTrees, DTrees,
+ *   Boost, ANN_MLP, KNearest, LogisticRegression, NormalBayesClassifier or
+ *   EM model into a Uint8Array (YAML by default, the layout of
+ *   Algorithm::save()), optionally gzipped.
+ * - cv.loadStatModel(bytes) restores it as its concrete class, so a worker
+ *   loads a model trained once instead of retraining it at startup.
+ * - cv.predictBatch(model, samples) predicts every row of a sample matrix
+ *   (a CV_32F Mat, or a typed array with options.cols) in row blocks spread
+ *   over the pthread pool and returns the responses as a Float32Array.
+ *
+ * Builds from this package register the native parts
+ * (patches/ml_bindings.cpp). Other builds can still use predictBatch(),
+ * which then predicts the whole matrix in one predict() call on this
+ * thread; saving and loading need the native functions.
+ *
+ * Usage:
+ *   svm.train(samples, 0, labels);  // 0: ROW_SAMPLE
+ *   fs.writeFileSync('svm.yml.gz', cv.saveStatModel(svm, { compress: true }));
+ *
+ *   const model = cv.loadStatModel(fs.readFileSync('svm.yml.gz'));   // cv.SVM
+ *   const { responses } = cv.predictBatch(model, features, { cols: 64 });
+ */
+
+const zlib = require('zlib');
+
+const FORMATS = ['yml', 'yaml', 'json', 'xml'];
+
+function isGzip(bytes) {
+    return bytes.length > 2 && bytes[0] === 0x1f && bytes[1] === 0x8b;
+}
+
+function toBytes(data) {
+    if (data instanceof Uint8Array) return data;
+    if (ArrayBuffer.isView(data)) return new Uint8Array(data.buffer, data.byteOffset, data.byteLength);
+    if (data instanceof ArrayBuffer) return new Uint8Array(data);
+    throw new TypeError('Expected a Buffer, typed array or ArrayBuffer');
+}
+
+/**
+ * Attach cv.saveStatModel(), cv.loadStatModel() and cv.predictBatch()
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv module
+ */
+function attachMlHelpers(cv) {
+    const toBuffer = typeof cv.statModelToBuffer === 'function' ? cv.statModelToBuffer : null;
+    const fromBuffer = typeof cv.statModelFromBuffer === 'function' ? cv.statModelFromBuffer : null;
+    let native = typeof cv.predictBatch === 'function' ? cv.predictBatch : null;
+    // Attached before: keep the native function the wrapper was made for
+    if (native && native.acceptsOptions) native = native.native;
+
+    const requireNative = (fn, name) => {
+        if (!fn) {
+            throw new Error(`${name}: this build does not include the ml persistence bindings; rebuild with scripts/build.sh`);
+        }
+        return fn;
+    };
+
+    /**
+     * Serialize a trained model
+     * @param {Object} model - Trained StatModel (cv.SVM, cv.RTrees, cv.ANN_MLP, ...)
+     * @param {Object} options - { format: 'yml' | 'json' | 'xml' (default: 'yml'), compress: gzip the bytes (default: false) }
+     * @returns {Uint8Array} Model bytes
+     */
+    cv.saveStatModel = (model, options = {}) => {
+        const { format = 'yml', compress = false } = options;
+        if (!FORMATS.includes(format)) {
+            throw new Error(`saveStatModel: unknown format '${format}' (expected ${FORMATS.join(', ')})`);
+        }
+        const bytes = requireNative(toBuffer, 'saveStatModel')(model, format);
+        if (!compress) return bytes;
+        const gzipped = zlib.gzipSync(bytes);
+        return new Uint8Array(gzipped.buffer, gzipped.byteOffset, gzipped.byteLength);
+    };
+
+    /**
+     * Restore a model saved with cv.saveStatModel() (or Algorithm::save())
+     * @param {Uint8Array|ArrayBuffer|Buffer} bytes - Model bytes, plain or gzipped
+     * @returns {Object} The model as its concrete class; delete() it when done
+     */
+    cv.loadStatModel = (bytes) => {
+        let data = toBytes(bytes);
+        if (isGzip(data)) data = zlib.gunzipSync(data);
+        return requireNative(fromBuffer, 'loadStatModel')(data);
+    };
+
+    /**
+     * Predict every sample (row) at once
+     * @param {Object} model - Trained StatModel
+     * @param {cv.Mat|Float32Array} samples - One sample per row; a typed array needs options.cols
+     * @param {Object} options - { cols, flags (predict() flags, default: 0), parallel (default: true) }
+     * @returns {Object} { responses: Float32Array(rows * cols), rows, cols }
+     */
+    cv.predictBatch = (model, samples, options = {}) => {
+        const { flags = 0, parallel = true } = options;
+        let input = samples;
+        if (ArrayBuffer.isView(samples)) {
+            const cols = options.cols;
+            if (!(cols > 0) || samples.length % cols !== 0) {
+                throw new RangeError(`predictBatch: ${samples.length} values do not form rows of ${cols} columns`);
+            }
+            input = cv.matFromArray(samples.length / cols, cols, cv.CV_32F, samples);
+        }
+        try {
+            if (native) return native(model, input, flags, parallel);
+            const results = new cv.Mat();
+            try {
+                model.predict(input, results, flags);
+                if (results.type() !== cv.CV_32F) results.convertTo(results, cv.CV_32F);
+                return { responses: results.data32F.slice(), rows: results.rows, cols: results.cols };
+            } finally {
+                results.delete();
+            }
+        } finally {
+            if (input !== samples) input.delete();
+        }
+    };
+    cv.predictBatch.acceptsOptions = true;
+    cv.predictBatch.native = native;
+
+    return cv;
+}
+
+module.exports = { attachMlHelpers };
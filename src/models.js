@@ -0,0 +1,288 @@
+/**
+ * OpenCV.js Model Files (Node.js)
+ *
+ * CascadeClassifier.load, HOGDescriptor.load, Facemark.loadModel, readNet*
+ * and the DNN-based trackers read from the Emscripten filesystem. Copying a
+ * model into MEMFS with FS_createDataFile keeps a second copy of it in JS
+ * memory; these avoid that:
+ *
+ * - cv.mountHost(dir) mounts a host directory with NODEFS, and
+ *   cv.hostFile(path) returns the in-wasm path of a host file (mounting its
+ *   directory on first use). Loaders then read the host file directly.
+ *   Builds from this package link NODEFS (scripts/build.sh).
+ * - cv.withBufferFile(bytes, name, fn) exposes a buffer as a MEMFS file for
+ *   the duration of fn(path). MEMFS takes the buffer as the file contents
+ *   instead of copying it.
+ * - cv.loadNet(source, options) parses a network once per instance and
+ *   returns the cached dnn_Net on later calls with the same file (path,
+ *   size, mtime) or contents (SHA-256, or options.key).
+ *   cv.cachedModel(key, create) does the same for any other model object.
+ * - readModelShared(path) reads a model into a SharedArrayBuffer once per
+ *   process; its bytes can be posted to every pool worker without a copy.
+ *
+ * Usage:
+ *   const classifier = new cv.CascadeClassifier();
+ *   classifier.load(cv.hostFile('models/haarcascade_frontalface_default.xml'));
+ *
+ *   const net = cv.loadNet('models/yolov8n.onnx');    // parsed once per instance
+ *
+ *   const model = readModelShared('models/yolov8n.onnx');
+ *   pool.run(taskPath, { model, image });             // worker: cv.loadNet(input.model)
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const { MODEL_FORMATS } = require('./dnn');
+
+const MOUNT_ROOT = '/host';
+
+// Host file contents in SharedArrayBuffers, keyed like fileKey()
+const sharedModels = new Map();
+
+function toBytes(data) {
+    if (data instanceof Uint8Array) return data;
+    if (ArrayBuffer.isView(data)) return new Uint8Array(data.buffer, data.byteOffset, data.byteLength);
+    if (data instanceof ArrayBuffer || data instanceof SharedArrayBuffer) return new Uint8Array(data);
+    throw new TypeError('Expected a Buffer, typed array or ArrayBuffer');
+}
+
+/**
+ * Cache key of a host file: changes when the file is replaced or modified
+ */
+function fileKey(filePath) {
+    const resolved = fs.realpathSync(filePath);
+    const stat = fs.statSync(resolved);
+    return `file:${resolved}:${stat.size}:${stat.mtimeMs}`;
+}
+
+function contentKey(bytes) {
+    return `sha256:${crypto.createHash('sha256').update(bytes).digest('hex')}`;
+}
+
+/**
+ * Cache key part for a network config: a host path or bytes ('' without one)
+ */
+function configKey(config) {
+    if (config === undefined || config === null || config === '') return '';
+    return typeof config === 'string' ? fileKey(config) : contentKey(toBytes(config));
+}
+
+/**
+ * Read a model file into a SharedArrayBuffer, once per process per file version
+ * @param {string} filePath - Host path
+ * @returns {Object} { key, bytes: Uint8Array over a SharedArrayBuffer, name }
+ */
+function readModelShared(filePath) {
+    const key = fileKey(filePath);
+    let model = sharedModels.get(key);
+    if (!model) {
+        const fd = fs.openSync(filePath, 'r');
+        try {
+            const size = fs.fstatSync(fd).size;
+            const bytes = new Uint8Array(new SharedArrayBuffer(size));
+            let offset = 0;
+            while (offset < size) {
+                const read = fs.readSync(fd, bytes, offset, size - offset, offset);
+                if (read === 0) break;
+                offset += read;
+            }
+            model = { key, bytes, name: path.basename(filePath) };
+        } finally {
+            fs.closeSync(fd);
+        }
+        sharedModels.set(key, model);
+    }
+    return model;
+}
+
+/**
+ * Drop shared model buffers (all, or one file's)
+ * @param {string} filePath - Host path (optional)
+ */
+function releaseSharedModels(filePath) {
+    if (filePath === undefined) {
+        sharedModels.clear();
+        return;
+    }
+    const resolved = fs.realpathSync(filePath);
+    for (const key of sharedModels.keys()) {
+        if (key.startsWith(`file:${resolved}:`)) sharedModels.delete(key);
+    }
+}
+
+/**
+ * Model format from a file name, for readNetFromBuffer
+ */
+function formatOf(name) {
+    const ext = path.extname(name || '').toLowerCase();
+    for (const [format, extensions] of Object.entries(MODEL_FORMATS)) {
+        if (extensions.model === ext) return format;
+    }
+    return undefined;
+}
+
+/**
+ * Attach cv.mountHost(), cv.hostFile(), cv.withBufferFile(), cv.loadNet()
+ * and the per-instance model cache
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv module
+ */
+function attachModelHelpers(cv) {
+    // Host directory (realpath) -> mount point
+    const mounts = new Map();
+    // Parsed models of this instance, keyed by file / content key
+    const models = new Map();
+    let bufferCounter = 0;
+    let mountCounter = 0;
+
+    const findNodefs = () => {
+        const FS = cv.FS;
+        return (FS && FS.filesystems && FS.filesystems.NODEFS) || cv.NODEFS;
+    };
+    const hasNodefs = () => Boolean(cv.FS && findNodefs());
+
+    const nodefs = () => {
+        const FS = cv.FS;
+        const NODEFS = findNodefs();
+        if (!FS || !NODEFS) {
+            throw new Error('This build does not include NODEFS; rebuild with scripts/build.sh or use cv.withBufferFile()');
+        }
+        return { FS, NODEFS };
+    };
+
+    const mkdirs = (FS, dir) => {
+        let current = '';
+        for (const part of dir.split('/').filter(Boolean)) {
+            current += `/${part}`;
+            if (!FS.analyzePath(current).exists) FS.mkdir(current);
+        }
+    };
+
+    /**
+     * Mount a host directory into the Emscripten filesystem
+     * @param {string} hostDir - Host directory
+     * @param {string} mountPoint - In-wasm directory (default: /host/<n>)
+     * @returns {string} The mount point
+     */
+    cv.mountHost = (hostDir, mountPoint) => {
+        const root = fs.realpathSync(hostDir);
+        if (mounts.has(root)) return mounts.get(root);
+        const { FS, NODEFS } = nodefs();
+        const target = mountPoint || `${MOUNT_ROOT}/${mountCounter++}`;
+        mkdirs(FS, target);
+        FS.mount(NODEFS, { root }, target);
+        mounts.set(root, target);
+        return target;
+    };
+
+    /**
+     * Unmount a directory mounted with cv.mountHost()
+     * @param {string} hostDirOrMountPoint - Host directory or its mount point
+     */
+    cv.unmountHost = (hostDirOrMountPoint) => {
+        const hostDir = fs.existsSync(hostDirOrMountPoint) ? fs.realpathSync(hostDirOrMountPoint) : null;
+        for (const [root, target] of mounts) {
+            if (target === hostDirOrMountPoint || root === hostDir) {
+                cv.FS.unmount(target);
+                mounts.delete(root);
+                return;
+            }
+        }
+    };
+
+    /**
+     * In-wasm path of a host file, mounting its directory if needed
+     * @param {string} hostPath - Host file path
+     * @returns {string} Path for CascadeClassifier.load(), readNet(), ...
+     */
+    cv.hostFile = (hostPath) => {
+        const resolved = fs.realpathSync(hostPath);
+        const dir = path.dirname(resolved);
+        return `${cv.mountHost(dir)}/${path.basename(resolved)}`;
+    };
+
+    /**
+     * Expose a buffer as a MEMFS file while fn runs
+     * @param {Uint8Array|ArrayBuffer|Buffer} bytes - File contents (owned by MEMFS until fn returns)
+     * @param {string} name - File name; loaders pick the format from its extension
+     * @param {Function} fn - (path) => result
+     * @returns {*} fn's result
+     */
+    cv.withBufferFile = (bytes, name, fn) => {
+        if (typeof cv.FS_createDataFile !== 'function') {
+            throw new Error('withBufferFile: this build does not export the virtual filesystem');
+        }
+        const file = `buffer_${bufferCounter++}_${path.basename(name)}`;
+        // canOwn: MEMFS keeps the caller's bytes as the file contents
+        cv.FS_createDataFile('/', file, toBytes(bytes), true, false, true);
+        try {
+            return fn(`/${file}`);
+        } finally {
+            cv.FS_unlink(`/${file}`);
+        }
+    };
+
+    /**
+     * Return the model cached under key, or create and cache it
+     * @param {string} key - Cache key
+     * @param {Function} create - () => model object
+     * @returns {*} The cached model (owned by the cache; see cv.releaseModel)
+     */
+    cv.cachedModel = (key, create) => {
+        if (!models.has(key)) models.set(key, create());
+        return models.get(key);
+    };
+
+    /**
+     * Delete cached models (all, or the one under key)
+     * @param {string} key - Cache key (optional)
+     */
+    cv.releaseModel = (key) => {
+        const keys = key === undefined ? [...models.keys()] : [key];
+        for (const k of keys) {
+            const model = models.get(k);
+            if (model && typeof model.delete === 'function') model.delete();
+            models.delete(k);
+        }
+    };
+
+    cv.cachedModelKeys = () => [...models.keys()];
+
+    /**
+     * Load a network, parsing each model once per instance
+     * @param {string|Object|Uint8Array} source - Host path, { key, bytes, name } from
+     *        readModelShared(), or model bytes
+     * @param {Object} options - { format, config (host path or bytes), key }
+     * @returns {cv.dnn_Net} Cached network (owned by the cache; see cv.releaseModel)
+     */
+    cv.loadNet = (source, options = {}) => {
+        if (typeof source === 'string') {
+            const config = options.config;
+            const key = options.key || `${fileKey(source)}|${configKey(config)}`;
+            return cv.cachedModel(key, () => {
+                if (hasNodefs() && (config === undefined || typeof config === 'string')) {
+                    return cv.readNet(cv.hostFile(source), config ? cv.hostFile(config) : '');
+                }
+                return cv.readNetFromBuffer(fs.readFileSync(source), {
+                    format: options.format || formatOf(source),
+                    config: typeof config === 'string' ? fs.readFileSync(config) : config,
+                });
+            });
+        }
+
+        const shared = source && source.bytes && !ArrayBuffer.isView(source);
+        const bytes = shared ? source.bytes : source;
+        const modelKey = (shared && source.key) || contentKey(toBytes(bytes));
+        // Nets sharing a model file but not a config are cached apart
+        const key = options.key || (options.config ? `${modelKey}|${configKey(options.config)}` : modelKey);
+        return cv.cachedModel(key, () => cv.readNetFromBuffer(bytes, {
+            format: options.format || formatOf(shared && source.name) || 'onnx',
+            config: options.config,
+        }));
+    };
+
+    return cv;
+}
+
+module.exports = { attachModelHelpers, readModelShared, releaseSharedModels, fileKey, MOUNT_ROOT };
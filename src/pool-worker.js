@@ -0,0 +1,87 @@
+/**
+ * OpenCV.js Worker Pool - worker thread
+ *
+ * Loads its own OpenCV instance from the WebAssembly.Module compiled by
+ * src/pool.js, then runs tasks:
+ *   { id, source | module, input }  ->  { id, result } | { id, error }
+ */
+
+const { parentPort, workerData } = require('worker_threads');
+const { load } = require('./runtime');
+const { collectTransferables } = require('./pool');
+
+// Compiled task functions, keyed by source text or module path
+const tasks = new Map();
+
+function resolveTask(source, module) {
+    const key = source !== null ? source : module;
+    let fn = tasks.get(key);
+    if (!fn) {
+        fn = source !== null
+            ? new Function(`return (${source});`)()
+            : require(module);
+        if (fn && typeof fn.default === 'function') fn = fn.default;
+        if (typeof fn !== 'function') {
+            throw new TypeError(`Task ${module || 'source'} is not a function`);
+        }
+        tasks.set(key, fn);
+    }
+    return fn;
+}
+
+function createHelpers(cv) {
+    return {
+        /**
+         * Copy { rows, cols, type, data } into a new Mat (caller deletes it)
+         */
+        toMat({ rows, cols, type, data }) {
+            const mat = new cv.Mat(rows, cols, type);
+            mat.data.set(new Uint8Array(data.buffer || data, data.byteOffset || 0, mat.data.length));
+            return mat;
+        },
+
+        /**
+         * Copy a Mat out of the wasm heap as { rows, cols, type, data }
+         */
+        fromMat(mat) {
+            return {
+                rows: mat.rows,
+                cols: mat.cols,
+                type: mat.type(),
+                data: new Uint8Array(mat.data),
+            };
+        },
+    };
+}
+
+function serializeError(err) {
+    return err instanceof Error
+        ? { message: err.message, stack: err.stack }
+        : { message: String(err) };
+}
+
+load(workerData.opencvPath, { ...workerData.loadOptions, wasmModule: workerData.wasmModule })
+    .then((cv) => {
+        const helpers = createHelpers(cv);
+
+        parentPort.on('message', async ({ id, source, module, input }) => {
+            let result;
+            try {
+                result = await resolveTask(source, module)(cv, input, helpers);
+            } catch (err) {
+                parentPort.postMessage({ id, error: serializeError(err) });
+                return;
+            }
+            try {
+                parentPort.postMessage({ id, result }, collectTransferables(result));
+            } catch (err) {
+                // e.g. a view on the wasm heap; copy it out with fromMat()
+                parentPort.postMessage({ id, error: serializeError(err) });
+            }
+        });
+        parentPort.postMessage({ ready: true });
+    })
+    .catch((err) => {
+        parentPort.postMessage({ error: serializeError(err) });
+        parentPort.close();
+    });
@@ -0,0 +1,262 @@
+/**
+ * OpenCV.js Worker Pool (Node.js)
+ *
+ * Runs OpenCV work on N worker_threads, each with its own OpenCV instance,
+ * so one process can use every core for batch jobs. The wasm is compiled
+ * once on the calling thread and the WebAssembly.Module is handed to each
+ * worker, so workers only pay for instantiation and runtime init.
+ *
+ * A task is a function `(cv, input, helpers) => result` (serialized with
+ * toString, so it cannot close over variables) or the path of a module
+ * exporting one. Image data travels as plain { rows, cols, type, data }
+ * objects: ArrayBuffers in results are always transferred, input buffers
+ * are transferred with { transfer: true }, and SharedArrayBuffers are
+ * shared as-is.
+ *
+ * Usage:
+ *   const cv = await require('opencv-contrib-wasm');
+ *   const pool = cv.createPool({ size: 4 });
+ *
+ *   const edges = await pool.run((cv, image, { toMat, fromMat }) => {
+ *       const src = toMat(image);
+ *       const dst = new cv.Mat();
+ *       cv.Canny(src, dst, 50, 150);
+ *       const result = fromMat(dst);
+ *       src.delete(); dst.delete();
+ *       return result;
+ *   }, { rows, cols, type: cv.CV_8UC1, data }, { transfer: true });
+ *
+ *   await pool.close();
+ */
+
+const os = require('os');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const { compileWasm, WASM_FILE } = require('./runtime');
+
+const WORKER_SCRIPT = path.join(__dirname, 'pool-worker.js');
+
+/**
+ * ArrayBuffers reachable from a message value (typed arrays, plain objects, arrays)
+ * @param {*} value - Message value
+ * @param {Set<ArrayBuffer>} found - Accumulator
+ * @returns {ArrayBuffer[]}
+ */
+function collectTransferables(value, found = new Set()) {
+    if (value instanceof ArrayBuffer) {
+        found.add(value);
+    } else if (ArrayBuffer.isView(value)) {
+        if (value.buffer instanceof ArrayBuffer) found.add(value.buffer);
+    } else if (Array.isArray(value)) {
+        for (const item of value) collectTransferables(item, found);
+    } else if (value !== null && typeof value === 'object' &&
+        Object.getPrototypeOf(value) === Object.prototype) {
+        for (const key of Object.keys(value)) collectTransferables(value[key], found);
+    }
+    return [...found];
+}
+
+/**
+ * Create a pool of worker threads running OpenCV.js
+ * @param {Object} options - Configuration options
+ * @param {string} options.opencvPath - Path to dist/<build>/opencv.js
+ * @param {number} options.size - Number of workers (default: os.cpus().length)
+ * @param {Object} options.loadOptions - Options passed to runtime.load() in each worker
+ * @returns {Object} Pool with run(), map(), close() and a ready promise
+ */
+function createPool(options = {}) {
+    const {
+        opencvPath,
+        size = os.cpus().length,
+        loadOptions = {},
+    } = options;
+
+    if (!opencvPath) {
+        throw new Error('createPool: opencvPath is required (or use cv.createPool())');
+    }
+    if (!Number.isInteger(size) || size < 1) {
+        throw new Error(`createPool: size must be a positive integer, got ${size}`);
+    }
+
+    const workers = [];
+    const idle = [];
+    const queue = [];
+    let nextId = 1;
+    let closed = false;
+    let failure = null;
+
+    const wasmModule = compileWasm(path.join(path.dirname(opencvPath), WASM_FILE), true, {});
+
+    const dispatch = () => {
+        while (idle.length && queue.length) {
+            const slot = idle.pop();
+            const task = queue.shift();
+            slot.task = task;
+            try {
+                slot.worker.postMessage(
+                    { id: task.id, source: task.source, module: task.module, input: task.input },
+                    task.transfer ? collectTransferables(task.input) : []
+                );
+            } catch (err) {
+                slot.task = null;
+                idle.push(slot);
+                task.reject(err);
+            }
+        }
+    };
+
+    const spawn = (module) => {
+        const slot = { worker: null, task: null, loaded: false };
+        const worker = new Worker(WORKER_SCRIPT, {
+            workerData: { opencvPath, wasmModule: module, loadOptions },
+        });
+        slot.worker = worker;
+
+        slot.ready = new Promise((resolve, reject) => {
+            // A worker that throws or exits before posting also fails to load
+            slot.failLoad = reject;
+            worker.once('message', (message) => {
+                if (message.error) {
+                    reject(new Error(`OpenCV worker failed to load: ${message.error.message}`));
+                    return;
+                }
+                slot.loaded = true;
+                worker.on('message', ({ id, result, error }) => {
+                    const task = slot.task;
+                    if (!task || task.id !== id) return;
+                    slot.task = null;
+                    idle.push(slot);
+                    if (error) {
+                        const err = new Error(error.message);
+                        err.stack = error.stack;
+                        task.reject(err);
+                    } else {
+                        task.resolve(result);
+                    }
+                    dispatch();
+                });
+                idle.push(slot);
+                resolve();
+                dispatch();
+            });
+        });
+        // Load failures surface through pool.ready
+        slot.ready.catch(() => {});
+
+        worker.on('error', (err) => {
+            if (!slot.loaded) slot.failLoad(new Error(`OpenCV worker failed to load: ${err.message}`));
+            // An uncaught error kills the worker: fail its task and replace it
+            if (slot.task) slot.task.reject(err);
+            slot.task = null;
+        });
+        worker.on('exit', (code) => {
+            if (!slot.loaded) slot.failLoad(new Error(`OpenCV worker exited with code ${code} before loading`));
+            const index = workers.indexOf(slot);
+            if (index !== -1) workers.splice(index, 1);
+            const idleIndex = idle.indexOf(slot);
+            if (idleIndex !== -1) idle.splice(idleIndex, 1);
+            if (slot.task) {
+                slot.task.reject(new Error('OpenCV worker exited'));
+                slot.task = null;
+            }
+            // Only replace workers that had loaded, so a broken build cannot respawn forever
+            if (!closed && slot.loaded) {
+                workers.push(spawn(module));
+            }
+        });
+        return slot;
+    };
+
+    const ready = wasmModule.then((module) => {
+        for (let i = 0; i < size; i++) {
+            workers.push(spawn(module));
+        }
+        return Promise.all(workers.map(slot => slot.ready));
+    });
+    ready.catch((err) => {
+        failure = err;
+        while (queue.length) queue.shift().reject(err);
+    });
+    const poolReady = ready.then(() => pool);
+    // Callers that never await pool.ready still see the error on run()
+    poolReady.catch(() => {});
+
+    const pool = {
+        size,
+
+        /** Resolves once every worker has loaded OpenCV */
+        ready: poolReady,
+
+        /**
+         * Run a task on the next free worker
+         * @param {Function|string} task - (cv, input, helpers) => result, or path of a module exporting one
+         * @param {*} input - Structured-cloneable task input
+         * @param {Object} runOptions - Options
+         * @param {boolean} runOptions.transfer - Transfer input ArrayBuffers instead of copying them
+         * @returns {Promise<*>} Task result
+         */
+        run(task, input, runOptions = {}) {
+            if (closed) {
+                return Promise.reject(new Error('Pool is closed'));
+            }
+            if (failure) {
+                return Promise.reject(failure);
+            }
+            let source = null;
+            let module = null;
+            if (typeof task === 'function') {
+                source = task.toString();
+            } else if (typeof task === 'string') {
+                module = path.resolve(task);
+            } else {
+                return Promise.reject(new TypeError('Task must be a function or a module path'));
+            }
+            return new Promise((resolve, reject) => {
+                queue.push({
+                    id: nextId++,
+                    source,
+                    module,
+                    input,
+                    transfer: runOptions.transfer === true,
+                    resolve,
+                    reject,
+                });
+                dispatch();
+            });
+        },
+
+        /**
+         * Run the same task over many inputs
+         * @param {Function|string} task - Task, as for run()
+         * @param {Array} inputs - Task inputs
+         * @param {Object} runOptions - Options, as for run()
+         * @returns {Promise<Array>} Results in input order
+         */
+        map(task, inputs, runOptions = {}) {
+            return Promise.all(inputs.map(input => pool.run(task, input, runOptions)));
+        },
+
+        /**
+         * Number of tasks waiting for a worker
+         * @returns {number}
+         */
+        pending() {
+            return queue.length;
+        },
+
+        /**
+         * Terminate all workers; queued and running tasks are rejected
+         * @returns {Promise<void>}
+         */
+        async close() {
+            if (closed) return;
+            closed = true;
+            while (queue.length) queue.shift().reject(new Error('Pool is closed'));
+            await Promise.all(workers.map(slot => slot.worker.terminate()));
+        },
+    };
+
+    return pool;
+}
+
+module.exports = { createPool, collectTransferables };
@@ -0,0 +1,262 @@
+/**
+ * OpenCV.js Call Profiler
+ *
+ * Wraps every embind function, class constructor, static function and
+ * class method on a cv module and records, per binding: call count, wall
+ * time (total, self and max), bytes of Mat / typed array arguments and
+ * wasm memory growth. Calls can also be kept as events and exported as a
+ * Chrome trace (chrome://tracing, Perfetto) with nested calls shown as
+ * nested slices.
+ *
+ * Opt-in, as instrumentation costs a few microseconds per call:
+ *   OPENCV_WASM_PROFILE=profile.json node app.js      (Node entry points)
+ *   load(opencvPath, { profile: { output: 'profile.json' } })
+ *
+ * or on an already loaded module:
+ *   const { createProfiler } = require('opencv-contrib-wasm/profiler');
+ *   const profiler = createProfiler(cv);
+ *   // ... run the workload ...
+ *   console.table(profiler.summary().slice(0, 10));
+ *   profiler.save('profile.json');   // Chrome trace with the summary in metadata
+ *   profiler.stop();
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { performance } = require('perf_hooks');
+const { heapSize } = require('./memory');
+const {
+    CLASS_HANDLE_METHODS,
+    isRuntimeExport,
+    isEmbindClass,
+    isEmbindFunction,
+    isEmbindObject,
+    classPrototypes,
+} = require('./bindings');
+
+/**
+ * Bytes of data passed in Mat and typed array arguments
+ */
+function argumentBytes(args) {
+    let bytes = 0;
+    for (const arg of args) {
+        if (ArrayBuffer.isView(arg)) {
+            bytes += arg.byteLength;
+        } else if (isEmbindObject(arg) && typeof arg.elemSize === 'function' && typeof arg.rows === 'number') {
+            try {
+                bytes += arg.rows * arg.cols * arg.elemSize();
+            } catch (err) {
+                // Deleted Mat: the binding call itself will throw
+            }
+        }
+    }
+    return bytes;
+}
+
+/**
+ * Output path for this thread: pool and pipeline workers write
+ * profile.worker<threadId>.json next to the main thread's profile.json
+ */
+function threadOutput(file) {
+    const { isMainThread, threadId } = require('worker_threads');
+    if (isMainThread) return file;
+    const ext = path.extname(file);
+    return `${file.slice(0, file.length - ext.length)}.worker${threadId}${ext}`;
+}
+
+/**
+ * Instrument an initialized cv module and profile binding calls
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @param {Object} options - Configuration options
+ * @param {string} options.output - Trace file path for save() (default: 'opencv-profile.json'; workers add .worker<threadId>)
+ * @param {boolean} options.saveOnExit - Write the trace when the process exits (default: true when output is set)
+ * @param {boolean} options.events - Keep per-call events for the Chrome trace (default: true)
+ * @param {number} options.maxEvents - Events to keep; later calls are only summarized (default: 200000)
+ * @returns {Object} Profiler with summary(), chromeTrace(), save(), reset() and stop()
+ */
+function createProfiler(cv, options = {}) {
+    const {
+        saveOnExit = options.output !== undefined,
+        events: keepEvents = true,
+        maxEvents = 200000,
+    } = options;
+
+    const output = threadOutput(options.output || 'opencv-profile.json');
+    const stats = new Map();
+    const restore = [];
+    const wrappedPrototypes = new WeakSet();
+    const stack = [];
+    let events = [];
+    let droppedEvents = 0;
+    let origin = performance.now();
+    // Set while argument sizes are read, so Mat.elemSize() & co. are not recorded
+    let measuring = false;
+
+    const statsFor = (name) => {
+        let entry = stats.get(name);
+        if (!entry) {
+            entry = { calls: 0, totalMs: 0, selfMs: 0, maxMs: 0, inputBytes: 0, heapGrowth: 0 };
+            stats.set(name, entry);
+        }
+        return entry;
+    };
+
+    const profiled = (name, call) => {
+        if (measuring) return call.run();
+        measuring = true;
+        let inputBytes;
+        try {
+            inputBytes = call.bytes();
+        } finally {
+            measuring = false;
+        }
+        const frame = { childMs: 0 };
+        stack.push(frame);
+        const heapBefore = heapSize(cv);
+        const start = performance.now();
+        try {
+            return call.run();
+        } finally {
+            const end = performance.now();
+            const ms = end - start;
+            stack.pop();
+            if (stack.length) stack[stack.length - 1].childMs += ms;
+            const heapAfter = heapSize(cv);
+            const growth = heapBefore === null ? 0 : heapAfter - heapBefore;
+
+            const entry = statsFor(name);
+            entry.calls++;
+            entry.totalMs += ms;
+            entry.selfMs += ms - frame.childMs;
+            if (ms > entry.maxMs) entry.maxMs = ms;
+            entry.inputBytes += inputBytes;
+            entry.heapGrowth += growth;
+
+            if (keepEvents) {
+                if (events.length < maxEvents) {
+                    events.push({ name, start: start - origin, ms, inputBytes, growth, depth: stack.length });
+                } else {
+                    droppedEvents++;
+                }
+            }
+        }
+    };
+
+    const wrapFunction = (owner, key, name) => {
+        const original = owner[key];
+        owner[key] = new Proxy(original, {
+            apply(target, thisArg, args) {
+                return profiled(name, {
+                    bytes: () => argumentBytes(args),
+                    run: () => Reflect.apply(target, thisArg, args),
+                });
+            },
+        });
+        restore.push(() => { owner[key] = original; });
+    };
+
+    const wrapPrototype = (proto) => {
+        if (wrappedPrototypes.has(proto)) return;
+        wrappedPrototypes.add(proto);
+
+        const className = proto.constructor.name;
+        for (const key of Object.getOwnPropertyNames(proto)) {
+            if (CLASS_HANDLE_METHODS.has(key)) continue;
+            const descriptor = Object.getOwnPropertyDescriptor(proto, key);
+            if (!descriptor || typeof descriptor.value !== 'function') continue;
+            wrapFunction(proto, key, `${className}.${key}`);
+        }
+    };
+
+    for (const name of Object.keys(cv)) {
+        if (isRuntimeExport(name)) continue;
+        const original = cv[name];
+
+        if (isEmbindClass(original)) {
+            classPrototypes(original).forEach(wrapPrototype);
+            for (const key of Object.getOwnPropertyNames(original)) {
+                if (isEmbindFunction(original[key])) wrapFunction(original, key, `${name}.${key}`);
+            }
+            cv[name] = new Proxy(original, {
+                construct(target, args, newTarget) {
+                    return profiled(`new ${name}`, {
+                        bytes: () => argumentBytes(args),
+                        run: () => Reflect.construct(target, args, newTarget),
+                    });
+                },
+            });
+            restore.push(() => { cv[name] = original; });
+        } else if (isEmbindFunction(original)) {
+            wrapFunction(cv, name, name);
+        }
+    }
+
+    const profiler = {
+        /**
+         * Per-binding totals, slowest (total time) first
+         * @returns {Object[]} { name, calls, totalMs, selfMs, meanMs, maxMs, inputBytes, heapGrowth }
+         */
+        summary() {
+            return [...stats]
+                .map(([name, entry]) => ({ name, ...entry, meanMs: entry.totalMs / entry.calls }))
+                .sort((a, b) => b.totalMs - a.totalMs);
+        },
+
+        /**
+         * Recorded calls in the Chrome trace event format
+         * @returns {Object} { traceEvents, displayTimeUnit, metadata }
+         */
+        chromeTrace() {
+            const pid = process.pid;
+            const tid = require('worker_threads').threadId;
+            const traceEvents = events.map(event => ({
+                name: event.name,
+                cat: 'opencv',
+                ph: 'X',
+                ts: event.start * 1000,
+                dur: event.ms * 1000,
+                pid,
+                tid,
+                args: { inputBytes: event.inputBytes, heapGrowth: event.growth, depth: event.depth },
+            }));
+            return {
+                traceEvents,
+                displayTimeUnit: 'ms',
+                metadata: { summary: profiler.summary(), droppedEvents },
+            };
+        },
+
+        /**
+         * Write the Chrome trace (with the summary in its metadata) as JSON
+         * @param {string} file - Output path (default: options.output)
+         */
+        save(file = output) {
+            fs.writeFileSync(file, JSON.stringify(profiler.chromeTrace()) + '\n');
+        },
+
+        /**
+         * Clear the statistics and events recorded so far
+         */
+        reset() {
+            stats.clear();
+            events = [];
+            droppedEvents = 0;
+            origin = performance.now();
+        },
+
+        /**
+         * Remove all instrumentation and restore the original bindings
+         */
+        stop() {
+            while (restore.length) restore.pop()();
+            if (saveOnExit) process.removeListener('exit', onExit);
+        },
+    };
+
+    const onExit = () => profiler.save();
+    if (saveOnExit) process.on('exit', onExit);
+
+    return profiler;
+}
+
+module.exports = { createProfiler, heapSize };
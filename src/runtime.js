@@ -0,0 +1,267 @@
+/**
+ * OpenCV.js Runtime Loader (Node.js)
+ *
+ * Instantiates a dist/<build>/opencv.js with an Emscripten Module object so
+ * the entry points can take over wasm compilation. This enables:
+ *
+ * - A compiled-module cache: the WebAssembly.Module is compiled once per
+ *   process, keyed by the SHA-256 of opencv_js.wasm, and reused by every
+ *   later instance in the process (and handed to worker threads).
+ * - Lazy compilation: V8 compiles each wasm function on first call instead
+ *   of the whole 12MB binary up front, which is the main cold-start cost of
+ *   short-lived workers. Node has no public API to persist compiled wasm to
+ *   disk, so this is the cross-process cold-start option.
+ * - A startup report splitting load time into read, compile, instantiate
+ *   and runtime-init phases.
+ * - cv.createPool(), a worker_threads pool running the same build
+ *   (see src/pool.js).
+ * - Heap buffers, Mat views and a Mat pool (see src/heap.js).
+ * - cv.memoryStats() and initial heap sizing (see src/memory.js).
+ * - cv.scope() and leak tracking (see src/arena.js).
+ * - Pthread pool sizing and thread statistics (see src/threads.js).
+ * - Batched DNN helpers (see src/dnn.js).
+ * - Bulk typed-array result accessors (see src/bulk.js).
+ * - Batch image hashing and a Hamming index (see src/imghash.js).
+ * - Host directory mounts and a parsed-model cache (see src/models.js).
+ * - An opt-in call profiler with Chrome trace export (see src/profiler.js).
+ * - cv.createFramePipeline(), ring-buffered video frame pipelines
+ *   (see src/stream.js).
+ * - cv.processTiled(), tiled processing of images larger than the heap
+ *   (see src/tiles.js).
+ *
+ * Options are read from the environment so existing code keeps working:
+ *   OPENCV_WASM_CACHE=1           Reuse compiled modules within the process
+ *   OPENCV_WASM_LAZY_COMPILE=1    Compile wasm functions on first call
+ *   OPENCV_WASM_STARTUP_REPORT=1  Print the startup report to stderr
+ *   OPENCV_WASM_PTHREAD_POOL_SIZE=N|auto  Pthread workers to start (threaded builds)
+ *   OPENCV_WASM_NUM_THREADS=N     OpenCV parallel thread count after load
+ *   OPENCV_WASM_INITIAL_MEMORY=256MB  Heap size to reserve at load
+ *   OPENCV_WASM_PROFILE=file      Profile every binding call; Chrome trace written to file on exit
+ *
+ * The report is always available as cv.startupReport.
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const v8 = require('v8');
+const { performance } = require('perf_hooks');
+const { attachHeapHelpers } = require('./heap');
+const { attachMemoryStats, parseBytes } = require('./memory');
+const { attachArena } = require('./arena');
+const { attachThreadControl } = require('./threads');
+const { attachDnnHelpers } = require('./dnn');
+const { attachBulkHelpers } = require('./bulk');
+const { attachImgHashHelpers } = require('./imghash');
+const { attachMlHelpers } = require('./ml');
+const { attachModelHelpers } = require('./models');
+const { attachTrackingHelpers } = require('./tracking');
+
+const WASM_FILE = 'opencv_js.wasm';
+
+// Compiled modules shared by every instance in this process, keyed by wasm hash
+const moduleCache = new Map();
+
+let lazyCompileEnabled = false;
+
+function envFlag(name) {
+    const value = process.env[name];
+    return value !== undefined && value !== '' && value !== '0' && value !== 'false';
+}
+
+/**
+ * Loader options taken from OPENCV_WASM_* environment variables
+ * @returns {Object} Options for load()
+ */
+function optionsFromEnv() {
+    const poolSize = process.env.OPENCV_WASM_PTHREAD_POOL_SIZE;
+    const numThreads = process.env.OPENCV_WASM_NUM_THREADS;
+    const profile = process.env.OPENCV_WASM_PROFILE;
+    return {
+        cache: envFlag('OPENCV_WASM_CACHE'),
+        lazyCompile: envFlag('OPENCV_WASM_LAZY_COMPILE'),
+        startupReport: envFlag('OPENCV_WASM_STARTUP_REPORT'),
+        pthreadPoolSize: poolSize === 'auto' ? 'auto' : (Number(poolSize) || undefined),
+        numThreads: Number(numThreads) || undefined,
+        profile: profile ? { output: profile } : undefined,
+        initialMemory: process.env.OPENCV_WASM_INITIAL_MEMORY || undefined,
+    };
+}
+
+/**
+ * Compile (or fetch from the process cache) the wasm next to opencv.js
+ * @param {string} wasmPath - Path to opencv_js.wasm
+ * @param {boolean} useCache - Look up and store the result in the cache
+ * @param {Object} report - Startup report to fill in
+ * @returns {Promise<WebAssembly.Module>}
+ */
+async function compileWasm(wasmPath, useCache, report) {
+    let start = performance.now();
+    const bytes = await fs.promises.readFile(wasmPath);
+    report.readMs = performance.now() - start;
+
+    let key = null;
+    if (useCache) {
+        key = crypto.createHash('sha256').update(bytes).digest('hex');
+        report.wasmHash = key;
+        if (moduleCache.has(key)) {
+            report.cache = 'hit';
+            report.compileMs = 0;
+            return moduleCache.get(key);
+        }
+        report.cache = 'miss';
+    }
+
+    start = performance.now();
+    const module = await WebAssembly.compile(bytes);
+    report.compileMs = performance.now() - start;
+
+    if (key) moduleCache.set(key, module);
+    return module;
+}
+
+/**
+ * Evaluate an opencv.js with the given Emscripten Module object
+ *
+ * The UMD wrapper around opencv.js passes the global `Module` to the
+ * Emscripten factory, so it is set for the duration of the require. The
+ * wrapper runs the factory when the file is evaluated, so the file is
+ * dropped from the require cache around it: every load() gets a new
+ * instance built from its own moduleArg rather than the first load's.
+ *
+ * @param {string} opencvPath - Path to dist/<build>/opencv.js
+ * @param {Object} moduleArg - Emscripten Module object
+ * @returns {Promise<Object>} The factory's promise for the cv module
+ */
+function instantiate(opencvPath, moduleArg) {
+    const hadModule = Object.prototype.hasOwnProperty.call(globalThis, 'Module');
+    const previous = globalThis.Module;
+    globalThis.Module = moduleArg;
+    const resolved = require.resolve(opencvPath);
+    delete require.cache[resolved];
+    try {
+        return require(resolved);
+    } finally {
+        delete require.cache[resolved];
+        if (hadModule) {
+            globalThis.Module = previous;
+        } else {
+            delete globalThis.Module;
+        }
+    }
+}
+
+/**
+ * Load an OpenCV.js build
+ * @param {string} opencvPath - Path to dist/<build>/opencv.js
+ * @param {Object} options - Configuration options
+ * @param {boolean} options.cache - Reuse compiled modules within the process
+ * @param {boolean} options.lazyCompile - Compile wasm functions on first call
+ * @param {boolean} options.startupReport - Print the startup report to stderr
+ * @param {WebAssembly.Module} options.wasmModule - Already compiled module to instantiate (e.g. from a worker's parent)
+ * @param {number|string} options.pthreadPoolSize - Pthread workers to start, or 'auto' for one per CPU (threaded builds)
+ * @param {number} options.numThreads - OpenCV parallel thread count to set after load
+ * @param {number|string} options.initialMemory - Heap size to reserve at load, e.g. '256MB'
+ * @param {boolean|Object} options.profile - Profile binding calls (true, or createProfiler options); sets cv.profiler
+ * @returns {Promise<Object>} Resolves with the initialized cv module
+ */
+function load(opencvPath, options = {}) {
+    const { cache = false, lazyCompile = false, startupReport = false, wasmModule = null } = options;
+    const pthreadPoolSize = options.pthreadPoolSize === 'auto' ? os.cpus().length : options.pthreadPoolSize;
+
+    if (lazyCompile && !lazyCompileEnabled) {
+        v8.setFlagsFromString('--wasm-lazy-compilation');
+        lazyCompileEnabled = true;
+    }
+
+    const started = performance.now();
+    const report = {
+        build: path.basename(path.dirname(opencvPath)),
+        cache: wasmModule ? 'shared' : (cache ? 'miss' : 'off'),
+        lazyCompile,
+        readMs: 0,
+        compileMs: 0,
+        instantiateMs: 0,
+        runtimeInitMs: 0,
+        totalMs: 0,
+    };
+    let instantiated = started;
+
+    // Emscripten gives instantiateWasm no reject path: a failed read,
+    // compile or instantiate rejects load() through this promise instead
+    let failLoad;
+    const failed = new Promise((resolve, reject) => { failLoad = reject; });
+
+    const wasmPath = path.join(path.dirname(opencvPath), WASM_FILE);
+    const initialMemory = options.initialMemory ? parseBytes(options.initialMemory) : undefined;
+    const moduleArg = {
+        // Read by patches/threads_pre.js; ignored by builds without threads
+        pthreadPoolSize,
+        // Size of the memory threaded builds create in JS; other builds grow to it after load
+        INITIAL_MEMORY: initialMemory && Math.ceil(initialMemory / 65536) * 65536,
+        instantiateWasm(imports, receiveInstance) {
+            const compiled = wasmModule ? Promise.resolve(wasmModule) : compileWasm(wasmPath, cache, report);
+            compiled
+                .then(async (module) => {
+                    const start = performance.now();
+                    const instance = await WebAssembly.instantiate(module, imports);
+                    instantiated = performance.now();
+                    report.instantiateMs = instantiated - start;
+                    receiveInstance(instance, module);
+                })
+                .catch(failLoad);
+            return {};
+        },
+        postRun: [() => {
+            const now = performance.now();
+            report.runtimeInitMs = now - instantiated;
+            report.totalMs = now - started;
+        }],
+    };
+
+    return Promise.race([instantiate(opencvPath, moduleArg), failed]).then((cv) => {
+        cv.startupReport = report;
+        attachHeapHelpers(cv);
+        attachMemoryStats(cv);
+        if (initialMemory) cv.reserveHeap(initialMemory);
+        attachArena(cv);
+        attachThreadControl(cv);
+        attachDnnHelpers(cv);
+        attachBulkHelpers(cv);
+        attachImgHashHelpers(cv);
+        attachMlHelpers(cv);
+        attachModelHelpers(cv);
+        attachTrackingHelpers(cv);
+        if (options.numThreads && typeof cv.setNumThreads === 'function') {
+            cv.setNumThreads(options.numThreads);
+        }
+        // Required lazily: src/pool.js, src/stream.js and src/tiles.js depend on this module
+        cv.createPool = (poolOptions = {}) => require('./pool').createPool({ opencvPath, ...poolOptions });
+        cv.createFramePipeline = (pipelineOptions = {}) =>
+            require('./stream').createFramePipeline(cv, { opencvPath, ...pipelineOptions });
+        cv.processTiled = (source, op, tileOptions = {}) =>
+            require('./tiles').processTiled(cv, source, op, { opencvPath, ...tileOptions });
+        if (options.profile) {
+            // Last, so helpers attached above are timed through the bindings they call
+            cv.profiler = require('./profiler').createProfiler(cv, options.profile === true ? {} : options.profile);
+        }
+        if (startupReport) {
+            printReport(report);
+        }
+        return cv;
+    });
+}
+
+function printReport(report) {
+    const ms = value => `${value.toFixed(1)}ms`;
+    console.error(
+        `opencv-contrib-wasm startup (${report.build}): ` +
+        `read ${ms(report.readMs)}, compile ${ms(report.compileMs)}, ` +
+        `instantiate ${ms(report.instantiateMs)}, runtime init ${ms(report.runtimeInitMs)}, ` +
+        `total ${ms(report.totalMs)} [cache: ${report.cache}` +
+        `${report.lazyCompile ? ', lazy compile' : ''}]`
+    );
+}
+
+module.exports = { load, optionsFromEnv, instantiate, compileWasm, moduleCache, WASM_FILE };
@@ -0,0 +1,165 @@
+/**
+ * OpenCV.js Build Selection
+ *
+ * Picks the build under dist/ that covers the OpenCV modules a caller
+ * needs, preferring the smallest one and the fastest instruction set the
+ * host runs:
+ *
+ * - Builds from scripts/build.sh describe themselves in build.json
+ *   (modules, threads, relaxed SIMD, memory64). dist/essential and
+ *   dist/full without one are treated as the standard builds.
+ * - Candidates must include every requested module. Among them, the one
+ *   with the fewest modules wins (essential before full), then the one
+ *   matching the threading preference, then relaxed SIMD where the host
+ *   validates it, then the smaller wasm file.
+ * - Split builds (modules loaded with cv.loadModule()) and memory64 builds
+ *   are only selected by name.
+ *
+ * The package entry point uses it when called with options:
+ *   const cv = await require('opencv-contrib-wasm')({ modules: ['imgproc', 'features2d'] });
+ *
+ * Usage:
+ *   const { selectBuild } = require('opencv-contrib-wasm/select');
+ *   selectBuild({ modules: ['dnn'], threads: true });   // { name: 'full', path, modules, ... }
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+const DIST_DIR = path.join(__dirname, '..', 'dist');
+
+// Modules build_js.py builds in every configuration
+const ESSENTIAL_MODULES = ['core', 'imgproc', 'features2d', 'calib3d', 'flann'];
+
+// Descriptions of the standard builds made before build.json existed;
+// modules: null covers every module
+const STANDARD_BUILDS = {
+    essential: { type: 'essential', modules: ESSENTIAL_MODULES, threads: false, relaxedSimd: false, memory64: false },
+    full: { type: 'full', modules: null, threads: true, relaxedSimd: false, memory64: false },
+};
+
+// (func (result v128) (i8x16.relaxed_swizzle (i8x16.splat (i32.const 1)) (i8x16.splat (i32.const 2))))
+const RELAXED_SIMD_PROBE = new Uint8Array([
+    0, 97, 115, 109, 1, 0, 0, 0, 1, 5, 1, 96, 0, 1, 123, 3, 2, 1, 0, 10, 15, 1, 13, 0,
+    65, 1, 253, 15, 65, 2, 253, 15, 253, 128, 2, 11,
+]);
+
+let capabilities = null;
+
+/**
+ * Features of this JS engine relevant to build selection (detected once)
+ * @returns {Object} { threads, relaxedSimd }
+ */
+function hostCapabilities() {
+    if (!capabilities) {
+        capabilities = {
+            threads: typeof SharedArrayBuffer === 'function' &&
+                (typeof crossOriginIsolated === 'undefined' || crossOriginIsolated),
+            relaxedSimd: typeof WebAssembly === 'object' && WebAssembly.validate(RELAXED_SIMD_PROBE),
+        };
+    }
+    return capabilities;
+}
+
+/**
+ * Builds present under a dist directory
+ * @param {string} distDir - Directory holding one subdirectory per build (default: the package's dist/)
+ * @returns {Object[]} { name, path, type, modules, threads, relaxedSimd, memory64, wasmBytes }
+ */
+function listBuilds(distDir = DIST_DIR) {
+    if (!fs.existsSync(distDir)) return [];
+    const builds = [];
+    for (const entry of fs.readdirSync(distDir, { withFileTypes: true })) {
+        if (!entry.isDirectory()) continue;
+        const dir = path.join(distDir, entry.name);
+        const opencvPath = path.join(dir, 'opencv.js');
+        if (!fs.existsSync(opencvPath)) continue;
+
+        const descriptionPath = path.join(dir, 'build.json');
+        const description = fs.existsSync(descriptionPath)
+            ? JSON.parse(fs.readFileSync(descriptionPath, 'utf8'))
+            : STANDARD_BUILDS[entry.name];
+        if (!description) continue;
+
+        const wasmPath = path.join(dir, 'opencv_js.wasm');
+        builds.push({
+            name: entry.name,
+            path: opencvPath,
+            type: description.type,
+            modules: description.modules ? [...new Set(description.modules)] : null,
+            threads: Boolean(description.threads),
+            relaxedSimd: Boolean(description.relaxedSimd),
+            memory64: Boolean(description.memory64),
+            wasmBytes: fs.existsSync(wasmPath) ? fs.statSync(wasmPath).size : Infinity,
+        });
+    }
+    return builds;
+}
+
+function covers(build, modules) {
+    return build.modules === null || modules.every(name => build.modules.includes(name));
+}
+
+/**
+ * Choose the build to load
+ * @param {Object} options - Selection options
+ * @param {string[]} options.modules - OpenCV modules the caller uses, e.g. ['imgproc', 'features2d'] (default: none beyond core)
+ * @param {boolean} options.threads - true: require pthreads; false: prefer builds without (default: prefer
+ *        threads only when numThreads > 1 or pthreadPoolSize is set)
+ * @param {boolean} options.relaxedSimd - true: require relaxed SIMD; false: never use it (default: when the host supports it)
+ * @param {string} options.build - Build name under dist/ to use as is, e.g. 'essential-threads'
+ * @param {string} options.distDir - Directory to search (default: the package's dist/)
+ * @returns {Object} The selected build, as returned by listBuilds()
+ */
+function selectBuild(options = {}) {
+    const { modules = [], build: name, distDir = DIST_DIR } = options;
+    const builds = listBuilds(distDir);
+    if (builds.length === 0) {
+        throw new Error(
+            'OpenCV WASM files not found. Please run "npm run build" first, ' +
+            'or install the pre-built package from npm.'
+        );
+    }
+    if (name !== undefined) {
+        const named = builds.find(build => build.name === name);
+        if (!named) {
+            throw new Error(`Build '${name}' not found (available: ${builds.map(build => build.name).join(', ')})`);
+        }
+        return named;
+    }
+
+    const host = hostCapabilities();
+    const wantThreads = options.threads !== undefined
+        ? options.threads
+        : options.numThreads > 1 || (options.pthreadPoolSize !== undefined && options.pthreadPoolSize !== 0);
+    const candidates = builds.filter(build =>
+        build.type !== 'split' &&
+        !build.memory64 &&
+        covers(build, modules) &&
+        (!build.threads || host.threads) &&
+        (options.threads !== true || build.threads) &&
+        (!build.relaxedSimd || (host.relaxedSimd && options.relaxedSimd !== false)) &&
+        (options.relaxedSimd !== true || build.relaxedSimd));
+
+    if (candidates.length === 0) {
+        const requirements = [
+            modules.length ? `modules ${modules.join(', ')}` : null,
+            options.threads === true ? 'threads' : null,
+            options.relaxedSimd === true ? 'relaxed SIMD' : null,
+        ].filter(Boolean).join(' and ');
+        throw new Error(
+            `No build in ${distDir} provides ${requirements || 'a loadable configuration'} on this host ` +
+            `(available: ${builds.map(build => build.name).join(', ')})`
+        );
+    }
+
+    const moduleCount = build => (build.modules === null ? Infinity : build.modules.length);
+    candidates.sort((a, b) =>
+        moduleCount(a) - moduleCount(b) ||
+        Number(a.threads !== wantThreads) - Number(b.threads !== wantThreads) ||
+        Number(b.relaxedSimd) - Number(a.relaxedSimd) ||
+        a.wasmBytes - b.wasmBytes);
+    return candidates[0];
+}
+
+module.exports = { selectBuild, listBuilds, hostCapabilities, ESSENTIAL_MODULES };
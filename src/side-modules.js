@@ -0,0 +1,87 @@
+/**
+ * Lazy side module loading for the split build
+ *
+ * The split build (BUILD_TYPE=split) is a main module containing core,
+ * imgproc, features2d and calib3d, plus one Emscripten side module per
+ * group in modules.json (dnn, objdetect, photo, ml, video, contrib).
+ * A group is fetched, compiled and linked into the running instance the
+ * first time it is requested; its dependencies are loaded first.
+ *
+ * Usage:
+ *   const cv = await require('opencv-contrib-wasm/split');
+ *   await cv.loadModule('dnn');
+ *   const net = cv.readNetFromONNX('model.onnx');
+ */
+
+/**
+ * Add loadModule() and friends to an initialized split-build cv module
+ * @param {Object} cv - Initialized OpenCV.js module (main module)
+ * @param {Object} manifest - Parsed dist/split/modules.json
+ * @returns {Object} The same cv object
+ */
+function attachModuleLoader(cv, manifest) {
+    if (typeof cv.loadDynamicLibrary !== 'function') {
+        throw new Error(
+            'opencv-contrib-wasm: this build cannot load side modules. ' +
+            'Rebuild with BUILD_TYPE=split.'
+        );
+    }
+
+    const groups = manifest.groups;
+    const pending = new Map();
+    const loaded = new Set();
+
+    const load = (name, chain = []) => {
+        if (!groups[name]) {
+            throw new Error(
+                `Unknown OpenCV module group '${name}'. ` +
+                `Available: ${Object.keys(groups).join(', ')}`
+            );
+        }
+        if (chain.includes(name)) {
+            throw new Error(`Circular side module dependency: ${[...chain, name].join(' -> ')}`);
+        }
+        if (!pending.has(name)) {
+            const group = groups[name];
+            const promise = Promise.all(group.depends.map(dep => load(dep, [...chain, name])))
+                // Side modules resolve their wasm path through locateFile(),
+                // i.e. relative to opencv.js, in both Node and browsers
+                .then(() => cv.loadDynamicLibrary(group.file, {
+                    loadAsync: true,
+                    global: true,
+                    nodelete: true,
+                }))
+                .then(() => {
+                    loaded.add(name);
+                    return cv;
+                });
+            promise.catch(() => pending.delete(name));
+            pending.set(name, promise);
+        }
+        return pending.get(name);
+    };
+
+    /**
+     * Fetch and link a module group (and its dependencies) on first use
+     * @param {string} name - Group name from modules.json, e.g. 'dnn'
+     * @returns {Promise<Object>} Resolves with cv once the bindings are registered
+     */
+    cv.loadModule = async (name) => load(name);
+
+    /**
+     * Check whether a module group has finished loading
+     * @param {string} name - Group name
+     * @returns {boolean}
+     */
+    cv.isModuleLoaded = (name) => loaded.has(name);
+
+    /**
+     * Module groups that can be passed to loadModule()
+     * @returns {string[]}
+     */
+    cv.availableModules = () => Object.keys(groups);
+
+    return cv;
+}
+
+module.exports = { attachModuleLoader };
@@ -0,0 +1,36 @@
+/**
+ * OpenCV.js Split Build - CommonJS Entry Point
+ *
+ * Core build (core, imgproc, features2d, calib3d) with every other module
+ * group available as a lazily loaded side module.
+ *
+ * Usage:
+ *   const cvPromise = require('opencv-contrib-wasm/split');
+ *   const cv = await cvPromise;
+ *
+ *   // Fetch, compile and link DNN only when it is needed
+ *   await cv.loadModule('dnn');
+ *
+ * Module groups: dnn, objdetect, photo, ml, video, contrib
+ * (see dist/split/modules.json)
+ */
+
+const path = require('path');
+const fs = require('fs');
+const { load, optionsFromEnv } = require('./runtime');
+const { attachModuleLoader } = require('./side-modules');
+
+const opencvPath = path.join(__dirname, '..', 'dist', 'split', 'opencv.js');
+const manifestPath = path.join(__dirname, '..', 'dist', 'split', 'modules.json');
+
+if (!fs.existsSync(opencvPath) || !fs.existsSync(manifestPath)) {
+    throw new Error(
+        'OpenCV Split WASM files not found. Please run "npm run build:split" first, ' +
+        'or install the pre-built package from npm.'
+    );
+}
+
+const manifest = JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
+const cvPromise = load(opencvPath, optionsFromEnv()).then(cv => attachModuleLoader(cv, manifest));
+
+module.exports = cvPromise;
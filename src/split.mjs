@@ -0,0 +1,43 @@
+/**
+ * OpenCV.js Split Build - ES Module Entry Point
+ *
+ * Core build (core, imgproc, features2d, calib3d) with every other module
+ * group available as a lazily loaded side module.
+ *
+ * Usage:
+ *   import cvPromise from 'opencv-contrib-wasm/split';
+ *   const cv = await cvPromise;
+ *
+ *   // Fetch, compile and link DNN only when it is needed
+ *   await cv.loadModule('dnn');
+ *
+ * Module groups: dnn, objdetect, photo, ml, video, contrib
+ * (see dist/split/modules.json)
+ */
+
+import { createRequire } from 'module';
+import { fileURLToPath } from 'url';
+import { dirname, join } from 'path';
+import { existsSync, readFileSync } from 'fs';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const opencvPath = join(__dirname, '..', 'dist', 'split', 'opencv.js');
+const manifestPath = join(__dirname, '..', 'dist', 'split', 'modules.json');
+
+if (!existsSync(opencvPath) || !existsSync(manifestPath)) {
+    throw new Error(
+        'OpenCV Split WASM files not found. Please run "npm run build:split" first, ' +
+        'or install the pre-built package from npm.'
+    );
+}
+
+const require = createRequire(import.meta.url);
+const { load, optionsFromEnv } = require('./runtime.js');
+const { attachModuleLoader } = require('./side-modules.js');
+
+const manifest = JSON.parse(readFileSync(manifestPath, 'utf8'));
+const cvPromise = load(opencvPath, optionsFromEnv()).then(cv => attachModuleLoader(cv, manifest));
+
+export default cvPromise;
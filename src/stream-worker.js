@@ -0,0 +1,119 @@
+/**
+ * OpenCV.js Frame Pipeline - worker thread
+ *
+ * Runs one group of stages of a pipeline from src/stream.js. The stage
+ * module exports (cv, options) => stage | stage[]. Frames arrive on the
+ * input port as slots of the upstream SharedArrayBuffer ring:
+ *   { slot, index, rows, cols, type, byteLength, buffer?, slotBytes, gen? }
+ * Each is copied into a Mat (the slot is acked right away), run through the
+ * stages and copied into this worker's output ring, which is sized from the
+ * first result and replaced (new gen) if a later result does not fit.
+ * Frames wait here while every output slot is taken, so downstream
+ * backpressure reaches the producer.
+ */
+
+const { parentPort, workerData } = require('worker_threads');
+const { load } = require('./runtime');
+const { createStageRunner, createSharedRing } = require('./stream');
+
+function serializeError(err) {
+    return err instanceof Error
+        ? { message: err.message, stack: err.stack }
+        : { message: String(err) };
+}
+
+function loadStages(cv) {
+    let factory = require(workerData.stageModule);
+    if (factory && typeof factory.default === 'function') factory = factory.default;
+    if (typeof factory !== 'function') {
+        throw new TypeError(`Stage module ${workerData.stageModule} must export (cv, options) => stages`);
+    }
+    const stages = factory(cv, workerData.options);
+    return Array.isArray(stages) ? stages : [stages];
+}
+
+load(workerData.opencvPath, { ...workerData.loadOptions, wasmModule: workerData.wasmModule })
+    .then((cv) => {
+        const { input, output, ringSize } = workerData;
+        const runner = createStageRunner(cv, loadStages(cv), 1);
+        const queue = [];
+        let inputRing = null;
+        let inputMat = null;
+        let outputRing = null;
+        let gen = 0;
+
+        const fail = (err) => {
+            parentPort.postMessage({ error: serializeError(err) });
+        };
+
+        const toMat = ({ slot, rows, cols, type, byteLength }) => {
+            if (!inputMat || inputMat.rows !== rows || inputMat.cols !== cols || inputMat.type() !== type) {
+                if (inputMat) inputMat.delete();
+                inputMat = new cv.Mat(rows, cols, type);
+            }
+            inputMat.data.set(inputRing.views[slot].subarray(0, byteLength));
+            return inputMat;
+        };
+
+        const send = (mat, index) => {
+            const bytes = cv.matBytes(mat);
+            let fresh = false;
+            if (!outputRing || bytes.byteLength > outputRing.slotBytes) {
+                // Slots still downstream belong to the old ring; their acks are ignored
+                outputRing = createSharedRing(Math.max(bytes.byteLength, 1), ringSize);
+                outputRing.gen = ++gen;
+                fresh = true;
+            }
+            const slot = outputRing.free.pop();
+            outputRing.views[slot].set(bytes);
+            output.postMessage({
+                slot,
+                index,
+                rows: mat.rows,
+                cols: mat.cols,
+                type: mat.type(),
+                byteLength: bytes.byteLength,
+                buffer: fresh ? outputRing.buffer : undefined,
+                slotBytes: outputRing.slotBytes,
+                gen: outputRing.gen,
+            });
+        };
+
+        const pump = () => {
+            while (queue.length) {
+                if (outputRing && !outputRing.free.length) return;
+                const message = queue.shift();
+                if (message.end) {
+                    output.postMessage({ end: true });
+                    continue;
+                }
+                if (message.buffer) {
+                    inputRing = createSharedRing(message.slotBytes, ringSize, message.buffer);
+                }
+                const mat = toMat(message);
+                input.postMessage({ ack: message.slot, gen: message.gen });
+                try {
+                    send(runner.run(0, mat, message), message.index);
+                } catch (err) {
+                    fail(err);
+                    return;
+                }
+            }
+        };
+
+        input.on('message', (message) => {
+            queue.push(message);
+            pump();
+        });
+        output.on('message', ({ ack, gen: ackGen }) => {
+            if (outputRing && ackGen === outputRing.gen) {
+                outputRing.free.push(ack);
+            }
+            pump();
+        });
+        parentPort.postMessage({ ready: true });
+    })
+    .catch((err) => {
+        parentPort.postMessage({ error: serializeError(err) });
+        parentPort.close();
+    });
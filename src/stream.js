@@ -0,0 +1,887 @@
+/**
+ * OpenCV.js Frame Pipeline (Node.js)
+ *
+ * Runs a stream of raw video frames (raw gray/RGB/RGBA/I420 or y4m, e.g.
+ * piped from ffmpeg on stdin) through a chain of stages with a fixed memory
+ * footprint:
+ *
+ * - Frame bytes are copied from the stream straight into a ring of
+ *   preallocated Mats, the only copy into the wasm heap. When every slot is
+ *   busy the pipeline stops accepting writes, so the producer is paused by
+ *   ordinary stream backpressure instead of frames piling up (or, with
+ *   dropWhenFull, frames are skipped, as a live camera needs).
+ * - Every stage writes into an output Mat that belongs to the ring slot and
+ *   is reused for every later frame in that slot; the next stage reads it
+ *   directly. Nothing is copied or allocated between stages.
+ * - With `workers`, groups of stages run on worker_threads as a pipeline:
+ *   frame n+1 is in the first worker while frame n is in the second.
+ *   Frames move between threads through SharedArrayBuffer rings, one copy
+ *   per hop, with the same backpressure.
+ *
+ * Usage:
+ *   const { stages } = require('opencv-contrib-wasm/stream');
+ *   const mog2 = new cv.BackgroundSubtractorMOG2(500, 16, false);
+ *
+ *   const pipeline = cv.createFramePipeline({
+ *       format: 'y4m',                                   // or 'rgb24' with width/height
+ *       stages: [
+ *           stages.cvtColor(cv.COLOR_YUV2GRAY_I420),
+ *           stages.backgroundSubtractor(mog2),
+ *       ],
+ *       onFrame: (frame) => {                            // may return a promise
+ *           console.log(frame.index, cv.countNonZero(frame.mat));
+ *       },
+ *   });
+ *   process.stdin.pipe(pipeline);
+ *   console.log(await pipeline.done);                    // stats
+ *   mog2.delete();
+ */
+
+const path = require('path');
+const { Writable } = require('stream');
+const { MessageChannel, Worker } = require('worker_threads');
+const { performance } = require('perf_hooks');
+
+const STREAM_WORKER_SCRIPT = path.join(__dirname, 'stream-worker.js');
+
+// Raw frame layouts: channels per pixel; i420 is one CV_8UC1 Mat of
+// height * 3/2 rows (Y plane, then U and V), as cv.cvtColor(..._I420) expects
+const FORMATS = {
+    gray: 1,
+    rgb24: 3,
+    bgr24: 3,
+    rgba: 4,
+    bgra: 4,
+    i420: 1,
+};
+
+// y4m colour spaces (the C header field) that map to a raw format
+const Y4M_COLORSPACES = {
+    '420': 'i420',
+    '420jpeg': 'i420',
+    '420paldv': 'i420',
+    '420mpeg2': 'i420',
+    'mono': 'gray',
+};
+
+const LATENCY_SAMPLES = 256;
+
+/**
+ * Mat shape and byte size of one raw frame
+ * @param {string} format - One of FORMATS
+ * @param {number} width - Frame width in pixels
+ * @param {number} height - Frame height in pixels
+ * @returns {Object} { format, width, height, rows, cols, type, bytes }
+ */
+function frameLayout(format, width, height) {
+    const channels = FORMATS[format];
+    if (!channels) {
+        throw new Error(`Unknown frame format '${format}' (expected y4m, ${Object.keys(FORMATS).join(', ')})`);
+    }
+    if (!Number.isInteger(width) || width <= 0 || !Number.isInteger(height) || height <= 0) {
+        throw new Error(`Frame width and height must be positive integers, got ${width}x${height}`);
+    }
+    if (format === 'i420' && (width % 2 || height % 2)) {
+        throw new Error(`i420 frames need an even width and height, got ${width}x${height}`);
+    }
+    const rows = format === 'i420' ? height * 3 / 2 : height;
+    return {
+        format,
+        width,
+        height,
+        rows,
+        cols: width,
+        type: (channels - 1) << 3,   // CV_8UC<channels>
+        bytes: rows * width * channels,
+    };
+}
+
+/**
+ * Parse a y4m stream header line ("YUV4MPEG2 W640 H480 F30:1 Ip A1:1 C420jpeg")
+ * @param {string} line - Header without the newline
+ * @returns {Object} Frame layout plus fps
+ */
+function parseY4MHeader(line) {
+    const fields = line.trim().split(' ');
+    if (fields[0] !== 'YUV4MPEG2') {
+        throw new Error('Not a y4m stream: missing YUV4MPEG2 header');
+    }
+    let width = 0;
+    let height = 0;
+    let colorspace = '420jpeg';
+    let fps = null;
+    for (const field of fields.slice(1)) {
+        const value = field.slice(1);
+        if (field[0] === 'W') width = Number(value);
+        else if (field[0] === 'H') height = Number(value);
+        else if (field[0] === 'C') colorspace = value;
+        else if (field[0] === 'F') {
+            const [num, den] = value.split(':').map(Number);
+            fps = den ? num / den : null;
+        }
+    }
+    const format = Y4M_COLORSPACES[colorspace];
+    if (!format) {
+        throw new Error(`y4m colorspace C${colorspace} is not supported (C420* and Cmono are)`);
+    }
+    return { ...frameLayout(format, width, height), fps };
+}
+
+/**
+ * Incremental frame splitter. Copies stream bytes straight into the slot the
+ * sink hands out and stops when the sink has no free slot.
+ * @param {string} format - 'y4m' or a raw format
+ * @param {Object} layout - Frame layout for raw formats (null for y4m)
+ * @param {Object} sink - { layout(layout), acquire(), bytes(slot), submit(slot), drop() }
+ * @returns {Object} { parse(chunk, offset) -> offset, partial() }
+ */
+function createFrameParser(format, layout, sink) {
+    const y4m = format === 'y4m';
+    let state = y4m ? 'header' : 'data';
+    let header = '';
+    let slot = -1;
+    let filled = 0;
+    let skip = 0;
+
+    if (!y4m) sink.layout(layout);
+
+    const endOfFrame = () => {
+        filled = 0;
+        if (y4m) state = 'marker';
+    };
+
+    return {
+        parse(chunk, offset) {
+            while (offset < chunk.length) {
+                if (state === 'header' || state === 'marker') {
+                    const newline = chunk.indexOf(10, offset);
+                    const end = newline === -1 ? chunk.length : newline;
+                    if (state === 'header') {
+                        header += chunk.toString('latin1', offset, end);
+                        if (header.length > 4096) {
+                            throw new Error('Not a y4m stream: header line too long');
+                        }
+                        if (newline !== -1) {
+                            layout = parseY4MHeader(header);
+                            sink.layout(layout);
+                        }
+                    } else if (filled === 0 && chunk[offset] !== 0x46) {
+                        // Every y4m frame starts with "FRAME"
+                        throw new Error('Malformed y4m stream: expected FRAME marker');
+                    }
+                    // Frame parameters after FRAME are ignored
+                    filled = newline === -1 ? filled + end - offset : 0;
+                    offset = newline === -1 ? end : end + 1;
+                    if (newline !== -1) state = state === 'header' ? 'marker' : 'data';
+                    continue;
+                }
+
+                if (skip > 0) {
+                    const n = Math.min(skip, chunk.length - offset);
+                    skip -= n;
+                    offset += n;
+                    if (skip === 0) endOfFrame();
+                    continue;
+                }
+
+                if (slot === -1) {
+                    slot = sink.acquire();
+                    if (slot === -1) {
+                        if (!sink.drop()) return offset;
+                        skip = layout.bytes;
+                        continue;
+                    }
+                }
+
+                const n = Math.min(layout.bytes - filled, chunk.length - offset);
+                chunk.copy(sink.bytes(slot), filled, offset, offset + n);
+                filled += n;
+                offset += n;
+                if (filled === layout.bytes) {
+                    const done = slot;
+                    slot = -1;
+                    endOfFrame();
+                    sink.submit(done);
+                }
+            }
+            return offset;
+        },
+
+        /**
+         * Slot holding an incomplete frame at end of stream (-1 if none)
+         */
+        partial() {
+            return slot;
+        },
+    };
+}
+
+/**
+ * Normalize a stage: a function (input, output, frame) or an object with
+ * process(input, output, frame) and optional init(cv) / delete()
+ */
+function normalizeStage(stage, index) {
+    if (typeof stage === 'function') {
+        return { name: stage.name || `stage${index}`, process: stage };
+    }
+    if (stage && typeof stage.process === 'function') {
+        return { name: stage.name || `stage${index}`, ...stage, process: stage.process.bind(stage) };
+    }
+    throw new TypeError(`Stage ${index} must be a function or an object with process()`);
+}
+
+/**
+ * Run a chain of stages over per-slot output Mats
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @param {Array} stageList - Stages (functions or stage objects)
+ * @param {number} slots - Number of output Mat sets (one per ring slot)
+ * @returns {Object} { run(slot, input, frame) -> Mat, stats(frames), delete() }
+ */
+function createStageRunner(cv, stageList, slots) {
+    const list = stageList.map(normalizeStage);
+    for (const stage of list) {
+        if (stage.init) stage.init(cv);
+    }
+    const outputs = [];
+    for (let i = 0; i < slots; i++) {
+        outputs.push(list.map(() => new cv.Mat()));
+    }
+    const totals = new Float64Array(list.length);
+
+    return {
+        run(slot, input, frame) {
+            let mat = input;
+            for (let i = 0; i < list.length; i++) {
+                const start = performance.now();
+                const result = list[i].process(mat, outputs[slot][i], frame);
+                totals[i] += performance.now() - start;
+                mat = result || outputs[slot][i];
+            }
+            return mat;
+        },
+
+        stats(frames) {
+            return list.map((stage, i) => ({ name: stage.name, meanMs: frames ? totals[i] / frames : 0 }));
+        },
+
+        delete() {
+            for (const set of outputs) {
+                for (const mat of set) mat.delete();
+            }
+            outputs.length = 0;
+            for (const stage of list) {
+                if (stage.delete) stage.delete();
+            }
+        },
+    };
+}
+
+/**
+ * Fixed-size slots in a SharedArrayBuffer, handed between threads.
+ * Ownership moves with messages: the producer takes a free slot, fills it,
+ * posts its number and gets it back with an ack.
+ * @param {number} slotBytes - Bytes per slot
+ * @param {number} slots - Number of slots
+ * @param {SharedArrayBuffer} buffer - Existing buffer to view (consumer side)
+ * @returns {Object} { buffer, slotBytes, views, free }
+ */
+function createSharedRing(slotBytes, slots, buffer = null) {
+    buffer = buffer || new SharedArrayBuffer(slotBytes * slots);
+    const views = [];
+    const free = [];
+    for (let i = 0; i < slots; i++) {
+        views.push(new Uint8Array(buffer, i * slotBytes, slotBytes));
+        free.push(slots - 1 - i);
+    }
+    return { buffer, slotBytes, views, free };
+}
+
+/**
+ * Per-frame latency samples with percentiles
+ */
+function createLatencyStats() {
+    const samples = new Float64Array(LATENCY_SAMPLES);
+    let count = 0;
+    let sum = 0;
+    let max = 0;
+    return {
+        add(ms) {
+            samples[count % LATENCY_SAMPLES] = ms;
+            count++;
+            sum += ms;
+            if (ms > max) max = ms;
+        },
+        summary() {
+            const recent = Array.from(samples.subarray(0, Math.min(count, LATENCY_SAMPLES))).sort((a, b) => a - b);
+            const at = q => (recent.length ? recent[Math.min(recent.length - 1, Math.floor(q * recent.length))] : 0);
+            return { meanMs: count ? sum / count : 0, p50Ms: at(0.5), p95Ms: at(0.95), maxMs: max };
+        },
+    };
+}
+
+/**
+ * Create a frame pipeline: a Writable that takes raw frame bytes
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @param {Object} options - Configuration options
+ * @param {string} options.format - 'y4m', 'gray', 'rgb24', 'bgr24', 'rgba', 'bgra' or 'i420'
+ * @param {number} options.width - Frame width (raw formats)
+ * @param {number} options.height - Frame height (raw formats)
+ * @param {Array} options.stages - Stages run on this thread, in order
+ * @param {string[]} options.workers - Stage modules run one per worker thread, in order (instead of stages)
+ * @param {*} options.workerOptions - Passed to each stage module (structured-cloneable)
+ * @param {Object} options.loadOptions - Options passed to runtime.load() in each worker
+ * @param {string} options.opencvPath - Path to dist/<build>/opencv.js (set by cv.createFramePipeline)
+ * @param {Function} options.onFrame - (frame) => void | Promise; the frame's slot is reused once it settles
+ * @param {number} options.ringSize - Frames in flight per hop (default: 4)
+ * @param {boolean} options.dropWhenFull - Skip incoming frames instead of pausing the producer (default: false)
+ * @returns {Writable} Pipeline stream with done, layout and stats()
+ */
+function createFramePipeline(cv, options = {}) {
+    const {
+        format,
+        stages = [],
+        workers = null,
+        workerOptions = null,
+        loadOptions = {},
+        opencvPath = null,
+        onFrame = null,
+        ringSize = 4,
+        dropWhenFull = false,
+    } = options;
+
+    if (!Number.isInteger(ringSize) || ringSize < 1) {
+        throw new Error(`createFramePipeline: ringSize must be a positive integer, got ${ringSize}`);
+    }
+    if (workers && stages.length) {
+        throw new Error('createFramePipeline: use either stages or workers, not both');
+    }
+    if (workers && !opencvPath) {
+        throw new Error('createFramePipeline: opencvPath is required with workers (or use cv.createFramePipeline())');
+    }
+    const rawLayout = format === 'y4m' ? null : frameLayout(format, options.width, options.height);
+
+    const latency = createLatencyStats();
+    const counters = { frames: 0, dropped: 0, stallMs: 0 };
+    const submittedAt = new Float64Array(ringSize);
+    let nextIndex = 0;
+    let inFlight = 0;
+    let pending = null;
+    let parsing = false;
+    let stallStart = 0;
+    let finalCallback = null;
+    let closed = false;
+    let failed = null;
+
+    const complete = (slotStart) => {
+        latency.add(performance.now() - slotStart);
+        counters.frames++;
+        inFlight--;
+    };
+
+    const fail = (err) => {
+        if (failed) return;
+        failed = err;
+        stream.destroy(err);
+    };
+
+    const pump = () => {
+        // A slot released while parsing is picked up by the running parse
+        if (!pending || failed || parsing) return;
+        let offset;
+        parsing = true;
+        try {
+            offset = parser.parse(pending.chunk, pending.offset);
+        } catch (err) {
+            const { callback } = pending;
+            pending = null;
+            callback(err);
+            return;
+        } finally {
+            parsing = false;
+        }
+        if (offset < pending.chunk.length) {
+            // Ring full: hold the write callback until a slot is released
+            pending.offset = offset;
+            if (!stallStart) stallStart = performance.now();
+            return;
+        }
+        if (stallStart) {
+            counters.stallMs += performance.now() - stallStart;
+            stallStart = 0;
+        }
+        const { callback } = pending;
+        pending = null;
+        callback();
+    };
+
+    const maybeFinish = () => {
+        if (!finalCallback || pending || inFlight > 0 || !backend.drained()) return;
+        const callback = finalCallback;
+        finalCallback = null;
+        close();
+        callback();
+    };
+
+    const close = () => {
+        if (closed) return;
+        closed = true;
+        backend.close();
+    };
+
+    const deliver = (frame, slot) => {
+        let result;
+        try {
+            result = onFrame ? onFrame(frame) : undefined;
+        } catch (err) {
+            fail(err);
+            return;
+        }
+        const release = () => {
+            complete(submittedAt[slot]);
+            backend.release(slot);
+            pump();
+            maybeFinish();
+        };
+        if (result && typeof result.then === 'function') {
+            result.then(release, fail);
+        } else {
+            release();
+        }
+    };
+
+    function createLocalBackend() {
+        const inputs = [];
+        const frames = [];
+        const free = [];
+        let runner = null;
+
+        return {
+            start(layout) {
+                runner = createStageRunner(cv, stages, ringSize);
+                for (let i = 0; i < ringSize; i++) {
+                    inputs.push(new cv.Mat(layout.rows, layout.cols, layout.type));
+                    frames.push({
+                        index: 0,
+                        slot: i,
+                        layout,
+                        mat: null,
+                        get data() {
+                            return cv.matBytes(this.mat);
+                        },
+                    });
+                    free.push(ringSize - 1 - i);
+                }
+            },
+            acquire: () => (free.length ? free.pop() : -1),
+            // Re-read per chunk: stages may grow the heap between writes
+            bytes: slot => inputs[slot].data,
+            submit(slot, index) {
+                const frame = frames[slot];
+                frame.index = index;
+                try {
+                    frame.mat = runner.run(slot, inputs[slot], frame);
+                } catch (err) {
+                    fail(err);
+                    return;
+                }
+                deliver(frame, slot);
+            },
+            release(slot) {
+                frames[slot].mat = null;
+                free.push(slot);
+            },
+            drained: () => true,
+            stages: () => (runner ? runner.stats(counters.frames) : []),
+            close() {
+                for (const mat of inputs) mat.delete();
+                inputs.length = 0;
+                if (runner) runner.delete();
+            },
+        };
+    }
+
+    function createWorkerBackend() {
+        const { compileWasm, WASM_FILE } = require('./runtime');
+        const channels = [];
+        for (let i = 0; i <= workers.length; i++) {
+            channels.push(new MessageChannel());
+        }
+        // Main thread feeds channel 0 and reads the last channel
+        const source = channels[0].port1;
+        const sink = channels[workers.length].port2;
+        const threads = [];
+        let ring = null;
+        let sentBuffer = false;
+        let sinkRing = null;
+        let ended = false;
+        // Submit times by frame index; every frame in flight across the hops fits
+        const sourceTimes = new Float64Array(ringSize * (workers.length + 1) * 2);
+
+        compileWasm(path.join(path.dirname(opencvPath), WASM_FILE), true, {}).then((wasmModule) => {
+            if (closed) return;
+            workers.forEach((stageModule, i) => {
+                const input = channels[i].port2;
+                const output = channels[i + 1].port1;
+                const worker = new Worker(STREAM_WORKER_SCRIPT, {
+                    workerData: {
+                        opencvPath,
+                        wasmModule,
+                        loadOptions,
+                        stageModule: path.resolve(stageModule),
+                        options: workerOptions,
+                        ringSize,
+                        input,
+                        output,
+                    },
+                    transferList: [input, output],
+                });
+                worker.on('message', (message) => {
+                    if (message.error) {
+                        const err = new Error(`Frame pipeline worker ${i} (${stageModule}): ${message.error.message}`);
+                        err.stack = message.error.stack;
+                        fail(err);
+                    }
+                });
+                worker.on('error', fail);
+                worker.on('exit', (code) => {
+                    if (!closed && code !== 0) fail(new Error(`Frame pipeline worker ${i} exited with code ${code}`));
+                });
+                threads.push(worker);
+            });
+        }).catch(fail);
+
+        source.on('message', ({ ack }) => {
+            ring.free.push(ack);
+            pump();
+        });
+
+        sink.on('message', (message) => {
+            if (message.end) {
+                ended = true;
+                maybeFinish();
+                return;
+            }
+            if (message.buffer) {
+                sinkRing = createSharedRing(message.slotBytes, ringSize, message.buffer);
+                sinkRing.gen = message.gen;
+            }
+            const { slot, index, rows, cols, type, byteLength, gen } = message;
+            const frame = {
+                index,
+                slot,
+                layout: stream.layout,
+                rows,
+                cols,
+                type,
+                data: sinkRing.views[slot].subarray(0, byteLength),
+            };
+            let result;
+            try {
+                result = onFrame ? onFrame(frame) : undefined;
+            } catch (err) {
+                fail(err);
+                return;
+            }
+            const release = () => {
+                complete(sourceTimes[index % sourceTimes.length]);
+                sink.postMessage({ ack: slot, gen });
+                maybeFinish();
+            };
+            if (result && typeof result.then === 'function') {
+                result.then(release, fail);
+            } else {
+                release();
+            }
+        });
+
+        return {
+            start(layout) {
+                ring = createSharedRing(layout.bytes, ringSize);
+            },
+            acquire: () => (ring.free.length ? ring.free.pop() : -1),
+            bytes: slot => ring.views[slot],
+            submit(slot, index) {
+                sourceTimes[index % sourceTimes.length] = performance.now();
+                const layout = stream.layout;
+                source.postMessage({
+                    slot,
+                    index,
+                    rows: layout.rows,
+                    cols: layout.cols,
+                    type: layout.type,
+                    byteLength: layout.bytes,
+                    buffer: sentBuffer ? undefined : ring.buffer,
+                    slotBytes: ring.slotBytes,
+                });
+                sentBuffer = true;
+            },
+            // Only for a partial frame at end of stream; sent slots come back as acks
+            release(slot) {
+                ring.free.push(slot);
+            },
+            end() {
+                source.postMessage({ end: true });
+            },
+            drained: () => ended,
+            stages: () => [],
+            close() {
+                source.close();
+                sink.close();
+                for (const worker of threads) worker.terminate();
+            },
+        };
+    }
+
+    // Backend: 'local' runs the stages here, 'workers' hands frames to threads
+    const backend = workers ? createWorkerBackend() : createLocalBackend();
+
+    const stream = new Writable({
+        write(chunk, encoding, callback) {
+            pending = { chunk, offset: 0, callback };
+            pump();
+        },
+        final(callback) {
+            const partial = parser.partial();
+            if (partial !== -1) {
+                // Stream ended inside a frame
+                counters.dropped++;
+                backend.release(partial);
+            }
+            finalCallback = callback;
+            if (backend.end) backend.end();
+            maybeFinish();
+        },
+        destroy(err, callback) {
+            close();
+            callback(err);
+        },
+    });
+
+    stream.layout = rawLayout;
+
+    const parser = createFrameParser(format, rawLayout, {
+        layout(layout) {
+            stream.layout = layout;
+            backend.start(layout);
+        },
+        acquire: () => backend.acquire(),
+        bytes: slot => backend.bytes(slot),
+        submit(slot) {
+            inFlight++;
+            submittedAt[slot] = performance.now();
+            backend.submit(slot, nextIndex++);
+        },
+        drop() {
+            if (!dropWhenFull) return false;
+            counters.dropped++;
+            return true;
+        },
+    });
+
+    /**
+     * Frames processed, dropped, in flight, write stall time, per-frame
+     * latency and (for stages on this thread) mean time per stage
+     * @returns {Object}
+     */
+    stream.stats = () => ({
+        ...counters,
+        inFlight,
+        ringSize,
+        latency: latency.summary(),
+        stages: backend.stages(),
+    });
+
+    /** Resolves with stats() once every frame has been delivered */
+    stream.done = new Promise((resolve, reject) => {
+        stream.on('finish', () => resolve(stream.stats()));
+        stream.on('error', reject);
+    });
+    stream.done.catch(() => {});
+
+    return stream;
+}
+
+/**
+ * Ready-made stages. Objects passed to a stage (subtractors, optical flow
+ * algorithms) stay owned by the caller; a stage deletes only what it creates.
+ */
+const stages = {
+    /**
+     * cv.cvtColor into the slot's output Mat
+     * @param {number} code - Conversion code, e.g. cv.COLOR_YUV2GRAY_I420
+     * @param {number} dstCn - Output channels (default: from code)
+     */
+    cvtColor(code, dstCn = 0) {
+        let cv = null;
+        return {
+            name: 'cvtColor',
+            init(module) { cv = module; },
+            process(src, dst) { cv.cvtColor(src, dst, code, dstCn); },
+        };
+    },
+
+    /**
+     * cv.resize to a fixed size
+     * @param {number} width - Output width
+     * @param {number} height - Output height
+     * @param {number} interpolation - Interpolation flag (default: INTER_AREA)
+     */
+    resize(width, height, interpolation) {
+        let cv = null;
+        let size = null;
+        return {
+            name: 'resize',
+            init(module) {
+                cv = module;
+                size = new cv.Size(width, height);
+                if (interpolation === undefined) interpolation = cv.INTER_AREA;
+            },
+            process(src, dst) { cv.resize(src, dst, size, 0, 0, interpolation); },
+        };
+    },
+
+    /**
+     * cv.GaussianBlur with a square kernel
+     * @param {number} ksize - Kernel size (odd)
+     * @param {number} sigma - Sigma (default: from ksize)
+     */
+    gaussianBlur(ksize, sigma = 0) {
+        let cv = null;
+        let size = null;
+        return {
+            name: 'gaussianBlur',
+            init(module) {
+                cv = module;
+                size = new cv.Size(ksize, ksize);
+            },
+            process(src, dst) { cv.GaussianBlur(src, dst, size, sigma, sigma, cv.BORDER_DEFAULT); },
+        };
+    },
+
+    /**
+     * Foreground mask from a background subtractor (video or bgsegm module),
+     * e.g. new cv.BackgroundSubtractorMOG2(500, 16, false)
+     * @param {Object} subtractor - Object with apply(image, fgmask, learningRate)
+     * @param {number} learningRate - Learning rate (default: -1, automatic)
+     */
+    backgroundSubtractor(subtractor, learningRate = -1) {
+        return {
+            name: 'backgroundSubtractor',
+            process(src, dst) { subtractor.apply(src, dst, learningRate); },
+        };
+    },
+
+    /**
+     * Dense optical flow between consecutive gray frames (CV_32FC2 output,
+     * zero for the first frame), e.g. with a cv.DISOpticalFlow
+     * @param {Object} algorithm - Object with calc(prev, next, flow)
+     */
+    denseOpticalFlow(algorithm) {
+        let cv = null;
+        let prev = null;
+        return {
+            name: 'denseOpticalFlow',
+            init(module) { cv = module; },
+            process(gray, flow) {
+                if (!prev) {
+                    prev = gray.clone();
+                    flow.create(gray.rows, gray.cols, cv.CV_32FC2);
+                    flow.setTo(new cv.Scalar(0, 0));
+                    return;
+                }
+                algorithm.calc(prev, gray, flow);
+                gray.copyTo(prev);
+            },
+            delete() {
+                if (prev) prev.delete();
+                prev = null;
+            },
+        };
+    },
+
+    /**
+     * Sparse Lucas-Kanade tracking of corner features between consecutive
+     * gray frames. Output: the tracked points (N x 1 CV_32FC2); features
+     * are re-detected when fewer than minPoints remain.
+     * @param {Object} params - { maxCorners, qualityLevel, minDistance, minPoints, winSize, maxLevel }
+     */
+    sparseOpticalFlow(params = {}) {
+        const {
+            maxCorners = 200,
+            qualityLevel = 0.01,
+            minDistance = 10,
+            minPoints = Math.ceil(maxCorners / 2),
+            winSize = 21,
+            maxLevel = 3,
+        } = params;
+        let cv = null;
+        let prevGray = null;
+        let prevPts = null;
+        let nextPts = null;
+        let status = null;
+        let err = null;
+        let mask = null;
+        let window = null;
+        let criteria = null;
+
+        return {
+            name: 'sparseOpticalFlow',
+            init(module) {
+                cv = module;
+                prevPts = new cv.Mat();
+                nextPts = new cv.Mat();
+                status = new cv.Mat();
+                err = new cv.Mat();
+                mask = new cv.Mat();
+                window = new cv.Size(winSize, winSize);
+                criteria = new cv.TermCriteria(cv.TermCriteria_EPS | cv.TermCriteria_COUNT, 30, 0.01);
+            },
+            process(gray, output) {
+                if (!prevGray || prevPts.rows < minPoints) {
+                    cv.goodFeaturesToTrack(prevGray || gray, prevPts, maxCorners, qualityLevel, minDistance, mask);
+                }
+                if (!prevGray) {
+                    prevGray = gray.clone();
+                    prevPts.copyTo(output);
+                    return;
+                }
+                if (prevPts.rows > 0) {
+                    cv.calcOpticalFlowPyrLK(prevGray, gray, prevPts, nextPts, status, err, window, maxLevel, criteria);
+                    // Keep the tracked points, compacted in place
+                    const points = cv.matView(nextPts);
+                    const found = status.data;
+                    let kept = 0;
+                    for (let i = 0; i < found.length; i++) {
+                        if (!found[i]) continue;
+                        points[kept * 2] = points[i * 2];
+                        points[kept * 2 + 1] = points[i * 2 + 1];
+                        kept++;
+                    }
+                    const tracked = nextPts.rowRange(0, kept);
+                    tracked.copyTo(output);
+                    tracked.copyTo(prevPts);
+                    tracked.delete();
+                } else {
+                    prevPts.copyTo(output);
+                }
+                gray.copyTo(prevGray);
+            },
+            delete() {
+                for (const mat of [prevGray, prevPts, nextPts, status, err, mask]) {
+                    if (mat) mat.delete();
+                }
+                prevGray = null;
+            },
+        };
+    },
+};
+
+module.exports = {
+    createFramePipeline,
+    createStageRunner,
+    createSharedRing,
+    frameLayout,
+    parseY4MHeader,
+    stages,
+    FORMATS,
+};
@@ -0,0 +1,142 @@
+/**
+ * OpenCV.js Thread Control
+ *
+ * Threaded builds (full, custom, split) run OpenCV's parallel_for_ on a pool
+ * of pthread workers started with the module. The pool size is read from
+ * Module.pthreadPoolSize at load time (patches/threads_pre.js); OpenCV's
+ * own thread count is changed at runtime with cv.setNumThreads().
+ *
+ * Threads beyond the pool can only start after the calling thread yields to
+ * the event loop, which a synchronous OpenCV call never does, so
+ * cv.setNumThreads() is capped at the pool size.
+ *
+ * Usage:
+ *   OPENCV_WASM_PTHREAD_POOL_SIZE=auto OPENCV_WASM_NUM_THREADS=8 node app.js
+ *
+ *   cv.threadInfo();   // { threaded: true, pthreadPoolSize: 16, numThreads: 8, cpus: 16 }
+ *   const { result, utilization } = cv.measureParallel(() => cv.GaussianBlur(src, dst, ksize, 0));
+ *   cv.parallelStats();   // totals over every measureParallel() call
+ */
+
+const DEFAULT_POOL_SIZE = 4;
+
+function now() {
+    return typeof performance !== 'undefined' ? performance.now() : Date.now();
+}
+
+function cpuTimeMs() {
+    // Process-wide: includes the pthread workers (worker_threads in Node)
+    if (typeof process === 'undefined' || typeof process.cpuUsage !== 'function') return null;
+    const usage = process.cpuUsage();
+    return (usage.user + usage.system) / 1000;
+}
+
+/**
+ * Add threadInfo(), measureParallel() and parallelStats() to a cv module,
+ * and cap setNumThreads() at the pthread pool size
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv object
+ */
+function attachThreadControl(cv) {
+    let threaded = null;
+    const isThreaded = () => {
+        if (threaded === null) {
+            // Builds with patches/threads_pre.js mark themselves; pthreadPoolSize
+            // alone is not proof, as loaders set it on every build's Module object
+            threaded = cv.pthreadsEnabled === true ||
+                (typeof cv.getBuildInformation === 'function' &&
+                    /Parallel framework:\s*pthreads/.test(cv.getBuildInformation()));
+        }
+        return threaded;
+    };
+    const poolSize = () => {
+        if (!isThreaded()) return 0;
+        return typeof cv.pthreadPoolSize === 'number' ? cv.pthreadPoolSize : DEFAULT_POOL_SIZE;
+    };
+
+    const originalSetNumThreads = cv.setNumThreads;
+    if (typeof originalSetNumThreads === 'function') {
+        let warned = false;
+        cv.setNumThreads = (count) => {
+            const limit = poolSize();
+            if (limit > 0 && count > limit) {
+                if (!warned) {
+                    console.warn(
+                        `opencv-contrib-wasm: setNumThreads(${count}) capped at the pthread pool size (${limit}). ` +
+                        'Load with a larger pthreadPoolSize to use more threads.'
+                    );
+                    warned = true;
+                }
+                count = limit;
+            }
+            return originalSetNumThreads(count);
+        };
+    }
+
+    const totals = { calls: 0, wallMs: 0, cpuMs: 0 };
+
+    /**
+     * Threading configuration of this instance
+     * @returns {Object} { threaded, pthreadPoolSize, numThreads, cpus }
+     */
+    cv.threadInfo = () => ({
+        threaded: isThreaded(),
+        pthreadPoolSize: poolSize(),
+        numThreads: typeof cv.getNumThreads === 'function' ? cv.getNumThreads() : 1,
+        cpus: typeof cv.getNumberOfCPUs === 'function' ? cv.getNumberOfCPUs() : null,
+    });
+
+    /**
+     * Run fn and report how much of OpenCV's thread budget it used
+     *
+     * utilization = CPU time / (wall time x numThreads); 1.0 means every
+     * thread was busy for the whole call. CPU time is only available in Node
+     * and covers the whole process, so measure calls one at a time.
+     *
+     * @param {Function} fn - Synchronous function making OpenCV calls
+     * @returns {Object} { result, wallMs, cpuMs, numThreads, utilization }
+     */
+    cv.measureParallel = (fn) => {
+        const numThreads = cv.threadInfo().numThreads;
+        const cpuStart = cpuTimeMs();
+        const start = now();
+        const result = fn();
+        const wallMs = now() - start;
+        const cpuMs = cpuStart === null ? null : cpuTimeMs() - cpuStart;
+
+        totals.calls++;
+        totals.wallMs += wallMs;
+        if (cpuMs !== null) totals.cpuMs += cpuMs;
+
+        return {
+            result,
+            wallMs,
+            cpuMs,
+            numThreads,
+            utilization: cpuMs === null || wallMs === 0 ? null : cpuMs / (wallMs * Math.max(1, numThreads)),
+        };
+    };
+
+    /**
+     * Totals over every measureParallel() call
+     * @param {boolean} reset - Clear the totals after reading them
+     * @returns {Object} { calls, wallMs, cpuMs, utilization }
+     */
+    cv.parallelStats = (reset = false) => {
+        const numThreads = Math.max(1, cv.threadInfo().numThreads);
+        const stats = {
+            ...totals,
+            utilization: totals.wallMs > 0 ? totals.cpuMs / (totals.wallMs * numThreads) : null,
+        };
+        if (reset) {
+            totals.calls = 0;
+            totals.wallMs = 0;
+            totals.cpuMs = 0;
+        }
+        return stats;
+    };
+
+    return cv;
+}
+
+module.exports = { attachThreadControl, DEFAULT_POOL_SIZE };
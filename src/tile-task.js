@@ -0,0 +1,117 @@
+/**
+ * OpenCV.js Tiled Processing - tile task
+ *
+ * Runs one operation on one tile, on the main thread or as a worker pool
+ * task (see src/tiles.js):
+ *   { op: { name, params } | { source, params }, tile: { rows, cols, type, data }, crop: { x, y, width, height } }
+ *   -> { rows, cols, type, data }  (the crop of the result, copied out of the heap)
+ */
+
+// Custom operations compiled from source, keyed by source text
+const customOps = new Map();
+
+function customOp(source) {
+    let fn = customOps.get(source);
+    if (!fn) {
+        fn = new Function(`return (${source});`)();
+        if (typeof fn !== 'function') {
+            throw new TypeError('Custom tile operation is not a function');
+        }
+        customOps.set(source, fn);
+    }
+    return fn;
+}
+
+function ximgproc(cv, name) {
+    const fn = cv[`ximgproc_${name}`] || cv[name];
+    if (typeof fn !== 'function') {
+        throw new Error(`${name} is not available in this build (needs ximgproc)`);
+    }
+    return fn;
+}
+
+// Built-in operations: (cv, src, dst, params) => void
+const OPERATIONS = {
+    GaussianBlur(cv, src, dst, { ksize, sigmaX, sigmaY }) {
+        cv.GaussianBlur(src, dst, new cv.Size(ksize, ksize), sigmaX, sigmaY, cv.BORDER_DEFAULT);
+    },
+
+    bilateralFilter(cv, src, dst, { d, sigmaColor, sigmaSpace }) {
+        cv.bilateralFilter(src, dst, d, sigmaColor, sigmaSpace, cv.BORDER_DEFAULT);
+    },
+
+    medianBlur(cv, src, dst, { ksize }) {
+        cv.medianBlur(src, dst, ksize);
+    },
+
+    morphologyEx(cv, src, dst, { op, ksize, iterations, shape }) {
+        const kernel = cv.getStructuringElement(shape, new cv.Size(ksize, ksize));
+        try {
+            cv.morphologyEx(src, dst, op, kernel, new cv.Point(-1, -1), iterations,
+                cv.BORDER_CONSTANT, cv.morphologyDefaultBorderValue());
+        } finally {
+            kernel.delete();
+        }
+    },
+
+    distanceTransform(cv, src, dst, { distanceType, maskSize, maxDistance }) {
+        cv.distanceTransform(src, dst, distanceType, maskSize, cv.CV_32F);
+        // Beyond maxDistance the nearest zero may lie outside the tile
+        cv.threshold(dst, dst, maxDistance, maxDistance, cv.THRESH_TRUNC);
+    },
+
+    guidedFilter(cv, src, dst, { radius, eps }) {
+        ximgproc(cv, 'guidedFilter')(src, src, dst, radius, eps, -1);
+    },
+
+    rollingGuidanceFilter(cv, src, dst, { d, sigmaColor, sigmaSpace, iterations }) {
+        ximgproc(cv, 'rollingGuidanceFilter')(src, dst, d, sigmaColor, sigmaSpace, iterations, cv.BORDER_DEFAULT);
+    },
+};
+
+/**
+ * Process one tile
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @param {Object} input - { op, tile, crop }
+ * @returns {Object} { rows, cols, type, data } of the cropped result
+ */
+function runTile(cv, input) {
+    const { op, tile, crop } = input;
+    const run = op.source ? customOp(op.source) : OPERATIONS[op.name];
+    if (!run) {
+        throw new Error(`Unknown tile operation '${op.name}'`);
+    }
+
+    const src = new cv.Mat(tile.rows, tile.cols, tile.type);
+    const dst = new cv.Mat();
+    let roi = null;
+    let result = null;
+    try {
+        const data = tile.data;
+        src.data.set(ArrayBuffer.isView(data)
+            ? new Uint8Array(data.buffer, data.byteOffset, data.byteLength)
+            : new Uint8Array(data));
+        run(cv, src, dst, op.params || {});
+        if (dst.rows !== tile.rows || dst.cols !== tile.cols) {
+            throw new Error(`Tile operation changed the tile size (${tile.cols}x${tile.rows} -> ${dst.cols}x${dst.rows})`);
+        }
+        roi = dst.roi(new cv.Rect(crop.x, crop.y, crop.width, crop.height));
+        // The ROI is not continuous; clone() packs it before copying out
+        result = roi.clone();
+        return {
+            rows: result.rows,
+            cols: result.cols,
+            type: result.type(),
+            data: new Uint8Array(result.data),
+        };
+    } finally {
+        src.delete();
+        dst.delete();
+        if (roi) roi.delete();
+        if (result) result.delete();
+    }
+}
+
+module.exports = runTile;
+module.exports.runTile = runTile;
+module.exports.OPERATIONS = OPERATIONS;
@@ -0,0 +1,415 @@
+/**
+ * OpenCV.js Tiled Processing (Node.js)
+ *
+ * Runs a neighbourhood operation over an image too large for one wasm heap
+ * (gigapixel slide and satellite scans) by cutting it into tiles:
+ *
+ * - Each tile is read with a halo of extra pixels on every side, sized from
+ *   the operation's kernel radius, and only the tile's core is kept. Every
+ *   output pixel therefore sees the same neighbourhood as in a whole-image
+ *   call and tiles join without seams; at the image edges the operation's
+ *   own border handling applies, as it would for the whole image.
+ * - Tile size comes from a per-tile heap budget, so the wasm heap (of this
+ *   thread or each worker) never holds more than one tile's working set.
+ * - The image stays outside the wasm heap: an in-memory buffer (Buffer,
+ *   typed array, ArrayBuffer or SharedArrayBuffer) or a raw pixel file read
+ *   tile by tile. The result goes to a buffer or straight to a raw file.
+ * - With `workers` (or an existing `pool`) tiles run on a worker_threads
+ *   pool (src/pool.js), a bounded number in flight at a time.
+ *
+ * Usage:
+ *   const { ops } = require('opencv-contrib-wasm/tiles');
+ *   const result = await cv.processTiled(
+ *       { path: 'scan.raw', rows: 60000, cols: 80000, type: cv.CV_8UC3 },
+ *       ops.bilateralFilter(9, 50, 50),
+ *       { workers: os.cpus().length, output: { path: 'scan-smooth.raw' } },
+ *   );
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { elemSize } = require('./heap');
+const runTile = require('./tile-task');
+
+const TILE_TASK = path.join(__dirname, 'tile-task.js');
+
+const DEFAULT_TILE_BYTES = 64 * 1024 * 1024;
+
+// Tile sides are rounded down to a multiple of this
+const TILE_ALIGN = 16;
+const MIN_TILE = 64;
+
+/**
+ * Operation descriptors. `halo` is the kernel radius in pixels; `memory`
+ * estimates the working set per input pixel in multiples of its size.
+ */
+const ops = {
+    /**
+     * @param {number} ksize - Odd kernel size, or 0 to derive it from sigma
+     * @param {number} sigmaX - Gaussian sigma in X
+     * @param {number} sigmaY - Gaussian sigma in Y (default: sigmaX)
+     */
+    gaussianBlur(ksize, sigmaX = 0, sigmaY = sigmaX) {
+        const sigma = Math.max(sigmaX, sigmaY);
+        const halo = ksize > 0 ? Math.floor(ksize / 2) : Math.ceil(4 * sigma);
+        return { name: 'GaussianBlur', params: { ksize, sigmaX, sigmaY }, halo, memory: 4 };
+    },
+
+    /**
+     * @param {number} d - Pixel neighbourhood diameter, or <= 0 to derive it from sigmaSpace
+     * @param {number} sigmaColor - Filter sigma in colour space
+     * @param {number} sigmaSpace - Filter sigma in coordinate space
+     */
+    bilateralFilter(d, sigmaColor, sigmaSpace) {
+        const halo = d > 0 ? Math.floor(d / 2) : Math.round(sigmaSpace * 1.5);
+        return { name: 'bilateralFilter', params: { d, sigmaColor, sigmaSpace }, halo, memory: 6 };
+    },
+
+    /**
+     * @param {number} ksize - Odd aperture size
+     */
+    medianBlur(ksize) {
+        return { name: 'medianBlur', params: { ksize }, halo: Math.floor(ksize / 2), memory: 3 };
+    },
+
+    /**
+     * @param {number} op - cv.MORPH_* operation
+     * @param {number} ksize - Structuring element size
+     * @param {number} iterations - Iterations (default: 1)
+     * @param {number} shape - cv.MORPH_RECT / MORPH_ELLIPSE / MORPH_CROSS (default: MORPH_RECT = 0)
+     */
+    morphologyEx(op, ksize, iterations = 1, shape = 0) {
+        // Opening, closing and the gradients chain two passes (erode + dilate)
+        const passes = op === 0 || op === 1 ? 1 : 2;
+        return {
+            name: 'morphologyEx',
+            params: { op, ksize, iterations, shape },
+            halo: Math.floor(ksize / 2) * iterations * passes,
+            memory: 4,
+        };
+    },
+
+    /**
+     * Distance to the nearest zero pixel, exact up to maxDistance and
+     * clamped to it beyond (a whole-image distance transform is global)
+     * @param {number} distanceType - cv.DIST_L1 / DIST_L2 / DIST_C
+     * @param {number} maskSize - 3, 5 or 0 (DIST_MASK_PRECISE)
+     * @param {number} maxDistance - Largest distance that must be exact
+     */
+    distanceTransform(distanceType, maskSize, maxDistance) {
+        if (!(maxDistance > 0)) {
+            throw new Error('ops.distanceTransform: maxDistance must be positive');
+        }
+        return {
+            name: 'distanceTransform',
+            params: { distanceType, maskSize, maxDistance },
+            // Chamfer masks overestimate by up to ~8%
+            halo: Math.ceil(maxDistance * 1.1) + 2,
+            memory: 14,
+        };
+    },
+
+    /**
+     * Self-guided filter (ximgproc)
+     * @param {number} radius - Box filter radius
+     * @param {number} eps - Regularization
+     */
+    guidedFilter(radius, eps) {
+        // Mean of means: two box filters of the radius
+        return { name: 'guidedFilter', params: { radius, eps }, halo: 2 * radius, memory: 24 };
+    },
+
+    /**
+     * Rolling guidance filter (ximgproc)
+     * @param {number} d - Neighbourhood diameter, or <= 0 to derive it from sigmaSpace
+     * @param {number} sigmaColor - Colour sigma
+     * @param {number} sigmaSpace - Space sigma
+     * @param {number} iterations - Iterations (default: 4)
+     */
+    rollingGuidanceFilter(d = -1, sigmaColor = 25, sigmaSpace = 3, iterations = 4) {
+        const radius = d > 0 ? Math.floor(d / 2) : Math.round(sigmaSpace * 1.5);
+        return {
+            name: 'rollingGuidanceFilter',
+            params: { d, sigmaColor, sigmaSpace, iterations },
+            halo: radius * iterations,
+            memory: 12,
+        };
+    },
+
+    /**
+     * Any size-preserving operation. The function is serialized with
+     * toString for workers, so it cannot use variables from its scope.
+     * @param {Function} fn - (cv, src, dst, params) => void
+     * @param {Object} options - { halo, params, memory }
+     */
+    custom(fn, options = {}) {
+        const { halo, params = {}, memory = 4 } = options;
+        if (typeof fn !== 'function') {
+            throw new TypeError('ops.custom: fn must be a function (cv, src, dst, params) => void');
+        }
+        if (!Number.isInteger(halo) || halo < 0) {
+            throw new Error('ops.custom: options.halo (kernel radius in pixels) is required');
+        }
+        return { name: fn.name || 'custom', source: fn.toString(), params, halo, memory };
+    },
+};
+
+/**
+ * Tile side so that one tile plus halo fits the per-tile heap budget
+ * @param {Object} op - Operation descriptor
+ * @param {number} pixelBytes - Bytes per input pixel
+ * @param {number} tileBytes - Heap budget per tile
+ * @returns {number}
+ */
+function tileSizeFor(op, pixelBytes, tileBytes) {
+    const side = Math.floor(Math.sqrt(tileBytes / (pixelBytes * (op.memory || 4))));
+    const core = Math.floor((side - 2 * op.halo) / TILE_ALIGN) * TILE_ALIGN;
+    if (core < MIN_TILE) {
+        throw new Error(
+            `processTiled: a ${op.halo}px halo does not fit a ${(tileBytes / 1048576).toFixed(0)}MB tile budget; ` +
+            'raise tileBytes'
+        );
+    }
+    return core;
+}
+
+/**
+ * Cut an image into tiles with halos
+ * @param {number} rows - Image rows
+ * @param {number} cols - Image columns
+ * @param {number} tileSize - Core tile side
+ * @param {number} halo - Halo in pixels
+ * @returns {Object[]} { x, y, width, height, read: { x, y, width, height } }
+ */
+function tileGrid(rows, cols, tileSize, halo) {
+    const tiles = [];
+    for (let y = 0; y < rows; y += tileSize) {
+        for (let x = 0; x < cols; x += tileSize) {
+            const width = Math.min(tileSize, cols - x);
+            const height = Math.min(tileSize, rows - y);
+            const x0 = Math.max(0, x - halo);
+            const y0 = Math.max(0, y - halo);
+            const x1 = Math.min(cols, x + width + halo);
+            const y1 = Math.min(rows, y + height + halo);
+            tiles.push({ x, y, width, height, read: { x: x0, y: y0, width: x1 - x0, height: y1 - y0 } });
+        }
+    }
+    return tiles;
+}
+
+function toBytes(data) {
+    if (ArrayBuffer.isView(data)) {
+        return new Uint8Array(data.buffer, data.byteOffset, data.byteLength);
+    }
+    if (data instanceof ArrayBuffer || (typeof SharedArrayBuffer !== 'undefined' && data instanceof SharedArrayBuffer)) {
+        return new Uint8Array(data);
+    }
+    throw new TypeError('processTiled: source.data must be a Buffer, typed array or (Shared)ArrayBuffer');
+}
+
+/**
+ * Reader for rectangles of the source image
+ * @returns {Object} { read(rect) -> Uint8Array, close() }
+ */
+function openSource(source, pixelBytes) {
+    const rowBytes = source.cols * pixelBytes;
+    if (source.path) {
+        const fd = fs.openSync(source.path, 'r');
+        const offset = source.offset || 0;
+        const size = fs.fstatSync(fd).size;
+        if (size < offset + source.rows * rowBytes) {
+            fs.closeSync(fd);
+            throw new Error(
+                `processTiled: ${source.path} has ${size} bytes, expected ${offset + source.rows * rowBytes} ` +
+                `for ${source.cols}x${source.rows}`
+            );
+        }
+        return {
+            read(rect) {
+                const lineBytes = rect.width * pixelBytes;
+                const bytes = new Uint8Array(rect.height * lineBytes);
+                for (let row = 0; row < rect.height; row++) {
+                    const position = offset + (rect.y + row) * rowBytes + rect.x * pixelBytes;
+                    fs.readSync(fd, bytes, row * lineBytes, lineBytes, position);
+                }
+                return bytes;
+            },
+            close: () => fs.closeSync(fd),
+        };
+    }
+
+    const data = toBytes(source.data);
+    if (data.byteLength < source.rows * rowBytes) {
+        throw new RangeError(
+            `processTiled: expected ${source.rows * rowBytes} bytes for ${source.cols}x${source.rows}, got ${data.byteLength}`
+        );
+    }
+    return {
+        read(rect) {
+            const lineBytes = rect.width * pixelBytes;
+            const bytes = new Uint8Array(rect.height * lineBytes);
+            for (let row = 0; row < rect.height; row++) {
+                const start = (rect.y + row) * rowBytes + rect.x * pixelBytes;
+                bytes.set(data.subarray(start, start + lineBytes), row * lineBytes);
+            }
+            return bytes;
+        },
+        close() {},
+    };
+}
+
+/**
+ * Writer for result tiles: a buffer allocated on the first result, or a raw file
+ * @returns {Object} { write(tile, result), finish() -> result image }
+ */
+function openOutput(source, output) {
+    let fd = null;
+    let data = null;
+    let type = null;
+    let pixelBytes = 0;
+
+    if (output && output.path) {
+        fd = fs.openSync(output.path, 'w');
+    } else if (output && output.data) {
+        data = toBytes(output.data);
+    }
+
+    return {
+        write(tile, result) {
+            if (type === null) {
+                type = result.type;
+                pixelBytes = elemSize(type);
+                const needed = source.rows * source.cols * pixelBytes;
+                if (data && data.byteLength < needed) {
+                    throw new RangeError(`processTiled: output.data needs ${needed} bytes, got ${data.byteLength}`);
+                }
+                if (!data && fd === null) data = new Uint8Array(needed);
+                // Sized up front so tiles can land in any order
+                if (fd !== null) fs.ftruncateSync(fd, needed);
+            } else if (result.type !== type) {
+                throw new Error(`processTiled: tiles produced different types (${type} and ${result.type})`);
+            }
+            const rowBytes = source.cols * pixelBytes;
+            const lineBytes = tile.width * pixelBytes;
+            const bytes = toBytes(result.data);
+            for (let row = 0; row < tile.height; row++) {
+                const position = (tile.y + row) * rowBytes + tile.x * pixelBytes;
+                const line = bytes.subarray(row * lineBytes, (row + 1) * lineBytes);
+                if (fd !== null) {
+                    fs.writeSync(fd, line, 0, lineBytes, position);
+                } else {
+                    data.set(line, position);
+                }
+            }
+        },
+        finish() {
+            if (fd !== null) fs.closeSync(fd);
+            return { rows: source.rows, cols: source.cols, type, data: fd !== null ? null : data };
+        },
+        abort() {
+            if (fd !== null) fs.closeSync(fd);
+        },
+    };
+}
+
+/**
+ * Process a large image tile by tile
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @param {Object} source - { rows, cols, type, data } or a raw file { path, rows, cols, type, offset }
+ * @param {Object} op - Operation from ops
+ * @param {Object} options - Configuration options
+ * @param {number} options.tileSize - Core tile side in pixels (default: from tileBytes)
+ * @param {number} options.tileBytes - Heap budget per tile (default: 64MB)
+ * @param {number} options.workers - Run tiles on a pool of this many workers (default: 0, this thread)
+ * @param {Object} options.pool - Existing pool from cv.createPool() to run tiles on
+ * @param {number} options.concurrency - Tiles in flight with a pool (default: 2 per worker)
+ * @param {Object} options.output - { path } to write a raw file, or { data } to fill a buffer
+ * @param {Function} options.onProgress - Called with { done, total } after each tile
+ * @param {Object} options.loadOptions - Options passed to the loader in each worker
+ * @param {string} options.opencvPath - Path to dist/<build>/opencv.js (set by cv.processTiled)
+ * @returns {Promise<Object>} { rows, cols, type, data, tiles, tileSize, halo }; data is null with output.path
+ */
+async function processTiled(cv, source, op, options = {}) {
+    if (!source || !Number.isInteger(source.rows) || !Number.isInteger(source.cols) || !Number.isInteger(source.type)) {
+        throw new TypeError('processTiled: source needs integer rows, cols and type');
+    }
+    if (!op || !Number.isInteger(op.halo) || (!op.name && !op.source)) {
+        throw new TypeError('processTiled: op must come from ops (e.g. ops.gaussianBlur(5))');
+    }
+    const {
+        tileBytes = DEFAULT_TILE_BYTES,
+        workers = 0,
+        output = null,
+        onProgress = null,
+        loadOptions = { pthreadPoolSize: 1, numThreads: 1 },
+        opencvPath = null,
+    } = options;
+
+    const pixelBytes = elemSize(source.type);
+    const tileSize = options.tileSize || tileSizeFor(op, pixelBytes, tileBytes);
+    const tiles = tileGrid(source.rows, source.cols, tileSize, op.halo);
+    const task = { name: op.name, source: op.source, params: op.params };
+
+    let pool = options.pool || null;
+    let ownPool = false;
+    if (!pool && workers > 0) {
+        if (!opencvPath) {
+            throw new Error('processTiled: opencvPath is required with workers (or use cv.processTiled())');
+        }
+        pool = require('./pool').createPool({ opencvPath, size: workers, loadOptions });
+        ownPool = true;
+    }
+
+    const reader = openSource(source, pixelBytes);
+    const writer = openOutput(source, output);
+    const inputFor = (tile) => ({
+        op: task,
+        tile: { rows: tile.read.height, cols: tile.read.width, type: source.type, data: reader.read(tile.read) },
+        crop: { x: tile.x - tile.read.x, y: tile.y - tile.read.y, width: tile.width, height: tile.height },
+    });
+
+    let done = 0;
+    const finishTile = (tile, result) => {
+        writer.write(tile, result);
+        done++;
+        if (onProgress) onProgress({ done, total: tiles.length });
+    };
+
+    try {
+        if (!pool) {
+            for (const tile of tiles) {
+                finishTile(tile, runTile(cv, inputFor(tile)));
+            }
+        } else {
+            await pool.ready;
+            // Bounded in flight: tiles are read only when a slot frees up
+            const concurrency = options.concurrency || pool.size * 2;
+            let next = 0;
+            let failed = false;
+            const lane = async () => {
+                while (!failed && next < tiles.length) {
+                    const tile = tiles[next++];
+                    try {
+                        finishTile(tile, await pool.run(TILE_TASK, inputFor(tile), { transfer: true }));
+                    } catch (err) {
+                        failed = true;
+                        throw err;
+                    }
+                }
+            };
+            const lanes = [];
+            for (let i = 0; i < Math.min(concurrency, tiles.length); i++) lanes.push(lane());
+            await Promise.all(lanes);
+        }
+    } catch (err) {
+        writer.abort();
+        throw err;
+    } finally {
+        reader.close();
+        if (ownPool) await pool.close();
+    }
+
+    return { ...writer.finish(), tiles: tiles.length, tileSize, halo: op.halo };
+}
+
+module.exports = { processTiled, ops, tileGrid, tileSizeFor };
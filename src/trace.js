@@ -0,0 +1,161 @@
+/**
+ * OpenCV.js Usage Tracer
+ *
+ * Records which cv.* functions, classes and class methods an application
+ * actually calls. The resulting JSON trace is the input for
+ * scripts/generate-whitelist.py, which emits a pruned opencv_js.config.py
+ * and module list for a minimal BUILD_TYPE=custom build.
+ *
+ * Usage:
+ *   const cv = await require('opencv-contrib-wasm');
+ *   const { createTracer } = require('opencv-contrib-wasm/trace');
+ *
+ *   const tracer = createTracer(cv, { output: 'opencv-trace.json' });
+ *   // ... exercise the application ...
+ *   tracer.save();   // also written automatically on process exit
+ *
+ * Then:
+ *   python3 scripts/generate-whitelist.py opencv-trace.json
+ *   npm run build:custom
+ */
+
+const fs = require('fs');
+const {
+    CLASS_HANDLE_METHODS,
+    isRuntimeExport,
+    isEmbindClass,
+    classPrototypes,
+} = require('./bindings');
+
+const TRACE_VERSION = 1;
+
+/**
+ * Names of the embind base classes of a class, nearest first
+ * @param {Function} ctor - Embind class constructor
+ * @returns {string[]}
+ */
+function baseClassNames(ctor) {
+    return classPrototypes(ctor).slice(1).map(proto => proto.constructor.name);
+}
+
+/**
+ * Instrument an initialized cv module and record binding usage
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @param {Object} options - Configuration options
+ * @param {string} options.output - Trace file path (default: 'opencv-trace.json')
+ * @param {boolean} options.saveOnExit - Write the trace when the process exits (default: true in Node)
+ * @returns {Object} Tracer with save(), report() and stop()
+ */
+function createTracer(cv, options = {}) {
+    const {
+        output = 'opencv-trace.json',
+        saveOnExit = typeof process !== 'undefined' && typeof process.on === 'function',
+    } = options;
+
+    const functions = new Map();
+    const classes = new Map();
+    const restore = [];
+    const wrappedPrototypes = new WeakSet();
+
+    const classEntry = (name) => {
+        let entry = classes.get(name);
+        if (!entry) {
+            entry = { constructed: 0, methods: new Map(), bases: [] };
+            classes.set(name, entry);
+        }
+        return entry;
+    };
+
+    const count = (map, key) => map.set(key, (map.get(key) || 0) + 1);
+
+    const wrapPrototype = (proto) => {
+        if (wrappedPrototypes.has(proto)) return;
+        wrappedPrototypes.add(proto);
+
+        const className = proto.constructor.name;
+        for (const key of Object.getOwnPropertyNames(proto)) {
+            if (CLASS_HANDLE_METHODS.has(key)) continue;
+            const descriptor = Object.getOwnPropertyDescriptor(proto, key);
+            if (!descriptor || typeof descriptor.value !== 'function') continue;
+
+            const original = descriptor.value;
+            proto[key] = new Proxy(original, {
+                apply(target, thisArg, args) {
+                    count(classEntry(className).methods, key);
+                    return Reflect.apply(target, thisArg, args);
+                },
+            });
+            restore.push(() => { proto[key] = original; });
+        }
+    };
+
+    for (const name of Object.keys(cv)) {
+        if (isRuntimeExport(name)) continue;
+        const original = cv[name];
+        if (typeof original !== 'function') continue;
+
+        if (isEmbindClass(original)) {
+            classEntry(name).bases = baseClassNames(original);
+            classPrototypes(original).forEach(wrapPrototype);
+            cv[name] = new Proxy(original, {
+                construct(target, args, newTarget) {
+                    classEntry(name).constructed++;
+                    return Reflect.construct(target, args, newTarget);
+                },
+            });
+        } else {
+            cv[name] = new Proxy(original, {
+                apply(target, thisArg, args) {
+                    count(functions, name);
+                    return Reflect.apply(target, thisArg, args);
+                },
+            });
+        }
+        restore.push(() => { cv[name] = original; });
+    }
+
+    const tracer = {
+        /**
+         * Snapshot of the usage recorded so far
+         * @returns {Object} Trace in the format read by generate-whitelist.py
+         */
+        report() {
+            const trace = { version: TRACE_VERSION, functions: {}, classes: {} };
+            for (const [name, calls] of [...functions].sort()) {
+                trace.functions[name] = calls;
+            }
+            for (const [name, entry] of [...classes].sort()) {
+                if (entry.constructed === 0 && entry.methods.size === 0) continue;
+                trace.classes[name] = {
+                    constructed: entry.constructed,
+                    methods: Object.fromEntries([...entry.methods].sort()),
+                    bases: entry.bases,
+                };
+            }
+            return trace;
+        },
+
+        /**
+         * Write the trace as JSON
+         * @param {string} file - Output path (default: options.output)
+         */
+        save(file = output) {
+            fs.writeFileSync(file, JSON.stringify(tracer.report(), null, 2) + '\n');
+        },
+
+        /**
+         * Remove all instrumentation and restore the original bindings
+         */
+        stop() {
+            while (restore.length) restore.pop()();
+            if (saveOnExit) process.removeListener('exit', onExit);
+        },
+    };
+
+    const onExit = () => tracer.save();
+    if (saveOnExit) process.on('exit', onExit);
+
+    return tracer;
+}
+
+module.exports = { createTracer };
@@ -0,0 +1,186 @@
+/**
+ * OpenCV.js Multi-Object Tracking
+ *
+ * cv.MultiTracker updates any number of trackers (KCF, CSRT, MIL,
+ * DaSiamRPN, Nano, Vit, ...) with one call per frame and returns every
+ * target's box, score and state as typed arrays. The frame is colour
+ * converted and downscaled once for all targets instead of once per
+ * tracker.
+ *
+ * Builds from this package register it natively
+ * (patches/tracking_bindings.cpp): the frame crosses into wasm once and the
+ * targets are updated in parallel on the pthread pool in threaded builds.
+ * For other builds, attachTrackingHelpers() defines the same class in plain
+ * JS, updating the targets one after another.
+ *
+ * Usage:
+ *   const multi = new cv.MultiTracker({ colorConversion: cv.COLOR_RGBA2RGB, scale: 0.5 });
+ *   const tracker = new cv.TrackerKCF();
+ *   const a = multi.add(tracker, frame, new cv.Rect(10, 20, 60, 80));
+ *   tracker.delete();                                 // the MultiTracker holds its own reference
+ *   const b = multi.add(new cv.TrackerCSRT(), frame, new cv.Rect(200, 40, 50, 50));
+ *   // per frame:
+ *   const { ids, boxes, scores, found } = multi.update(frame);
+ *   // target i: ids[i], box boxes.subarray(i * 4, i * 4 + 4) as x, y, width, height
+ *   multi.delete();
+ */
+
+/**
+ * MultiTracker in plain JS, for builds without the native one
+ */
+function createMultiTrackerClass(cv) {
+    return class MultiTracker {
+        /**
+         * @param {Object} options - Configuration options
+         * @param {number} options.scale - Downscale factor applied to every frame before tracking, in (0, 1] (default: 1)
+         * @param {number} options.colorConversion - cv.cvtColor code applied once per frame, e.g. cv.COLOR_RGBA2RGB (default: none)
+         * @param {boolean} options.parallel - Ignored here; the native class updates targets on the pthread pool
+         */
+        constructor(options = {}) {
+            this.scale = options.scale === undefined ? 1 : options.scale;
+            this.colorConversion = options.colorConversion === undefined ? -1 : options.colorConversion;
+            if (!(this.scale > 0 && this.scale <= 1)) {
+                throw new RangeError(`MultiTracker: scale must be in (0, 1], got ${this.scale}`);
+            }
+            this.targets = [];
+            this.nextId = 0;
+            this.converted = null;
+            this.scaled = null;
+        }
+
+        /**
+         * Start tracking a region
+         * @param {Object} tracker - Tracker instance, e.g. new cv.TrackerKCF(); the MultiTracker keeps
+         *        its own reference, so the caller may delete theirs
+         * @param {cv.Mat} frame - Frame the region is in
+         * @param {Object} rect - { x, y, width, height } in frame coordinates
+         * @returns {number} Target id
+         */
+        add(tracker, frame, rect) {
+            tracker.init(this.prepare(frame), this.toWork(rect));
+            this.targets.push({
+                id: this.nextId,
+                // Embind clone() of a smart pointer shares the tracker, like the native Ptr copy
+                tracker: typeof tracker.clone === 'function' ? tracker.clone() : tracker,
+                box: [rect.x, rect.y, rect.width, rect.height],
+                found: true,
+                score: 1,
+            });
+            return this.nextId++;
+        }
+
+        /**
+         * Stop tracking a target
+         * @param {number} id - Target id from add()
+         * @returns {boolean} Whether the target existed
+         */
+        remove(id) {
+            const index = this.targets.findIndex(target => target.id === id);
+            if (index < 0) return false;
+            this.targets[index].tracker.delete();
+            this.targets.splice(index, 1);
+            return true;
+        }
+
+        clear() {
+            this.targets.forEach(target => target.tracker.delete());
+            this.targets = [];
+        }
+
+        size() {
+            return this.targets.length;
+        }
+
+        /**
+         * Track every target into a new frame
+         * @param {cv.Mat} frame - Next frame
+         * @returns {Object} { ids: Int32Array, boxes: Float32Array (x, y, width, height per target),
+         *                     scores: Float32Array, found: Uint8Array }; lost targets keep their last box
+         */
+        update(frame) {
+            const work = this.prepare(frame);
+            const inverse = 1 / this.scale;
+            for (const target of this.targets) {
+                const result = target.tracker.update(work);
+                // Bindings return [found, rect]; a bare flag carries no box to report
+                if (!Array.isArray(result)) {
+                    throw new Error('MultiTracker: Tracker.update() in this build returns no box; ' +
+                        'rebuild with scripts/build.sh for the native cv.MultiTracker');
+                }
+                const [found, rect] = result;
+                target.found = Boolean(found);
+                if (target.found) {
+                    target.box = [rect.x * inverse, rect.y * inverse, rect.width * inverse, rect.height * inverse];
+                }
+                target.score = typeof target.tracker.getTrackingScore === 'function'
+                    ? target.tracker.getTrackingScore()
+                    : (target.found ? 1 : 0);
+            }
+            return this.result();
+        }
+
+        /**
+         * Current state of every target, without updating
+         */
+        result() {
+            const n = this.targets.length;
+            const out = {
+                ids: new Int32Array(n),
+                boxes: new Float32Array(n * 4),
+                scores: new Float32Array(n),
+                found: new Uint8Array(n),
+            };
+            this.targets.forEach((target, i) => {
+                out.ids[i] = target.id;
+                out.boxes.set(target.box, i * 4);
+                out.scores[i] = target.score;
+                out.found[i] = target.found ? 1 : 0;
+            });
+            return out;
+        }
+
+        delete() {
+            this.clear();
+            if (this.converted) this.converted.delete();
+            if (this.scaled) this.scaled.delete();
+            this.converted = null;
+            this.scaled = null;
+        }
+
+        prepare(frame) {
+            let work = frame;
+            if (this.colorConversion >= 0) {
+                if (!this.converted) this.converted = new cv.Mat();
+                cv.cvtColor(work, this.converted, this.colorConversion);
+                work = this.converted;
+            }
+            if (this.scale !== 1) {
+                if (!this.scaled) this.scaled = new cv.Mat();
+                cv.resize(work, this.scaled, new cv.Size(0, 0), this.scale, this.scale, cv.INTER_AREA);
+                work = this.scaled;
+            }
+            return work;
+        }
+
+        toWork(rect) {
+            if (this.scale === 1) return rect;
+            const s = this.scale;
+            return new cv.Rect(Math.round(rect.x * s), Math.round(rect.y * s),
+                Math.max(1, Math.round(rect.width * s)), Math.max(1, Math.round(rect.height * s)));
+        }
+    };
+}
+
+/**
+ * Attach cv.MultiTracker (the JS version if the build has no native one)
+ * @param {Object} cv - Initialized OpenCV.js module
+ * @returns {Object} The same cv module
+ */
+function attachTrackingHelpers(cv) {
+    if (typeof cv.MultiTracker !== 'function') {
+        cv.MultiTracker = createMultiTrackerClass(cv);
+    }
+    return cv;
+}
+
+module.exports = { attachTrackingHelpers, createMultiTrackerClass };
@@ -0,0 +1,6 @@
+/**
+ * OpenCV.js Scoped Arena TypeScript Definitions
+ */
+
+/** Add scope(), keep(), enableLeakTracking() and leakReport() to a cv module */
+export function attachArena<T extends object>(cv: T): T;
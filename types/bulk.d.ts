@@ -0,0 +1,6 @@
+/**
+ * OpenCV.js Bulk Result Accessors TypeScript Definitions
+ */
+
+/** Define keyPointsToArrays(), matchesToArrays(), knnMatchesToArrays(), contoursToArrays() and the *FromArrays() functions where a build lacks them */
+export function attachBulkHelpers<T extends object>(cv: T): T;
@@ -0,0 +1,28 @@
+/**
+ * OpenCV.js DNN Helpers TypeScript Definitions
+ */
+
+/** Add blobFromImageArray(), forwardOutputs(), nmsBoxes(), nmsBoxesBatched(), readNetFromBuffer() and layerTimings() to a cv module */
+export function attachDnnHelpers<T extends object>(cv: T): T;
+
+/** Greedy NMS with the semantics of cv::dnn::NMSBoxes; returns kept indices, highest score first */
+export function nmsBoxes(
+    boxes: ArrayLike<number> | { x: number; y: number; width: number; height: number }[] | number[][],
+    scores: ArrayLike<number>,
+    scoreThreshold: number,
+    nmsThreshold: number,
+    options?: { eta?: number; topK?: number }
+): number[];
+
+/** Per-class NMS with the semantics of cv::dnn::NMSBoxesBatched */
+export function nmsBoxesBatched(
+    boxes: ArrayLike<number> | { x: number; y: number; width: number; height: number }[] | number[][],
+    scores: ArrayLike<number>,
+    classIds: ArrayLike<number>,
+    scoreThreshold: number,
+    nmsThreshold: number,
+    options?: { eta?: number; topK?: number }
+): number[];
+
+/** Model file extensions per readNetFromBuffer() format */
+export const MODEL_FORMATS: Record<string, { model: string; config?: string }>;
@@ -0,0 +1,9 @@
+/**
+ * OpenCV.js Heap Buffers and Mat Pool TypeScript Definitions
+ */
+
+/** Add allocHeap(), matBytes(), matView() and createMatPool() to a cv module */
+export function attachHeapHelpers<T extends object>(cv: T): T;
+
+/** Bytes per element (all channels) of a Mat type */
+export function elemSize(type: number): number;
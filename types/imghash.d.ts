@@ -0,0 +1,55 @@
+/**
+ * OpenCV.js Image Hash Search TypeScript Definitions
+ */
+
+export interface PackedHashes {
+    /** count * hashBytes bytes, one hash after another */
+    hashes: Uint8Array;
+    hashBytes: number;
+    count: number;
+}
+
+export interface HashIndexOptions {
+    /** Bytes per hash (8 for AverageHash / PHash, 32 for BlockMeanHash) */
+    hashBytes: number;
+    /** Hashes to allocate room for up front (default: 1024) */
+    capacity?: number;
+}
+
+export interface HashMatch<L = any> {
+    index: number;
+    label: L;
+    /** Hamming distance in bits */
+    distance: number;
+}
+
+export type HashInput = Uint8Array | ArrayLike<number> | { data: Uint8Array; type(): number };
+
+export interface HashIndex<L = any> {
+    readonly hashBytes: number;
+    readonly size: number;
+    /** Add packed hashes (or one hash Mat); returns the index of the first */
+    add(hashes: HashInput, labels?: L[]): number;
+    hashAt(index: number): Uint8Array;
+    labelAt(index: number): L;
+    /** Every hash within radius bits, nearest first */
+    radiusSearch(hash: HashInput, radius: number): HashMatch<L>[];
+    /** The k nearest hashes, nearest first */
+    knnSearch(hash: HashInput, k: number, maxDistance?: number): HashMatch<L>[];
+    /** [i, j, distance] for every pair of stored hashes within radius bits, i < j */
+    findDuplicates(radius: number): [number, number, number][];
+    /** Hashes and labels (JSON-serializable) as bytes */
+    serialize(): Uint8Array;
+}
+
+/** Hash every image with one img_hash algorithm into packed bytes */
+export function computeHashes(cv: any, algorithm: { compute(image: any, hash: any): void }, images: any): PackedHashes;
+
+/** Multi-index hashing index over fixed-size binary hashes */
+export function createHashIndex<L = number>(options: HashIndexOptions): HashIndex<L>;
+
+/** Rebuild an index saved with index.serialize() */
+export function loadHashIndex<L = any>(bytes: Uint8Array): HashIndex<L>;
+
+/** Define cv.computeHashes() where a build lacks it, plus cv.createHashIndex() and cv.loadHashIndex() */
+export function attachImgHashHelpers<T extends object>(cv: T): T;
@@ -6,6 +6,12 @@
  * types from the OpenCV build.
  */
 
+/**
+ * Main entry point called with options (Node.js): loads the smallest build
+ * covering options.modules; other options are passed to the loader
+ */
+declare function cv(options?: import('./select').SelectOptions & { [option: string]: any }): Promise<typeof cv>;
+
 declare namespace cv {
     // Core classes
     class Mat {
@@ -235,6 +241,55 @@ declare namespace cv {
         delete(): void;
     }
 
+    // FLANN descriptor indexes (patches/flann_bindings.cpp)
+    interface FlannIndexParams {
+        algorithm?: 'lsh' | 'kdtree' | 'kmeans' | 'composite' | 'autotuned' | 'linear';
+        distance?: 'hamming' | 'l2' | 'l1';
+        // lsh
+        tableNumber?: number;
+        keySize?: number;
+        multiProbeLevel?: number;
+        // kdtree, composite
+        trees?: number;
+        // kmeans, composite
+        branching?: number;
+        iterations?: number;
+        cbIndex?: number;
+        // autotuned
+        targetPrecision?: number;
+        buildWeight?: number;
+        memoryWeight?: number;
+        sampleFraction?: number;
+    }
+    interface FlannSearchParams {
+        checks?: number;
+        eps?: number;
+        sorted?: boolean;
+    }
+
+    class FlannBasedMatcher {
+        constructor(params?: FlannIndexParams, search?: FlannSearchParams);
+        add(descriptors: MatVector): void;
+        train(): void;
+        clear(): void;
+        empty(): boolean;
+        match(queryDescriptors: Mat, trainDescriptors: Mat, matches: DMatchVector): void;
+        knnMatch(queryDescriptors: Mat, trainDescriptors: Mat, matches: DMatchVectorVector, k: number): void;
+        delete(): void;
+    }
+
+    class FlannIndex {
+        constructor(features: Mat, params?: FlannIndexParams);
+        static load(bytes: ArrayLike<number> | ArrayBufferView): FlannIndex;
+        knnSearch(queries: Mat, k: number, search?: FlannSearchParams): { indices: Int32Array; distances: Float32Array };
+        save(): Uint8Array;
+        size(): number;
+        descriptorSize(): number;
+        descriptorType(): number;
+        params(): FlannIndexParams;
+        delete(): void;
+    }
+
     // Utility classes
     class MatVector {
         constructor();
@@ -244,6 +299,14 @@ declare namespace cv {
         delete(): void;
     }
 
+    class DoubleVector {
+        constructor();
+        size(): number;
+        get(index: number): number;
+        push_back(value: number): void;
+        delete(): void;
+    }
+
     class RectVector {
         constructor();
         size(): number;
@@ -273,6 +336,13 @@ declare namespace cv {
             constructor();
             setInput(blob: Mat, name?: string): void;
             forward(outputName?: string): Mat;
+            setPreferableBackend(backendId: number): void;
+            setPreferableTarget(targetId: number): void;
+            getUnconnectedOutLayersNames(): string[];
+            getLayerNames(): string[];
+            getPerfProfile(timings: DoubleVector): bigint;
+            enableFusion(fusion: boolean): void;
+            empty(): boolean;
             delete(): void;
         }
 
@@ -280,13 +350,209 @@ declare namespace cv {
         function readNetFromTensorflow(model: string, config?: string): Net;
         function readNetFromONNX(onnxFile: string): Net;
         function blobFromImage(image: Mat, scalefactor?: number, size?: Size, mean?: Scalar, swapRB?: boolean, crop?: boolean, ddepth?: number): Mat;
+        function blobFromImages(images: MatVector, scalefactor?: number, size?: Size, mean?: Scalar, swapRB?: boolean, crop?: boolean, ddepth?: number): Mat;
+        function imagesFromBlob(blob: Mat, images: MatVector): void;
     }
 
+    // Batched DNN helpers (Node entry points, or opencv-contrib-wasm/dnn)
+    type BoxList = ArrayLike<number> | { x: number; y: number; width: number; height: number }[] | number[][];
+    interface NMSOptions {
+        eta?: number;
+        topK?: number;
+    }
+    function blobFromImageArray(images: Mat[] | MatVector, options?: {
+        scale?: number;
+        size?: [number, number] | Size;
+        mean?: number[] | Scalar;
+        swapRB?: boolean;
+        crop?: boolean;
+    }): Mat;
+    function forwardOutputs(net: dnn.Net, names?: string[]): Record<string, Mat>;
+    function nmsBoxes(boxes: BoxList, scores: ArrayLike<number>, scoreThreshold: number, nmsThreshold: number, options?: NMSOptions): number[];
+    function nmsBoxesBatched(boxes: BoxList, scores: ArrayLike<number>, classIds: ArrayLike<number>, scoreThreshold: number, nmsThreshold: number, options?: NMSOptions): number[];
+    function readNetFromBuffer(model: ArrayBufferView | ArrayBuffer, options?: {
+        format?: 'onnx' | 'tflite' | 'caffe' | 'tensorflow' | 'darknet' | 'torch';
+        config?: ArrayBufferView | ArrayBuffer | string;
+    }): dnn.Net;
+    function layerTimings(net: dnn.Net): { totalMs: number; layers: { name: string; ms: number }[] };
+    function getTickFrequency(): number;
+
     // Initialization callback
     let onRuntimeInitialized: () => void;
 
     // Utility functions
     function getBuildInformation(): string;
+
+    // Threading
+    function setNumThreads(nthreads: number): void;
+    function getNumThreads(): number;
+    function getNumberOfCPUs(): number;
+    const pthreadPoolSize: number | undefined;
+    interface ThreadInfo {
+        threaded: boolean;
+        pthreadPoolSize: number;
+        numThreads: number;
+        cpus: number | null;
+    }
+    interface ParallelMeasurement<T> {
+        result: T;
+        wallMs: number;
+        cpuMs: number | null;
+        numThreads: number;
+        utilization: number | null;
+    }
+    function threadInfo(): ThreadInfo;
+    function measureParallel<T>(fn: () => T): ParallelMeasurement<T>;
+    function parallelStats(reset?: boolean): { calls: number; wallMs: number; cpuMs: number; utilization: number | null };
+
+    // Startup timing (Node entry points)
+    interface StartupReport {
+        build: string;
+        cache: 'off' | 'hit' | 'miss' | 'shared';
+        lazyCompile: boolean;
+        wasmHash?: string;
+        readMs: number;
+        compileMs: number;
+        instantiateMs: number;
+        runtimeInitMs: number;
+        totalMs: number;
+    }
+    const startupReport: StartupReport;
+    /** Build directory the main entry point loaded, e.g. 'essential-threads' */
+    const build: string | undefined;
+
+    // Heap buffers and Mat pool (Node entry points, or opencv-contrib-wasm/heap)
+    interface HeapBuffer {
+        readonly ptr: number;
+        readonly byteLength: number;
+        bytes(): Uint8Array;
+        view<T extends ArrayBufferView = Uint8Array>(arrayType?: { new(buffer: ArrayBufferLike, byteOffset: number, length: number): T; BYTES_PER_ELEMENT: number }, byteOffset?: number, length?: number): T;
+        mat(rows: number, cols: number, type: number, byteOffset?: number, step?: number): Mat;
+        free(): void;
+    }
+    interface MatPoolStats {
+        hits: number;
+        misses: number;
+        released: number;
+        discarded: number;
+        pooled: number;
+        pooledBytes: number;
+    }
+    interface MatPool {
+        acquire(rows: number, cols: number, type: number): Mat;
+        release(mat: Mat): void;
+        fromBuffer(data: ArrayBufferView | ArrayBuffer, rows: number, cols: number, type: number): Mat;
+        stats(): MatPoolStats;
+        clear(): void;
+    }
+    function allocHeap(byteLength: number): HeapBuffer;
+    function matBytes(mat: Mat): Uint8Array;
+    function matView(mat: Mat): Uint8Array | Int8Array | Uint16Array | Int16Array | Int32Array | Float32Array | Float64Array;
+    function createMatPool(options?: { maxPerShape?: number }): MatPool;
+
+    // Scoped cleanup and leak tracking (Node entry points, or opencv-contrib-wasm/arena)
+    interface LeakReport {
+        live: Record<string, number>;
+        leaked: Record<string, number>;
+        totalLive: number;
+        collect: boolean;
+        objects?: { type: string; stack: string }[];
+    }
+    function scope<T>(fn: () => T): T;
+    function keep<T>(obj: T): T;
+    function enableLeakTracking(options?: { collect?: boolean; stacks?: boolean }): void;
+    function leakReport(): LeakReport;
+
+    // Bulk typed-array result accessors (native in builds from this package)
+    interface KeyPointArrays {
+        pt: Float32Array;
+        size: Float32Array;
+        angle: Float32Array;
+        response: Float32Array;
+        octave: Int32Array;
+        classId: Int32Array;
+    }
+    interface MatchArrays {
+        queryIdx: Int32Array;
+        trainIdx: Int32Array;
+        imgIdx: Int32Array;
+        distance: Float32Array;
+    }
+    interface ContourArrays {
+        points: Int32Array;
+        offsets: Int32Array;
+    }
+    function keyPointsToArrays(keypoints: KeyPointVector): KeyPointArrays;
+    function keyPointsFromArrays(arrays: { pt: ArrayLike<number> } & Partial<Record<Exclude<keyof KeyPointArrays, 'pt'>, ArrayLike<number>>>): KeyPointVector;
+    function matchesToArrays(matches: DMatchVector): MatchArrays;
+    function knnMatchesToArrays(matches: DMatchVectorVector): MatchArrays & { offsets: Int32Array };
+    function matchesFromArrays(arrays: { queryIdx: ArrayLike<number> } & Partial<Record<Exclude<keyof MatchArrays, 'queryIdx'>, ArrayLike<number>>>): DMatchVector;
+    function contoursToArrays(contours: MatVector): ContourArrays;
+    function contoursFromArrays(points: ArrayLike<number>, offsets: ArrayLike<number>): MatVector;
+
+    // Image codecs on byte buffers (WITH_CODECS=1 builds)
+    const IMREAD_UNCHANGED: number;
+    const IMREAD_GRAYSCALE: number;
+    const IMREAD_COLOR: number;
+    const IMWRITE_JPEG_QUALITY: number;
+    const IMWRITE_PNG_COMPRESSION: number;
+    const IMWRITE_WEBP_QUALITY: number;
+    function imdecode(bytes: ArrayLike<number> | ArrayBufferView, flags: number): Mat;
+    function imdecodemulti(bytes: ArrayLike<number> | ArrayBufferView, flags: number): MatVector;
+    function imdecodeBatch(buffers: (ArrayLike<number> | ArrayBufferView)[], flags: number): MatVector;
+    function imencode(ext: string, img: Mat, params?: number[]): Uint8Array;
+
+    // Heap statistics and sizing (Node entry points)
+    function memoryStats(): import('./memory').MemoryStats;
+    function reserveHeap(size: number | string): number;
+
+    // Set when loaded with OPENCV_WASM_PROFILE / the profile option (Node entry points)
+    const profiler: import('./profiler').Profiler | undefined;
+
+    // Host directory mounts and the parsed-model cache (Node entry points)
+    function mountHost(hostDir: string, mountPoint?: string): string;
+    function unmountHost(hostDirOrMountPoint: string): void;
+    function hostFile(hostPath: string): string;
+    function withBufferFile<R>(bytes: ArrayBufferView | ArrayBuffer, name: string, fn: (path: string) => R): R;
+    function cachedModel<M>(key: string, create: () => M): M;
+    function releaseModel(key?: string): void;
+    function cachedModelKeys(): string[];
+    function loadNet(
+        source: string | ArrayBufferView | ArrayBuffer | import('./models').SharedModel,
+        options?: import('./models').LoadNetOptions
+    ): any;
+
+    // Batch img_hash hashing and a Hamming index (Node entry points)
+    function computeHashes(algorithm: { compute(image: Mat, hash: Mat): void }, images: MatVector | Mat[]): import('./imghash').PackedHashes;
+    function createHashIndex(options: import('./imghash').HashIndexOptions): import('./imghash').HashIndex;
+    function loadHashIndex(bytes: Uint8Array): import('./imghash').HashIndex;
+
+    // ml model persistence and batched prediction (Node entry points)
+    function saveStatModel(model: any, options?: import('./ml').SaveStatModelOptions): Uint8Array;
+    function loadStatModel(bytes: Uint8Array | ArrayBuffer): any;
+    function predictBatch(model: any, samples: Mat | Float32Array, options?: import('./ml').PredictBatchOptions): import('./ml').BatchPrediction;
+
+    // Batched multi-object tracking
+    const MultiTracker: import('./tracking').MultiTrackerConstructor;
+    type MultiTracker = import('./tracking').MultiTracker;
+
+    // worker_threads pool running the same build (Node entry points)
+    function createPool(options?: import('./pool').PoolOptions): import('./pool').Pool;
+
+    // Ring-buffered frame pipeline over a raw / y4m byte stream (Node entry points)
+    function createFramePipeline(options: import('./stream').FramePipelineOptions): import('./stream').FramePipeline;
+
+    // Tiled processing of images larger than the wasm heap (Node entry points)
+    function processTiled(
+        source: import('./tiles').TiledSource,
+        op: import('./tiles').TileOperation,
+        options?: import('./tiles').ProcessTiledOptions
+    ): Promise<import('./tiles').TiledResult>;
+
+    // Split build: lazily loaded side modules (opencv-contrib-wasm/split)
+    function loadModule(name: 'dnn' | 'objdetect' | 'photo' | 'ml' | 'video' | 'contrib' | string): Promise<typeof cv>;
+    function isModuleLoaded(name: string): boolean;
+    function availableModules(): string[];
 }
 
 declare module 'opencv-contrib-wasm' {
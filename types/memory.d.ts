@@ -0,0 +1,36 @@
+/**
+ * OpenCV.js Memory Statistics TypeScript Definitions
+ */
+
+/** Fields are null where the build or tracking state cannot report them */
+export interface MemoryStats {
+    /** Current wasm memory size in bytes */
+    heapSize: number | null;
+    /** Size the heap may grow to */
+    heapMax: number | null;
+    /** Bytes malloc has taken from the heap */
+    arena: number | null;
+    /** Bytes in live allocations */
+    inUse: number | null;
+    /** Free bytes inside malloc's arena */
+    free: number | null;
+    /** Largest inUse seen by memoryStats() calls */
+    peakInUse: number | null;
+    /** free / arena */
+    fragmentation: number | null;
+    /** Mat data buffers alive (not headers over user memory or ROIs) */
+    liveMats: number | null;
+    matBytes: number | null;
+    peakMatBytes: number | null;
+    /** Live objects by type, with cv.enableLeakTracking() */
+    liveObjects: Record<string, number> | null;
+}
+
+/** Parse a byte size: a number, or a string such as '256MB' */
+export function parseBytes(size: number | string): number;
+
+/** Current wasm memory size in bytes, or null */
+export function heapSize(cv: object): number | null;
+
+/** Add memoryStats() and reserveHeap() to a cv module */
+export function attachMemoryStats<T extends object>(cv: T): T;
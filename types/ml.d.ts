@@ -0,0 +1,29 @@
+/**
+ * OpenCV.js ml Model Persistence TypeScript Definitions
+ */
+
+export interface SaveStatModelOptions {
+    /** Serialization format (default: 'yml') */
+    format?: 'yml' | 'yaml' | 'json' | 'xml';
+    /** gzip the bytes; loadStatModel() detects it (default: false) */
+    compress?: boolean;
+}
+
+export interface PredictBatchOptions {
+    /** Values per sample, required when samples is a typed array */
+    cols?: number;
+    /** StatModel.predict() flags, e.g. 1 (RAW_OUTPUT) (default: 0) */
+    flags?: number;
+    /** Predict row blocks on the pthread pool (native predictBatch only; default: true) */
+    parallel?: boolean;
+}
+
+export interface BatchPrediction {
+    /** rows * cols responses, row by row */
+    responses: Float32Array;
+    rows: number;
+    cols: number;
+}
+
+/** Attach cv.saveStatModel(), cv.loadStatModel() and cv.predictBatch() */
+export function attachMlHelpers<T extends object>(cv: T): T;
@@ -0,0 +1,35 @@
+/**
+ * OpenCV.js Model Files TypeScript Definitions
+ */
+
+export interface SharedModel {
+    /** file:<realpath>:<size>:<mtime> */
+    key: string;
+    /** File contents over a SharedArrayBuffer */
+    bytes: Uint8Array;
+    name: string;
+}
+
+export interface LoadNetOptions {
+    /** onnx | tflite | caffe | tensorflow | darknet | torch (default: from the file extension, else onnx) */
+    format?: string;
+    /** Host path or contents of the .prototxt / .pbtxt / .cfg file */
+    config?: string | ArrayBufferView | ArrayBuffer;
+    /** Cache key to use instead of the file / content key */
+    key?: string;
+}
+
+/** Read a model into a SharedArrayBuffer once per process per file version */
+export function readModelShared(filePath: string): SharedModel;
+
+/** Drop shared model buffers (all, or one file's) */
+export function releaseSharedModels(filePath?: string): void;
+
+/** Cache key of a host file (path, size, mtime) */
+export function fileKey(filePath: string): string;
+
+/** Default parent directory of cv.mountHost() mount points */
+export const MOUNT_ROOT: string;
+
+/** Add mountHost(), unmountHost(), hostFile(), withBufferFile(), cachedModel(), releaseModel(), cachedModelKeys() and loadNet() to a cv module */
+export function attachModelHelpers<T extends object>(cv: T): T;
@@ -0,0 +1,48 @@
+/**
+ * OpenCV.js Worker Pool TypeScript Definitions
+ */
+
+/** Image data passed between threads */
+export interface MatData {
+    rows: number;
+    cols: number;
+    type: number;
+    data: Uint8Array;
+}
+
+export interface TaskHelpers {
+    /** Copy image data into a new Mat (caller deletes it) */
+    toMat(image: MatData): any;
+    /** Copy a Mat out of the wasm heap */
+    fromMat(mat: any): MatData;
+}
+
+export type PoolTask<I = any, R = any> = (cv: any, input: I, helpers: TaskHelpers) => R | Promise<R>;
+
+export interface PoolOptions {
+    /** Path to dist/<build>/opencv.js (set automatically by cv.createPool) */
+    opencvPath?: string;
+    /** Number of workers (default: os.cpus().length) */
+    size?: number;
+    /** Options passed to the loader in each worker */
+    loadOptions?: { lazyCompile?: boolean; startupReport?: boolean; pthreadPoolSize?: number | 'auto'; numThreads?: number };
+}
+
+export interface RunOptions {
+    /** Transfer input ArrayBuffers instead of copying them (default: false) */
+    transfer?: boolean;
+}
+
+export interface Pool {
+    readonly size: number;
+    /** Resolves once every worker has loaded OpenCV */
+    readonly ready: Promise<Pool>;
+    /** Run a task function, or the path of a module exporting one */
+    run<I, R>(task: PoolTask<I, R> | string, input?: I, options?: RunOptions): Promise<R>;
+    map<I, R>(task: PoolTask<I, R> | string, inputs: I[], options?: RunOptions): Promise<R[]>;
+    /** Number of tasks waiting for a worker */
+    pending(): number;
+    close(): Promise<void>;
+}
+
+export function createPool(options: PoolOptions & { opencvPath: string }): Pool;
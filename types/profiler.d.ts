@@ -0,0 +1,58 @@
+/**
+ * OpenCV.js Call Profiler TypeScript Definitions
+ */
+
+export interface ProfilerOptions {
+    /** Trace file path for save() (default: 'opencv-profile.json'; workers add .worker<threadId>) */
+    output?: string;
+    /** Write the trace when the process exits (default: true when output is set) */
+    saveOnExit?: boolean;
+    /** Keep per-call events for the Chrome trace (default: true) */
+    events?: boolean;
+    /** Events to keep; later calls are only summarized (default: 200000) */
+    maxEvents?: number;
+}
+
+export interface ProfileEntry {
+    /** e.g. 'GaussianBlur', 'Mat.roi', 'new Mat', 'ORB.detectAndCompute' */
+    name: string;
+    calls: number;
+    totalMs: number;
+    /** Time not spent in nested binding calls */
+    selfMs: number;
+    meanMs: number;
+    maxMs: number;
+    /** Bytes of Mat and typed array arguments, summed over calls */
+    inputBytes: number;
+    /** Wasm memory growth during the calls */
+    heapGrowth: number;
+}
+
+export interface ChromeTrace {
+    traceEvents: {
+        name: string;
+        cat: string;
+        ph: 'X';
+        ts: number;
+        dur: number;
+        pid: number;
+        tid: number;
+        args: { inputBytes: number; heapGrowth: number; depth: number };
+    }[];
+    displayTimeUnit: 'ms';
+    metadata: { summary: ProfileEntry[]; droppedEvents: number };
+}
+
+export interface Profiler {
+    /** Per-binding totals, slowest first */
+    summary(): ProfileEntry[];
+    chromeTrace(): ChromeTrace;
+    save(file?: string): void;
+    reset(): void;
+    stop(): void;
+}
+
+export function createProfiler(cv: object, options?: ProfilerOptions): Profiler;
+
+/** Current wasm memory size in bytes, or null */
+export function heapSize(cv: object): number | null;
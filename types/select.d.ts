@@ -0,0 +1,48 @@
+/**
+ * OpenCV.js Build Selection TypeScript Definitions
+ */
+
+export interface BuildInfo {
+    /** Directory name under dist/, e.g. 'essential-threads' */
+    name: string;
+    /** Path of the build's opencv.js */
+    path: string;
+    type: 'essential' | 'full' | 'custom' | 'split' | string;
+    /** Modules in the build; null for a standard full build without build.json (covers every module) */
+    modules: string[] | null;
+    threads: boolean;
+    relaxedSimd: boolean;
+    memory64: boolean;
+    wasmBytes: number;
+}
+
+export interface SelectOptions {
+    /** OpenCV modules the caller uses, e.g. ['imgproc', 'features2d'] */
+    modules?: string[];
+    /** true: require pthreads; false: prefer builds without (default: prefer threads with numThreads > 1 or pthreadPoolSize) */
+    threads?: boolean;
+    /** true: require relaxed SIMD; false: never use it (default: when the host validates it) */
+    relaxedSimd?: boolean;
+    /** Build name under dist/ to use as is */
+    build?: string;
+    /** Directory to search (default: the package's dist/) */
+    distDir?: string;
+    numThreads?: number;
+    pthreadPoolSize?: number | 'auto';
+}
+
+export interface HostCapabilities {
+    threads: boolean;
+    relaxedSimd: boolean;
+}
+
+export const ESSENTIAL_MODULES: string[];
+
+/** Features of this JS engine relevant to build selection */
+export function hostCapabilities(): HostCapabilities;
+
+/** Builds present under a dist directory */
+export function listBuilds(distDir?: string): BuildInfo[];
+
+/** The smallest build covering options.modules, with the fastest instruction set the host runs */
+export function selectBuild(options?: SelectOptions): BuildInfo;
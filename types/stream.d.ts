@@ -0,0 +1,128 @@
+/**
+ * OpenCV.js Frame Pipeline TypeScript Definitions
+ */
+
+import { Writable } from 'stream';
+
+export type FrameFormat = 'y4m' | 'gray' | 'rgb24' | 'bgr24' | 'rgba' | 'bgra' | 'i420';
+
+/** Mat shape of one input frame */
+export interface FrameLayout {
+    format: Exclude<FrameFormat, 'y4m'>;
+    width: number;
+    height: number;
+    rows: number;
+    cols: number;
+    type: number;
+    bytes: number;
+    /** y4m streams only */
+    fps?: number | null;
+}
+
+/** Frame passed to stages */
+export interface StageFrame {
+    index: number;
+}
+
+/** Frame passed to onFrame; valid until onFrame returns or its promise settles */
+export interface PipelineFrame {
+    index: number;
+    slot: number;
+    layout: FrameLayout;
+    /** Output of the last stage (stages on this thread only) */
+    mat?: any;
+    /** Output pixels: a view on the wasm heap or on a shared ring slot */
+    data: Uint8Array;
+    /** Output shape (worker pipelines only) */
+    rows?: number;
+    cols?: number;
+    type?: number;
+}
+
+export type StageFunction = (input: any, output: any, frame: StageFrame) => any | void;
+
+export interface StageObject {
+    name?: string;
+    /** Called once with the cv instance that runs the stage */
+    init?(cv: any): void;
+    /** Write the result into output (or return a Mat to use instead) */
+    process(input: any, output: any, frame: StageFrame): any | void;
+    /** Release what the stage created */
+    delete?(): void;
+}
+
+export type Stage = StageFunction | StageObject;
+
+export interface FramePipelineOptions {
+    format: FrameFormat;
+    /** Raw formats only */
+    width?: number;
+    height?: number;
+    /** Stages run on this thread, in order */
+    stages?: Stage[];
+    /** Stage modules exporting (cv, options) => Stage | Stage[], one worker each, in order */
+    workers?: string[];
+    /** Passed to each stage module (structured-cloneable) */
+    workerOptions?: any;
+    /** Options passed to the loader in each worker */
+    loadOptions?: { lazyCompile?: boolean; pthreadPoolSize?: number | 'auto'; numThreads?: number };
+    /** Path to dist/<build>/opencv.js (set automatically by cv.createFramePipeline) */
+    opencvPath?: string;
+    /** Called in order for every frame; its slot is reused once the returned promise settles */
+    onFrame?: (frame: PipelineFrame) => void | Promise<void>;
+    /** Frames in flight per hop (default: 4) */
+    ringSize?: number;
+    /** Skip incoming frames instead of pausing the producer (default: false) */
+    dropWhenFull?: boolean;
+}
+
+export interface FramePipelineStats {
+    frames: number;
+    dropped: number;
+    /** Time writes waited for a free slot */
+    stallMs: number;
+    inFlight: number;
+    ringSize: number;
+    /** From the last input byte of a frame to its onFrame settling */
+    latency: { meanMs: number; p50Ms: number; p95Ms: number; maxMs: number };
+    /** Mean time per stage (stages on this thread only) */
+    stages: { name: string; meanMs: number }[];
+}
+
+export interface FramePipeline extends Writable {
+    /** Input frame layout (null until a y4m header has been read) */
+    layout: FrameLayout | null;
+    /** Resolves with the stats once every frame has been delivered */
+    readonly done: Promise<FramePipelineStats>;
+    stats(): FramePipelineStats;
+}
+
+export function createFramePipeline(cv: any, options: FramePipelineOptions): FramePipeline;
+
+/** Mat shape and byte size of one raw frame */
+export function frameLayout(format: Exclude<FrameFormat, 'y4m'>, width: number, height: number): FrameLayout;
+
+/** Parse a y4m stream header line */
+export function parseY4MHeader(line: string): FrameLayout;
+
+/** Ready-made stages; objects passed in stay owned by the caller */
+export const stages: {
+    cvtColor(code: number, dstCn?: number): StageObject;
+    resize(width: number, height: number, interpolation?: number): StageObject;
+    gaussianBlur(ksize: number, sigma?: number): StageObject;
+    /** e.g. new cv.BackgroundSubtractorMOG2(500, 16, false) or a bgsegm subtractor */
+    backgroundSubtractor(subtractor: { apply(image: any, fgmask: any, learningRate?: number): void }, learningRate?: number): StageObject;
+    /** e.g. a cv.DISOpticalFlow; gray input, CV_32FC2 flow output */
+    denseOpticalFlow(algorithm: { calc(prev: any, next: any, flow: any): void }): StageObject;
+    /** Lucas-Kanade tracking of re-detected corners; N x 1 CV_32FC2 points output */
+    sparseOpticalFlow(params?: {
+        maxCorners?: number;
+        qualityLevel?: number;
+        minDistance?: number;
+        minPoints?: number;
+        winSize?: number;
+        maxLevel?: number;
+    }): StageObject;
+};
+
+export const FORMATS: Record<Exclude<FrameFormat, 'y4m'>, number>;
@@ -0,0 +1,83 @@
+/**
+ * OpenCV.js Tiled Processing TypeScript Definitions
+ */
+
+import { Pool } from './pool';
+
+/** In-memory image or raw pixel file (row-major, no padding) */
+export type TiledSource =
+    | { rows: number; cols: number; type: number; data: ArrayBufferView | ArrayBuffer | SharedArrayBuffer }
+    | { rows: number; cols: number; type: number; path: string; offset?: number };
+
+/** Operation descriptor from ops */
+export interface TileOperation {
+    name: string;
+    params: Record<string, any>;
+    /** Kernel radius in pixels read around every tile */
+    halo: number;
+    /** Working set per input pixel, in multiples of its size */
+    memory: number;
+    /** Serialized function (ops.custom only) */
+    source?: string;
+}
+
+export interface ProcessTiledOptions {
+    /** Core tile side in pixels (default: from tileBytes) */
+    tileSize?: number;
+    /** Heap budget per tile (default: 64MB) */
+    tileBytes?: number;
+    /** Run tiles on a pool of this many workers (default: 0, this thread) */
+    workers?: number;
+    /** Existing pool from cv.createPool() to run tiles on */
+    pool?: Pool;
+    /** Tiles in flight with a pool (default: 2 per worker) */
+    concurrency?: number;
+    /** Write a raw file, or fill a caller-provided buffer */
+    output?: { path: string } | { data: ArrayBufferView | ArrayBuffer | SharedArrayBuffer };
+    onProgress?: (progress: { done: number; total: number }) => void;
+    /** Options passed to the loader in each worker (default: { pthreadPoolSize: 1, numThreads: 1 }) */
+    loadOptions?: { lazyCompile?: boolean; pthreadPoolSize?: number | 'auto'; numThreads?: number };
+    /** Path to dist/<build>/opencv.js (set automatically by cv.processTiled) */
+    opencvPath?: string;
+}
+
+export interface TiledResult {
+    rows: number;
+    cols: number;
+    /** Output Mat type (from the operation) */
+    type: number;
+    /** Output pixels; null when written to output.path */
+    data: Uint8Array | null;
+    tiles: number;
+    tileSize: number;
+    halo: number;
+}
+
+export function processTiled(cv: any, source: TiledSource, op: TileOperation, options?: ProcessTiledOptions): Promise<TiledResult>;
+
+export const ops: {
+    gaussianBlur(ksize: number, sigmaX?: number, sigmaY?: number): TileOperation;
+    bilateralFilter(d: number, sigmaColor: number, sigmaSpace: number): TileOperation;
+    medianBlur(ksize: number): TileOperation;
+    morphologyEx(op: number, ksize: number, iterations?: number, shape?: number): TileOperation;
+    /** Exact up to maxDistance, clamped beyond */
+    distanceTransform(distanceType: number, maskSize: number, maxDistance: number): TileOperation;
+    /** ximgproc */
+    guidedFilter(radius: number, eps: number): TileOperation;
+    /** ximgproc */
+    rollingGuidanceFilter(d?: number, sigmaColor?: number, sigmaSpace?: number, iterations?: number): TileOperation;
+    /** Size-preserving (cv, src, dst, params) => void; serialized for workers */
+    custom(
+        fn: (cv: any, src: any, dst: any, params: any) => void,
+        options: { halo: number; params?: Record<string, any>; memory?: number }
+    ): TileOperation;
+};
+
+/** Cut an image into tiles with halos */
+export function tileGrid(rows: number, cols: number, tileSize: number, halo: number): {
+    x: number; y: number; width: number; height: number;
+    read: { x: number; y: number; width: number; height: number };
+}[];
+
+/** Tile side that fits one tile plus halo in the heap budget */
+export function tileSizeFor(op: TileOperation, pixelBytes: number, tileBytes: number): number;
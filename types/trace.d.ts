@@ -0,0 +1,30 @@
+/**
+ * OpenCV.js Usage Tracer TypeScript Definitions
+ */
+
+export interface TraceClassEntry {
+    constructed: number;
+    methods: Record<string, number>;
+    bases: string[];
+}
+
+export interface Trace {
+    version: number;
+    functions: Record<string, number>;
+    classes: Record<string, TraceClassEntry>;
+}
+
+export interface TracerOptions {
+    /** Trace file path (default: 'opencv-trace.json') */
+    output?: string;
+    /** Write the trace when the process exits (default: true in Node) */
+    saveOnExit?: boolean;
+}
+
+export interface Tracer {
+    report(): Trace;
+    save(file?: string): void;
+    stop(): void;
+}
+
+export function createTracer(cv: object, options?: TracerOptions): Tracer;
@@ -0,0 +1,46 @@
+/**
+ * OpenCV.js Multi-Object Tracking TypeScript Definitions
+ */
+
+export interface MultiTrackerOptions {
+    /** Downscale factor applied once per frame before tracking, in (0, 1] (default: 1) */
+    scale?: number;
+    /** cv.cvtColor code applied once per frame, e.g. cv.COLOR_RGBA2RGB (default: none) */
+    colorConversion?: number;
+    /** Update targets on the pthread pool (native class only; default: true) */
+    parallel?: boolean;
+}
+
+export interface MultiTrackerResult {
+    ids: Int32Array;
+    /** x, y, width, height per target, in frame coordinates */
+    boxes: Float32Array;
+    /** Tracker confidence (DaSiamRPN, Nano, Vit), otherwise 1 when found and 0 when lost */
+    scores: Float32Array;
+    /** 1 if the target was found in the last frame; lost targets keep their last box */
+    found: Uint8Array;
+}
+
+export interface MultiTracker {
+    /** Start tracking rect in frame; the MultiTracker keeps its own reference to the tracker */
+    add(tracker: { init(image: any, rect: any): void; update(image: any): any }, frame: any,
+        rect: { x: number; y: number; width: number; height: number }): number;
+    remove(id: number): boolean;
+    clear(): void;
+    size(): number;
+    /** Track every target into frame */
+    update(frame: any): MultiTrackerResult;
+    /** Current state without updating */
+    result(): MultiTrackerResult;
+    delete(): void;
+}
+
+export interface MultiTrackerConstructor {
+    new (options?: MultiTrackerOptions): MultiTracker;
+}
+
+/** The plain JS MultiTracker class for a cv module */
+export function createMultiTrackerClass(cv: any): MultiTrackerConstructor;
+
+/** Define cv.MultiTracker where a build lacks it */
+export function attachTrackingHelpers<T extends object>(cv: T): T;